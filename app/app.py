@@ -8,6 +8,8 @@ from app.states.deals.deals_state import DealState
 from app.states.alerts.alert_state import AlertState
 from app.states.ui.ui_state import UIState
 from app.states.deals.deal_form_state import DealFormState
+from app.services.deals.deal_store import deal_store_lifespan
+from app.services.deals.deal_export import export_api, export_files_lifespan
 
 
 def index() -> rx.Component:
@@ -30,8 +32,15 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    # Plain HTTP routes (streamed CSV export) served ahead of Reflex's own
+    api_transformer=export_api,
 )
 
+# Build the shared deal store at startup and release it on shutdown
+app.register_lifespan_task(deal_store_lifespan)
+# Delete finished export files on shutdown (expired ones go as they lapse)
+app.register_lifespan_task(export_files_lifespan)
+
 # Root route
 app.add_page(index, route="/")
 
@@ -9,6 +9,13 @@ from app.components.shared.alert_sidebar import (
     format_timestamp_display,
 )
 from app.components.shared.confirmation_dialog import confirmation_dialog
+from app.components.shared.search_suggestions import (
+    SearchInput,
+    search_input,
+    search_suggestions,
+    suggestion_item,
+)
+from app.components.shared.virtual_scroll import ScrollViewport, scroll_viewport
 from app.components.shared.layout import layout, page_layout
 from app.components.shared.module_layout import module_layout, sub_tab_link
 from app.components.shared.pdf_viewer import (
@@ -29,6 +36,14 @@ __all__ = [
     "format_timestamp_display",
     # Dialog
     "confirmation_dialog",
+    # Search
+    "SearchInput",
+    "search_input",
+    "search_suggestions",
+    "suggestion_item",
+    # Virtual scroll
+    "ScrollViewport",
+    "scroll_viewport",
     # Layout
     "layout",
     "page_layout",
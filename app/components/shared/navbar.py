@@ -3,6 +3,10 @@ from app.config import VERSION
 from app.states.deals.deals_state import DealState
 from app.states.deals.deal_form_state import DealFormState
 from app.states.alerts.alert_state import AlertState
+from app.components.shared.search_suggestions import (
+    search_input,
+    search_suggestions,
+)
 
 
 def navbar_link(text: str, url: str) -> rx.Component:
@@ -52,13 +56,18 @@ def navbar() -> rx.Component:
                             "search",
                             class_name="w-4 h-4 text-gray-400 absolute left-3 top-2.5",
                         ),
-                        rx.el.input(
+                        search_input(
+                            id="navbar-search",
                             placeholder="Search deals, tickers...",
+                            on_input=DealState.update_search_suggestions.debounce(50),
                             on_change=DealState.set_search_query.debounce(300),
+                            on_blur=DealState.clear_search_suggestions,
+                            auto_complete="off",
                             class_name="bg-gray-900 border border-gray-700 text-gray-300 text-sm rounded-lg focus:ring-blue-500 focus:border-blue-500 block w-64 pl-10 p-2 placeholder-gray-500",
                             default_value=DealState.search_query,
                         ),
-                        class_name="relative hidden lg:block mr-6",
+                        search_suggestions(),
+                        class_name="relative group hidden lg:block mr-6",
                     ),
                     rx.el.button(
                         rx.icon(
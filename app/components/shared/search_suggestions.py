@@ -0,0 +1,58 @@
+"""Autocomplete dropdown for the deal search inputs.
+
+Suggestions and the table filter run at different speeds: suggestions
+only hit the prefix indexes and should follow every keystroke, while
+applying the search re-runs the whole query and waits for typing to
+pause. A trigger's events share one debounce, so `SearchInput` adds an
+`on_input` trigger (React fires onInput alongside onChange on every
+edit) to carry the suggestion handler separately:
+
+    search_input(
+        on_input=DealState.update_search_suggestions.debounce(50),
+        on_change=DealState.set_search_query.debounce(300),
+    )
+"""
+
+import reflex as rx
+from reflex.event import input_event
+from app.states.deals.deals_state import DealState
+from app.services.deals.deal_service import DealSuggestion
+
+
+class SearchInput(rx.el.Input):
+    """An input with an `on_input` trigger receiving the current value."""
+
+    on_input: rx.EventHandler[input_event]
+
+
+search_input = SearchInput.create
+
+
+def suggestion_item(suggestion: DealSuggestion) -> rx.Component:
+    return rx.el.button(
+        rx.el.span(
+            suggestion["ticker"],
+            class_name="font-mono font-bold text-gray-900 w-16 shrink-0",
+        ),
+        rx.el.span(suggestion["company_name"], class_name="text-gray-500 truncate"),
+        # mouse-down fires before the input's blur hides the dropdown
+        on_mouse_down=DealState.apply_search_suggestion(suggestion["ticker"]),
+        type="button",
+        class_name="flex w-full items-center gap-2 px-3 py-2 text-left text-sm hover:bg-blue-50",
+    )
+
+
+def search_suggestions() -> rx.Component:
+    """Ticker/company matches for the search box it is placed under.
+
+    The parent must carry `relative group`; the list only shows while that
+    input has focus.
+    """
+    return rx.cond(
+        DealState.search_suggestions.length() > 0,
+        rx.el.div(
+            rx.foreach(DealState.search_suggestions, suggestion_item),
+            class_name="absolute left-0 top-full z-50 mt-1 hidden w-72 overflow-hidden rounded-md border border-gray-200 bg-white shadow-lg group-focus-within:block",
+        ),
+        None,
+    )
@@ -0,0 +1,31 @@
+"""Scroll container that reports its position, for virtualized tables.
+
+Reflex's stock `on_scroll` trigger passes no arguments; `ScrollViewport`
+is a plain div whose `on_scroll` sends the element's `scrollTop` and
+`clientHeight`, which is all a fixed-row-height virtual list needs to work
+out which rows are on screen. Throttle the handler, as scroll events fire
+on every frame:
+
+    scroll_viewport(
+        table,
+        on_scroll=State.table_scrolled.throttle(100),
+        class_name="overflow-auto",
+    )
+"""
+
+import reflex as rx
+from reflex.vars.object import ObjectVar
+
+
+def _scroll_position(e: ObjectVar) -> tuple[rx.Var[int], rx.Var[int]]:
+    target = e.target.to(dict)
+    return (target.scrollTop.to(int), target.clientHeight.to(int))
+
+
+class ScrollViewport(rx.el.Div):
+    """A div whose on_scroll receives (scroll_top, viewport_height) in px."""
+
+    on_scroll: rx.EventHandler[_scroll_position]
+
+
+scroll_viewport = ScrollViewport.create
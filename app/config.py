@@ -1,5 +1,6 @@
 """Application configuration loaded from pyproject.toml."""
 
+import os
 import tomllib
 from pathlib import Path
 
@@ -19,3 +20,17 @@ def _load_version() -> str:
 
 
 VERSION = _load_version()
+
+
+# Deal store backend: "memory" keeps Faker-seeded deals in process and loses
+# them on restart, "sqlite" persists them to DEAL_STORE_PATH.
+DEAL_STORE_BACKEND = os.environ.get("DEAL_STORE_BACKEND", "memory").lower()
+DEAL_STORE_PATH = os.environ.get(
+    "DEAL_STORE_PATH", str(_PROJECT_ROOT / "data" / "deals.db")
+)
+
+# Seed an empty store with DEAL_STORE_SEED_COUNT synthetic deals (see
+# app.services.deals.deal_generator) instead of the Faker demo book, drawn
+# deterministically from DEAL_STORE_SEED. 0 keeps the demo book.
+DEAL_STORE_SEED_COUNT = int(os.environ.get("DEAL_STORE_SEED_COUNT", "0"))
+DEAL_STORE_SEED = int(os.environ.get("DEAL_STORE_SEED", "0"))
@@ -9,6 +9,7 @@ from app.components.shared.module_layout import module_layout
 from app.pages.deals.list_page import deals_list_view
 from app.pages.deals.add_page import deals_add_view
 from app.pages.deals.review_page import deals_review_view
+from app.states.deals.deals_state import DealState
 
 
 # Tab definitions for the deals module
@@ -19,10 +20,23 @@ DEALS_TABS = [
 ]
 
 
+# How often (ms) an open list or review page picks up other sessions' writes
+CHANGE_POLL_INTERVAL = 5000
+
+
+def change_poller() -> rx.Component:
+    """Invisible timer that replays the store's change feed into the page."""
+    return rx.moment(
+        interval=CHANGE_POLL_INTERVAL,
+        on_change=DealState.sync_changes,
+        class_name="hidden",
+    )
+
+
 def deals_list_page() -> rx.Component:
     """Deals list page with tabbed module layout."""
     return module_layout(
-        content=deals_list_view(),
+        content=rx.fragment(deals_list_view(), change_poller()),
         module_name="Deals",
         tabs=DEALS_TABS,
     )
@@ -40,7 +54,7 @@ def deals_add_page() -> rx.Component:
 def deals_review_page() -> rx.Component:
     """Deals review page with tabbed module layout."""
     return module_layout(
-        content=deals_review_view(),
+        content=rx.fragment(deals_review_view(), change_poller()),
         module_name="Deals",
         tabs=DEALS_TABS,
     )
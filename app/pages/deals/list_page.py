@@ -1,6 +1,11 @@
 import reflex as rx
 from app.states.deals.deals_state import DealState
 from app.components.shared.confirmation_dialog import confirmation_dialog
+from app.components.shared.search_suggestions import (
+    search_input,
+    search_suggestions,
+)
+from app.components.shared.virtual_scroll import scroll_viewport
 
 
 def sortable_header(label: str, column: str, align: str = "left") -> rx.Component:
@@ -14,30 +19,369 @@ def sortable_header(label: str, column: str, align: str = "left") -> rx.Componen
                     rx.icon("chevron-up", size=16, class_name="ml-1 text-blue-600"),
                     rx.icon("chevron-down", size=16, class_name="ml-1 text-blue-600"),
                 ),
-                rx.icon(
-                    "arrow-up-down",
-                    size=16,
-                    class_name="ml-1 text-gray-300 opacity-50 group-hover:opacity-100",
+                rx.cond(
+                    DealState.secondary_sort_directions.contains(column),
+                    # A tie-breaking key: same arrows, lighter
+                    rx.cond(
+                        DealState.secondary_sort_directions[column] == "asc",
+                        rx.icon("chevron-up", size=16, class_name="ml-1 text-blue-300"),
+                        rx.icon(
+                            "chevron-down", size=16, class_name="ml-1 text-blue-300"
+                        ),
+                    ),
+                    rx.icon(
+                        "arrow-up-down",
+                        size=16,
+                        class_name="ml-1 text-gray-300 opacity-50 group-hover:opacity-100",
+                    ),
                 ),
             ),
             class_name=f"flex items-center gap-1 cursor-pointer group hover:text-gray-700 {('justify-end' if align == 'right' else '')}",
         ),
-        on_click=lambda: DealState.sort_by_column(column),
+        # Shift-click adds the column as a tie-breaking sort key
+        on_click=lambda e: DealState.sort_by_column(column, e["shift_key"]),
+        title="Click to sort, shift-click to add as a secondary sort",
         class_name=f"px-3 py-3 text-{align} text-xs font-bold text-gray-500 uppercase tracking-wider bg-gray-50 select-none hover:bg-gray-100 transition-colors",
     )
 
 
-def badge(text: str, color_scheme: str = "gray") -> rx.Component:
-    colors = {
-        "gray": "bg-gray-100 text-gray-800",
-        "blue": "bg-blue-100 text-blue-800",
-        "green": "bg-green-100 text-green-800",
-        "purple": "bg-purple-100 text-purple-800",
-        "yellow": "bg-yellow-100 text-yellow-800",
-    }
-    return rx.el.span(
-        text,
-        class_name=f"inline-flex items-center px-2 py-0.5 rounded text-[10px] font-bold tracking-wide {colors.get(color_scheme, 'bg-gray-100 text-gray-800')}",
+def deal_table_row(row: rx.Var, fixed_height: bool = False) -> rx.Component:
+    """One `DealRow`; its display strings and classes come precomputed.
+
+    `fixed_height` pins the row to DealState.ROW_HEIGHT for the scroll view,
+    clipping the flag badges to one line instead of wrapping them.
+    """
+    cell = "px-3 py-4 whitespace-nowrap text-sm"
+    badges_class = (
+        "flex flex-nowrap gap-1 max-w-[150px] overflow-hidden"
+        if fixed_height
+        else "flex flex-wrap gap-1 max-w-[150px]"
+    )
+    return rx.el.tr(
+        rx.el.td(
+            rx.el.input(
+                type="checkbox",
+                checked=DealState.selected_page_ids.contains(row["id"]),
+                on_change=lambda _: DealState.toggle_select_deal(row["id"]),
+                class_name="rounded border-gray-300 text-blue-600 focus:ring-blue-500 h-4 w-4",
+            ),
+            class_name="pl-6 pr-3 py-4 whitespace-nowrap w-10",
+        ),
+        rx.el.td(
+            rx.el.span(
+                row["ticker"],
+                # The mixin's select_deal_for_review loads the deal and redirects
+                on_click=lambda: DealState.select_deal_for_review(row["id"]),
+                class_name="font-semibold text-blue-600 cursor-pointer hover:underline",
+            ),
+            class_name=cell,
+        ),
+        rx.el.td(row["structure"], class_name=f"{cell} text-gray-500"),
+        rx.el.td(
+            rx.el.div(
+                rx.foreach(
+                    row["badges"],
+                    lambda b: rx.el.span(
+                        b["label"],
+                        class_name=f"inline-flex items-center px-2 py-0.5 rounded text-[10px] font-bold tracking-wide {b['class_name']}",
+                    ),
+                ),
+                class_name=badges_class,
+            ),
+            class_name="px-3 py-4",
+        ),
+        rx.el.td(
+            row["shares_amount"],
+            class_name=f"{cell} text-gray-900 text-right font-mono",
+        ),
+        rx.el.td(
+            row["offering_price"],
+            class_name=f"{cell} font-bold text-right font-mono {row['price_class']}",
+        ),
+        rx.el.td(
+            rx.el.span(row["pricing_date"]),
+            class_name=f"{cell} text-gray-500 text-right font-mono",
+        ),
+        rx.el.td(
+            rx.el.span(row["announce_date"]),
+            class_name=f"{cell} text-gray-500 text-right font-mono",
+        ),
+        rx.el.td(row["sector"], class_name=f"{cell} text-gray-500"),
+        rx.el.td(row["country"], class_name=f"{cell} text-gray-500"),
+        rx.el.td(
+            row["market_cap"],
+            class_name=f"{cell} text-gray-500 text-right font-mono",
+        ),
+        rx.el.td(
+            rx.el.div(
+                rx.el.span(
+                    row["confidence"],
+                    class_name=f"inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium {row['confidence_class']}",
+                ),
+                class_name="flex justify-center",
+            ),
+            class_name="px-3 py-4 whitespace-nowrap text-center",
+        ),
+        style={"height": f"{DealState.ROW_HEIGHT}px"} if fixed_height else None,
+        class_name="bg-white border-b hover:bg-blue-50 transition-colors",
+    )
+
+
+def facet_select(field: str, all_label: str, value: rx.Var, on_change) -> rx.Component:
+    """A filter select whose options carry their match counts."""
+    return rx.el.select(
+        rx.el.option(all_label, value="all"),
+        rx.foreach(
+            DealState.facet_options[field],
+            lambda option: rx.el.option(option["label"], value=option["value"]),
+        ),
+        value=value,
+        on_change=on_change,
+        class_name="block w-36 rounded-md border-gray-300 py-1.5 text-sm focus:border-blue-500 focus:ring-blue-500 mr-2 bg-white shadow-sm cursor-pointer appearance-none",
+    )
+
+
+def export_controls() -> rx.Component:
+    """Format picker and Export button, with a running job's progress or
+    its download link."""
+    return rx.el.div(
+        rx.el.select(
+            rx.el.option("CSV", value="csv"),
+            rx.el.option("Parquet", value="parquet"),
+            rx.el.option("XLSX", value="xlsx"),
+            value=DealState.export_format,
+            on_change=DealState.set_export_format,
+            class_name="block w-24 rounded-md border-gray-300 py-1 text-sm bg-white shadow-sm cursor-pointer",
+        ),
+        rx.el.button(
+            rx.icon("download", size=16, class_name="mr-2"),
+            "Export",
+            on_click=DealState.export_deals,
+            disabled=DealState.export_status == "running",
+            class_name="inline-flex items-center px-3 py-2 text-sm font-medium text-gray-700 hover:text-gray-900 disabled:opacity-50 transition-colors",
+        ),
+        rx.match(
+            DealState.export_status,
+            (
+                "running",
+                rx.el.span(
+                    rx.icon("loader-circle", size=14, class_name="mr-1 animate-spin"),
+                    f"{DealState.export_progress}%",
+                    class_name="inline-flex items-center text-xs text-gray-500",
+                ),
+            ),
+            (
+                "done",
+                rx.el.span(
+                    rx.el.a(
+                        "Download",
+                        href=DealState.export_download_url,
+                        class_name="text-xs font-medium text-blue-600 hover:underline",
+                    ),
+                    rx.el.button(
+                        rx.icon("x", size=12),
+                        on_click=DealState.dismiss_export,
+                        class_name="ml-1 text-gray-400 hover:text-gray-600",
+                    ),
+                    class_name="inline-flex items-center",
+                ),
+            ),
+            rx.fragment(),
+        ),
+        class_name="flex items-center gap-1 mr-4",
+    )
+
+
+# (label, field) for each numeric range filter; fields are
+# DealService.RANGE_FIELDS
+RANGE_FILTERS = [
+    ("Mkt Cap (M)", "market_cap"),
+    ("Offer Price", "offering_price"),
+    ("Shares (M)", "shares_amount"),
+    ("Gross Spread", "gross_spread"),
+    ("Conf.", "ai_confidence_score"),
+]
+
+
+def bound_toggle(
+    exclusive: rx.Var, inclusive_label: str, exclusive_label: str, on_click
+) -> rx.Component:
+    """A button showing whether a range bound is inclusive; click to flip it."""
+    return rx.el.button(
+        rx.cond(exclusive, exclusive_label, inclusive_label),
+        on_click=on_click,
+        title="Toggle inclusive / exclusive bound",
+        class_name="w-6 text-sm font-mono text-gray-500 hover:text-blue-600",
+    )
+
+
+def range_filter(label: str, field: str) -> rx.Component:
+    """Min/max inputs for one numeric column, each with a toggle between an
+    inclusive and an exclusive bound."""
+    input_class = "block w-24 rounded-md border-gray-300 py-1 text-sm focus:border-blue-500 focus:ring-blue-500 shadow-sm text-gray-600"
+    return rx.el.div(
+        rx.el.span(label, class_name="text-xs font-bold text-gray-500 uppercase mr-2"),
+        bound_toggle(
+            DealState.filter_min_exclusive.get(field, False),
+            "≥",
+            ">",
+            DealState.toggle_filter_min_exclusive(field),
+        ),
+        rx.el.input(
+            type="number",
+            placeholder="min",
+            on_change=lambda v: DealState.set_filter_min(field, v).debounce(300),
+            default_value=DealState.filter_min.get(field, ""),
+            class_name=input_class,
+        ),
+        rx.el.span("-", class_name="text-gray-400 mx-1"),
+        bound_toggle(
+            DealState.filter_max_exclusive.get(field, False),
+            "≤",
+            "<",
+            DealState.toggle_filter_max_exclusive(field),
+        ),
+        rx.el.input(
+            type="number",
+            placeholder="max",
+            on_change=lambda v: DealState.set_filter_max(field, v).debounce(300),
+            default_value=DealState.filter_max.get(field, ""),
+            class_name=input_class,
+        ),
+        class_name="flex items-center",
+    )
+
+
+def range_filters_panel() -> rx.Component:
+    return rx.cond(
+        DealState.show_range_filters,
+        rx.el.div(
+            *[range_filter(label, field) for label, field in RANGE_FILTERS],
+            class_name="bg-gray-50 border-b border-gray-200 px-6 py-2 flex flex-wrap items-center gap-6",
+        ),
+        None,
+    )
+
+
+def selection_banner() -> rx.Component:
+    """Offer to extend a full-page selection to every matching deal."""
+    link_class = "ml-2 font-semibold text-blue-600 hover:underline cursor-pointer"
+    return rx.cond(
+        DealState.select_all_matching,
+        rx.el.div(
+            "All ",
+            rx.el.span(DealState.selected_count, class_name="font-semibold"),
+            " matching deals are selected.",
+            rx.el.button(
+                "Clear selection",
+                on_click=DealState.clear_selection,
+                class_name=link_class,
+            ),
+            class_name="bg-blue-50 border-b border-blue-100 px-6 py-2 text-sm text-gray-700",
+        ),
+        rx.cond(
+            DealState.all_selected
+            & (DealState.filtered_count > DealState.paginated_deals.length()),
+            rx.el.div(
+                "All deals on this page are selected.",
+                rx.el.button(
+                    "Select all ",
+                    DealState.filtered_count,
+                    " matching deals",
+                    on_click=DealState.select_all_matching_deals,
+                    class_name=link_class,
+                ),
+                class_name="bg-blue-50 border-b border-blue-100 px-6 py-2 text-sm text-gray-700",
+            ),
+            None,
+        ),
+    )
+
+
+def table_header() -> rx.Component:
+    return rx.el.thead(
+        rx.el.tr(
+            rx.el.th(
+                rx.el.input(
+                    type="checkbox",
+                    checked=DealState.all_selected,
+                    on_change=lambda _: DealState.toggle_select_all(),
+                    class_name="rounded border-gray-300 text-blue-600 focus:ring-blue-500 h-4 w-4",
+                ),
+                class_name="pl-6 pr-3 py-3 text-left w-10 bg-gray-50",
+            ),
+            sortable_header("Ticker", "ticker"),
+            sortable_header("Structure", "structure"),
+            rx.el.th(
+                "Flags",
+                class_name="px-3 py-3 text-left text-xs font-bold text-gray-500 uppercase tracking-wider bg-gray-50",
+            ),
+            sortable_header("Shares (M)", "shares_amount", "right"),
+            sortable_header("Offer Price", "offering_price", "right"),
+            sortable_header("Pricing Date", "pricing_date", "right"),
+            sortable_header("Announce Date", "announce_date", "right"),
+            sortable_header("Sector", "sector"),
+            sortable_header("Country", "country"),
+            sortable_header("Mkt Cap (M)", "market_cap", "right"),
+            sortable_header("Conf.", "ai_confidence_score", "center"),
+            class_name="border-b border-gray-200",
+        ),
+        # Stays in view while the table scrolls beneath it
+        class_name="sticky top-0 z-10",
+    )
+
+
+def spacer_row(height: rx.Var) -> rx.Component:
+    """An empty row standing in for the rows outside the scroll window."""
+    return rx.el.tr(
+        rx.el.td(col_span=12, class_name="p-0"),
+        style={"height": f"{height}px"},
+    )
+
+
+def deals_table() -> rx.Component:
+    """The deals table, paged or as a virtualized scroll area.
+
+    In scroll mode every row has the same height, spacer rows fill in for
+    the rows outside the fetched window, and scroll positions are sent
+    (throttled) to `table_scrolled`, which moves the window. The DOM never
+    holds more than WINDOW_SIZE rows however long the result is.
+    """
+    table_class = "min-w-full divide-y divide-gray-200"
+    return rx.cond(
+        DealState.view_mode == "scroll",
+        scroll_viewport(
+            rx.el.table(
+                table_header(),
+                rx.el.tbody(
+                    spacer_row(DealState.window_padding_top),
+                    rx.foreach(
+                        DealState.window_deals,
+                        lambda row: deal_table_row(row, fixed_height=True),
+                    ),
+                    spacer_row(DealState.window_padding_bottom),
+                    class_name="divide-y divide-gray-200",
+                ),
+                class_name=table_class,
+            ),
+            on_scroll=DealState.table_scrolled.throttle(100),
+            # Remounts (and so scrolls to the top) whenever the query changes
+            key=DealState.scroll_view_key,
+            class_name="overflow-auto flex-1",
+        ),
+        rx.el.div(
+            rx.el.table(
+                table_header(),
+                rx.el.tbody(
+                    rx.foreach(
+                        DealState.paginated_deals, lambda row: deal_table_row(row)
+                    ),
+                    class_name="divide-y divide-gray-200",
+                ),
+                class_name=table_class,
+            ),
+            class_name="overflow-auto flex-1",
+        ),
     )
 
 
@@ -49,22 +393,42 @@ def deals_list_view() -> rx.Component:
                 rx.el.div(
                     rx.el.div(
                         rx.icon("search", size=16, class_name="text-gray-400 mr-2"),
-                        rx.el.input(
+                        search_input(
+                            id="deals-search",
                             placeholder="Search deals...",
+                            on_input=DealState.update_search_suggestions.debounce(50),
                             on_change=DealState.set_search_query.debounce(300),
+                            on_blur=DealState.clear_search_suggestions,
+                            auto_complete="off",
                             class_name="border-none focus:ring-0 text-sm w-48 p-0 text-gray-700 placeholder:text-gray-400",
                             default_value=DealState.search_query,
                         ),
-                        class_name="flex items-center bg-gray-50 border border-gray-200 rounded-md px-3 py-1.5 focus-within:ring-2 focus-within:ring-blue-500 focus-within:border-blue-500 mr-4",
+                        search_suggestions(),
+                        class_name="relative group flex items-center bg-gray-50 border border-gray-200 rounded-md px-3 py-1.5 focus-within:ring-2 focus-within:ring-blue-500 focus-within:border-blue-500 mr-4",
+                    ),
+                    facet_select(
+                        "status",
+                        "All Status",
+                        DealState.filter_status,
+                        DealState.set_filter_status,
+                    ),
+                    facet_select(
+                        "sector",
+                        "All Sectors",
+                        DealState.filter_sector,
+                        DealState.set_filter_sector,
                     ),
-                    rx.el.select(
-                        rx.el.option("All Status", value="all"),
-                        rx.el.option("Active", value="active"),
-                        rx.el.option("Pending Review", value="pending_review"),
-                        rx.el.option("Draft", value="draft"),
-                        value=DealState.filter_status,
-                        on_change=DealState.set_filter_status,
-                        class_name="block w-32 rounded-md border-gray-300 py-1.5 text-sm focus:border-blue-500 focus:ring-blue-500 mr-2 bg-white shadow-sm cursor-pointer appearance-none",
+                    facet_select(
+                        "country",
+                        "All Countries",
+                        DealState.filter_country,
+                        DealState.set_filter_country,
+                    ),
+                    facet_select(
+                        "structure",
+                        "All Structures",
+                        DealState.filter_structure,
+                        DealState.set_filter_structure,
                     ),
                     rx.el.input(
                         type="date",
@@ -79,6 +443,20 @@ def deals_list_view() -> rx.Component:
                         class_name="block rounded-md border-gray-300 py-1.5 text-sm focus:border-blue-500 focus:ring-blue-500 mr-4 shadow-sm text-gray-600",
                         default_value=DealState.filter_end_date,
                     ),
+                    rx.el.button(
+                        rx.icon("sliders-horizontal", size=14, class_name="mr-1"),
+                        "Ranges",
+                        rx.cond(
+                            DealState.active_range_count > 0,
+                            rx.el.span(
+                                DealState.active_range_count,
+                                class_name="ml-1 rounded-full bg-blue-600 px-1.5 text-[10px] font-bold text-white",
+                            ),
+                            None,
+                        ),
+                        on_click=DealState.toggle_range_filters,
+                        class_name="inline-flex items-center text-sm text-gray-600 hover:text-gray-900 mr-4",
+                    ),
                     rx.el.button(
                         "Clear",
                         on_click=DealState.clear_filters,
@@ -87,12 +465,7 @@ def deals_list_view() -> rx.Component:
                     class_name="flex items-center",
                 ),
                 rx.el.div(
-                    rx.el.button(
-                        rx.icon("download", size=16, class_name="mr-2"),
-                        "Export",
-                        on_click=DealState.export_deals,
-                        class_name="inline-flex items-center px-3 py-2 text-sm font-medium text-gray-700 hover:text-gray-900 mr-4 transition-colors",
-                    ),
+                    export_controls(),
                     rx.el.button(
                         rx.icon("pencil", size=16, class_name="mr-2"),
                         "Edit Selected",
@@ -116,196 +489,74 @@ def deals_list_view() -> rx.Component:
                 ),
                 class_name="bg-white border-b border-gray-200 px-6 py-3 flex items-center justify-between shadow-sm z-10",
             ),
+            range_filters_panel(),
+            selection_banner(),
+            deals_table(),
             rx.el.div(
-                rx.el.table(
-                    rx.el.thead(
-                        rx.el.tr(
-                            rx.el.th(
-                                rx.el.input(
-                                    type="checkbox",
-                                    checked=DealState.all_selected,
-                                    on_change=lambda _: DealState.toggle_select_all(),
-                                    class_name="rounded border-gray-300 text-blue-600 focus:ring-blue-500 h-4 w-4",
-                                ),
-                                class_name="pl-6 pr-3 py-3 text-left w-10 bg-gray-50",
+                rx.el.div(
+                    rx.cond(
+                        DealState.view_mode == "scroll",
+                        rx.el.p(
+                            rx.el.span(
+                                DealState.filtered_count, class_name="font-medium"
                             ),
-                            sortable_header("Ticker", "ticker"),
-                            sortable_header("Structure", "structure"),
-                            rx.el.th(
-                                "Flags",
-                                class_name="px-3 py-3 text-left text-xs font-bold text-gray-500 uppercase tracking-wider bg-gray-50",
+                            " deals",
+                            class_name="text-sm text-gray-700",
+                        ),
+                        rx.el.p(
+                            "Showing ",
+                            rx.el.span(
+                                f"{(DealState.current_page - 1) * DealState.items_per_page + 1}",
+                                class_name="font-medium",
                             ),
-                            sortable_header("Shares (M)", "shares_amount", "right"),
-                            sortable_header("Offer Price", "offering_price", "right"),
-                            sortable_header("Pricing Date", "pricing_date", "right"),
-                            sortable_header("Announce Date", "announce_date", "right"),
-                            sortable_header("Sector", "sector"),
-                            sortable_header("Country", "country"),
-                            sortable_header("Mkt Cap (M)", "market_cap", "right"),
-                            sortable_header("Conf.", "ai_confidence_score", "center"),
-                            class_name="border-b border-gray-200",
-                        )
-                    ),
-                    rx.el.tbody(
-                        rx.foreach(
-                            DealState.paginated_deals,
-                            lambda deal: rx.el.tr(
-                                rx.el.td(
-                                    rx.el.input(
-                                        type="checkbox",
-                                        checked=DealState.selected_deal_ids.contains(
-                                            deal.id
-                                        ),
-                                        on_change=lambda _: DealState.toggle_select_deal(
-                                            deal.id
-                                        ),
-                                        class_name="rounded border-gray-300 text-blue-600 focus:ring-blue-500 h-4 w-4",
-                                    ),
-                                    class_name="pl-6 pr-3 py-4 whitespace-nowrap w-10",
-                                ),
-                                rx.el.td(
-                                    rx.el.span(
-                                        deal.ticker,
-                                        # Use rx.link here for pure navigation, or keep span with handler if we want execute code + nav
-                                        # The mixin `select_deal_for_review` does a redirect.
-                                        # But let's verify if clicking here is meant to go to review.
-                                        # Original code: select_deal_for_review -> toast + form load.
-                                        # Let's keep it as is, or switch to link. The mixin method redirects now.
-                                        on_click=lambda: DealState.select_deal_for_review(
-                                            deal.id
-                                        ),
-                                        class_name="font-semibold text-blue-600 cursor-pointer hover:underline",
-                                    ),
-                                    class_name="px-3 py-4 whitespace-nowrap text-sm",
-                                ),
-                                rx.el.td(
-                                    deal.structure,
-                                    class_name="px-3 py-4 whitespace-nowrap text-sm text-gray-500",
-                                ),
-                                rx.el.td(
-                                    rx.el.div(
-                                        rx.cond(
-                                            deal.flag_clean_up,
-                                            badge("CLEAN", "green"),
-                                            None,
-                                        ),
-                                        rx.cond(
-                                            deal.flag_bought,
-                                            badge("BOUGHT", "blue"),
-                                            None,
-                                        ),
-                                        rx.cond(
-                                            deal.status == "pending_review",
-                                            badge("PENDING", "yellow"),
-                                            None,
-                                        ),
-                                        rx.cond(
-                                            deal.flag_top_up,
-                                            badge("TOP", "purple"),
-                                            None,
-                                        ),
-                                        class_name="flex flex-wrap gap-1 max-w-[150px]",
-                                    ),
-                                    class_name="px-3 py-4",
-                                ),
-                                rx.el.td(
-                                    deal.shares_amount.to_string(),
-                                    class_name="px-3 py-4 whitespace-nowrap text-sm text-gray-900 text-right font-mono",
-                                ),
-                                rx.el.td(
-                                    f"${deal.offering_price}",
-                                    class_name=rx.cond(
-                                        deal.offering_price > 50,
-                                        "px-3 py-4 whitespace-nowrap text-sm font-bold text-green-700 text-right font-mono",
-                                        "px-3 py-4 whitespace-nowrap text-sm font-bold text-red-600 text-right font-mono",
-                                    ),
-                                ),
-                                rx.el.td(
-                                    rx.el.span(deal.pricing_date),
-                                    class_name="px-3 py-4 whitespace-nowrap text-sm text-gray-500 text-right font-mono",
-                                ),
-                                rx.el.td(
-                                    rx.el.span(deal.announce_date),
-                                    class_name="px-3 py-4 whitespace-nowrap text-sm text-gray-500 text-right font-mono",
-                                ),
-                                rx.el.td(
-                                    deal.sector,
-                                    class_name="px-3 py-4 whitespace-nowrap text-sm text-gray-500",
-                                ),
-                                rx.el.td(
-                                    deal.country,
-                                    class_name="px-3 py-4 whitespace-nowrap text-sm text-gray-500",
+                            "-",
+                            rx.el.span(
+                                rx.cond(
+                                    DealState.current_page * DealState.items_per_page
+                                    > DealState.filtered_count,
+                                    DealState.filtered_count,
+                                    DealState.current_page * DealState.items_per_page,
                                 ),
-                                rx.el.td(
-                                    f"${deal.market_cap}",
-                                    class_name="px-3 py-4 whitespace-nowrap text-sm text-gray-500 text-right font-mono",
-                                ),
-                                rx.el.td(
-                                    rx.el.div(
-                                        rx.el.span(
-                                            deal.ai_confidence_score.to_string() + "%",
-                                            class_name=rx.cond(
-                                                deal.ai_confidence_score >= 80,
-                                                "inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-green-100 text-green-800",
-                                                rx.cond(
-                                                    deal.ai_confidence_score >= 50,
-                                                    "inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-yellow-100 text-yellow-800",
-                                                    "inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-red-100 text-red-800",
-                                                ),
-                                            ),
-                                        ),
-                                        class_name="flex justify-center",
-                                    ),
-                                    class_name="px-3 py-4 whitespace-nowrap text-center",
-                                ),
-                                class_name="bg-white border-b hover:bg-blue-50 transition-colors",
+                                class_name="font-medium",
                             ),
-                        ),
-                        class_name="divide-y divide-gray-200",
-                    ),
-                    class_name="min-w-full divide-y divide-gray-200",
-                ),
-                class_name="overflow-auto flex-1",
-            ),
-            rx.el.div(
-                rx.el.div(
-                    rx.el.p(
-                        "Showing ",
-                        rx.el.span(
-                            f"{(DealState.current_page - 1) * DealState.items_per_page + 1}",
-                            class_name="font-medium",
-                        ),
-                        "-",
-                        rx.el.span(
-                            rx.cond(
-                                DealState.current_page * DealState.items_per_page
-                                > DealState.filtered_deals.length(),
-                                DealState.filtered_deals.length(),
-                                DealState.current_page * DealState.items_per_page,
+                            " of ",
+                            rx.el.span(
+                                DealState.filtered_count, class_name="font-medium"
                             ),
-                            class_name="font-medium",
-                        ),
-                        " of ",
-                        rx.el.span(
-                            DealState.filtered_deals.length(), class_name="font-medium"
+                            " deals",
+                            class_name="text-sm text-gray-700",
                         ),
-                        " deals",
-                        class_name="text-sm text-gray-700",
                     ),
                     class_name="hidden sm:flex-1 sm:flex sm:items-center sm:justify-start",
                 ),
                 rx.el.div(
                     rx.el.button(
-                        "Prev",
-                        on_click=DealState.prev_page,
-                        disabled=DealState.current_page <= 1,
-                        class_name="relative inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed mr-2",
+                        rx.cond(
+                            DealState.view_mode == "scroll", "Page view", "Scroll view"
+                        ),
+                        on_click=DealState.set_view_mode(
+                            rx.cond(DealState.view_mode == "scroll", "pages", "scroll")
+                        ),
+                        class_name="relative inline-flex items-center px-4 py-2 text-sm font-medium text-gray-700 hover:text-gray-900 mr-4",
                     ),
-                    rx.el.button(
-                        "Next",
-                        on_click=DealState.next_page,
-                        disabled=DealState.current_page >= DealState.total_pages,
-                        class_name="relative inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed",
+                    rx.cond(
+                        DealState.view_mode == "scroll",
+                        None,
+                        rx.fragment(
+                            rx.el.button(
+                                "Prev",
+                                on_click=DealState.prev_page,
+                                disabled=DealState.current_page <= 1,
+                                class_name="relative inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed mr-2",
+                            ),
+                            rx.el.button(
+                                "Next",
+                                on_click=DealState.next_page,
+                                disabled=DealState.current_page
+                                >= DealState.total_pages,
+                                class_name="relative inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed",
+                            ),
+                        ),
                     ),
                     class_name="flex-1 flex justify-end",
                 ),
@@ -4,24 +4,8 @@ from app.components.deals.deal_form_component import deal_form_component
 from app.components.shared.pdf_viewer import Document, Page
 
 
-def format_ingest_time(timestamp: rx.Var) -> rx.Var:
-    """Format ISO timestamp for the review queue.
-
-    Takes ISO string like '2026-01-14T23:10:25.123456' and returns 'MM-DD HH:MM'
-    ISO positions: 0123456789012345
-                   2026-01-14T23:10:25
-    Position 5-10: '01-14' (MM-DD, but includes the dash before as well)
-    Position 11-16: 'T23:1' (includes T, missing last digit)
-
-    Correct: 5-10 for MM-DD, 11-16 for T + HH:M, we need to adjust
-    Actually: Let's just show full date-time but replace T with space
-    """
-    # Replace 'T' with ' ' and take chars to get MM-DD HH:MM
-    # Adjusted from [5:16] to [6:17] to compensate for Reflex string indexing
-    return timestamp.to_string().replace("T", " ")[6:17]
-
-
-def queue_row(deal: rx.Var) -> rx.Component:
+def queue_row(row: rx.Var) -> rx.Component:
+    """One `ReviewQueueRow`; its display strings come precomputed."""
     return rx.el.tr(
         rx.el.td(
             rx.icon("clock", class_name="text-amber-500 w-5 h-5"),
@@ -29,29 +13,21 @@ def queue_row(deal: rx.Var) -> rx.Component:
         ),
         rx.el.td(
             rx.el.a(
-                deal.ticker,
+                row["ticker"],
                 # Use href for client-side routing
-                href=rx.Var.create(f"/deals/review?id={deal.id}"),
+                href=rx.Var.create(f"/deals/review?id={row['id']}"),
                 class_name="font-semibold text-blue-600 hover:underline cursor-pointer",
             ),
             class_name="px-6 py-4 whitespace-nowrap text-sm text-gray-900",
         ),
         rx.el.td(
-            format_ingest_time(deal.created_at),
+            row["ingested_at"],
             class_name="px-6 py-4 whitespace-nowrap text-sm text-gray-500",
         ),
         rx.el.td(
             rx.el.span(
-                f"{deal.ai_confidence_score}%",
-                class_name=rx.cond(
-                    deal.ai_confidence_score >= 60,
-                    "inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-green-100 text-green-800",
-                    rx.cond(
-                        deal.ai_confidence_score >= 40,
-                        "inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-amber-100 text-amber-800",
-                        "inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-red-100 text-red-800",
-                    ),
-                ),
+                row["confidence"],
+                class_name=f"inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium {row['confidence_class']}",
             ),
             class_name="px-6 py-4 whitespace-nowrap",
         ),
@@ -59,7 +35,7 @@ def queue_row(deal: rx.Var) -> rx.Component:
             rx.el.div(
                 rx.icon("file-text", class_name="w-4 h-4 text-gray-400 mr-2"),
                 rx.el.a(
-                    deal.source_file,
+                    row["source_file"],
                     href="#",
                     on_click=rx.toast(
                         "Opening document from secure shared drive...", duration=2000
@@ -74,7 +50,7 @@ def queue_row(deal: rx.Var) -> rx.Component:
             rx.el.div(
                 rx.el.a(
                     "Review",
-                    href=rx.Var.create(f"/deals/review?id={deal.id}"),
+                    href=rx.Var.create(f"/deals/review?id={row['id']}"),
                     class_name="text-blue-600 hover:text-blue-900 text-sm font-medium",
                 ),
                 class_name="flex space-x-3",
@@ -324,7 +300,7 @@ def deals_review_view() -> rx.Component:
                         class_name="text-sm font-bold text-gray-900 uppercase tracking-wider",
                     ),
                     rx.el.span(
-                        f"{DealState.pending_deals.length()} items",
+                        f"{DealState.pending_count} items",
                         class_name="ml-2 bg-blue-100 text-blue-800 text-xs font-medium px-2.5 py-0.5 rounded-full",
                     ),
                     class_name="flex items-center px-6 py-3 bg-gray-50 border-b border-gray-200 sticky top-0 z-10",
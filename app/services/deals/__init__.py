@@ -1,4 +1,18 @@
 # Deals services
 from app.services.deals.deal_service import DealService
+from app.services.deals.sqlite_deal_service import SqliteDealService
+from app.services.deals.deal_store import (
+    close_deal_service,
+    create_deal_service,
+    deal_store_lifespan,
+    get_deal_service,
+)
 
-__all__ = ["DealService"]
+__all__ = [
+    "DealService",
+    "SqliteDealService",
+    "close_deal_service",
+    "create_deal_service",
+    "deal_store_lifespan",
+    "get_deal_service",
+]
@@ -0,0 +1,97 @@
+"""Versioned change feed of the deal stores.
+
+Every write that bumps a store's `version` records what it did as
+`DealChange` events: the ids it inserted, updated (with the fields that
+changed) and deleted. `changes_since(version)` replays the events after a
+version a session has seen, so the session can tell whether a write
+touched anything it shows and patch just that, instead of reloading its
+whole view after every write by anyone.
+
+The log is bounded: once the events after a version have been dropped,
+`changes_since` returns None and the caller falls back to a full reload.
+"""
+
+import threading
+from bisect import bisect_right
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, TypedDict
+
+from app.states.shared.schema import Deal
+
+# Fields an update can change (the id is the identity)
+_DEAL_FIELDS = [field for field in Deal.model_fields if field != "id"]
+
+
+class DealChange(TypedDict):
+    """One kind of change made by the write that produced `version`."""
+
+    version: int
+    # "insert", "update" or "delete"
+    kind: str
+    ids: List[str]
+    # Fields changed by an update (across `ids`); empty for inserts and
+    # deletes, which touch every field
+    fields: List[str]
+
+
+class ChangeLog:
+    """The last `max_events` DealChange events, oldest first."""
+
+    def __init__(self, version: int = 0, max_events: int = 1_000):
+        self._events: Deque[DealChange] = deque()
+        self._max_events = max_events
+        # changes_since(v) is complete for any v >= _floor
+        self._floor = version
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        version: int,
+        inserted: Iterable[str] = (),
+        updated: Optional[Dict[str, Iterable[str]]] = None,
+        deleted: Iterable[str] = (),
+    ):
+        """Log the write that produced `version`.
+
+        `updated` maps each updated id to the fields that changed on it;
+        ids whose fields are all unchanged are left out.
+        """
+        updated = {i: set(f) for i, f in (updated or {}).items() if f}
+        events = [
+            DealChange(version=version, kind=kind, ids=list(ids), fields=fields)
+            for kind, ids, fields in (
+                ("insert", inserted, []),
+                ("update", updated, sorted(set().union(*updated.values()))),
+                ("delete", deleted, []),
+            )
+            if ids
+        ]
+        with self._lock:
+            self._events.extend(events)
+            while len(self._events) > self._max_events:
+                self._floor = self._events.popleft()["version"]
+
+    def reset(self, version: int):
+        """Forget every event: the store changed in ways it could not log,
+        so `changes_since` of anything before `version` must reload."""
+        with self._lock:
+            self._events.clear()
+            self._floor = version
+
+    def since(self, version: int) -> Optional[List[DealChange]]:
+        """Events after `version`, oldest first; None if some were dropped."""
+        with self._lock:
+            if version < self._floor:
+                return None
+            events = list(self._events)
+        start = bisect_right(events, version, key=lambda e: e["version"])
+        return events[start:]
+
+
+def changed_fields(old, new) -> List[str]:
+    """Fields whose values differ between two versions of a deal (Deal
+    models or table rows)."""
+    if old is new:
+        # Edited in place: the old values are gone, so assume everything
+        return list(_DEAL_FIELDS)
+    return [f for f in _DEAL_FIELDS if getattr(old, f) != getattr(new, f)]
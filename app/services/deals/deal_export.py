@@ -0,0 +1,400 @@
+"""Deal exports: streamed CSV and background Parquet / XLSX jobs.
+
+An export used to be built as one string and sent through `rx.download`
+on the state websocket, so a large book was held in memory and pushed as
+a single socket message. Instead the list state registers what to export
+(the query, or an explicit selection) under a short-lived token and hands
+the browser a URL for it; `export_api` serves that URL as a streamed
+response, reading the store a chunk at a time and yielding to the event
+loop between chunks, so memory stays bounded by EXPORT_CHUNK_SIZE and
+other sessions keep being served while a large export runs.
+
+Parquet and XLSX files can only be finished once every row is in, so those
+are built by `build_export` as a background job: it reads the store in
+chunks on the event loop (the store is not thread-safe) and hands each
+chunk to a worker thread to encode, reporting progress as it goes; the
+finished file is then served by token from the same API. pyarrow and
+openpyxl are optional (`pip install .[export]`) and only imported when a
+job in their format runs.
+"""
+
+import asyncio
+import contextlib
+import csv
+import io
+import math
+import os
+import secrets
+import tempfile
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+)
+
+import reflex as rx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import FileResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.services.deals.deal_service import SortSpec, page_cursor, sort_keys
+from app.services.deals.deal_store import get_deal_service
+from app.states.shared.schema import Deal, DealStatus
+
+EXPORT_ROUTE = "/api/deals/export"
+# Rows read from the store (and written to the response) per chunk
+EXPORT_CHUNK_SIZE = 2_000
+# Seconds a registered export can be fetched for
+EXPORT_TTL_SECONDS = 300
+# Rows per chunk for background jobs (each chunk is one progress update)
+EXPORT_JOB_CHUNK_SIZE = 5_000
+# Seconds a finished job's file is kept for download; expired files are
+# deleted by the next job or download, and every file on shutdown
+EXPORT_FILE_TTL_SECONDS = 3_600
+# Excel's sheet limit, less the header row
+XLSX_MAX_ROWS = 1_048_575
+
+# Every Deal field, in model order, is exported under its own name
+EXPORT_FIELDS: List[str] = list(Deal.model_fields)
+
+# Formats a background job can build, with their media types
+EXPORT_FORMATS: Dict[str, str] = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class ExportRequest(TypedDict):
+    """What to export: the deals matching a query, or an explicit selection.
+
+    `criteria` holds the `query()` filter arguments, `sort`/`direction` its
+    ordering and `exclude` ids to skip; with `ids` set, exactly those deals
+    are exported in that order and the query fields are ignored.
+    """
+
+    criteria: dict
+    sort: Optional[SortSpec]
+    direction: str
+    exclude: List[str]
+    ids: Optional[List[str]]
+    filename: str
+
+
+_exports: Dict[str, Tuple[float, ExportRequest]] = {}
+_exports_lock = threading.Lock()
+
+
+def register_export(request: ExportRequest) -> str:
+    """Store `request` for download and return its one-time token."""
+    token = secrets.token_urlsafe(16)
+    now = time.monotonic()
+    with _exports_lock:
+        for stale in [t for t, (expires, _) in _exports.items() if expires < now]:
+            del _exports[stale]
+        _exports[token] = (now + EXPORT_TTL_SECONDS, request)
+    return token
+
+
+def take_export(token: str) -> Optional[ExportRequest]:
+    """Claim the export registered under `token`, if it has not expired."""
+    with _exports_lock:
+        expires, request = _exports.pop(token, (0.0, None))
+    if request is None or expires < time.monotonic():
+        return None
+    return request
+
+
+def export_url(token: str) -> str:
+    """Backend URL the browser downloads the export for `token` from."""
+    return f"{rx.config.get_config().api_url}{EXPORT_ROUTE}/{token}"
+
+
+def export_chunks(
+    request: ExportRequest, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[List[Deal]]:
+    """The deals of `request` in order, `chunk_size` at a time.
+
+    Single-column sorts page through the store with keyset cursors, so each
+    chunk costs about one page query. Multi-column sorts cannot resume from
+    a cursor, so their order is read once as ids (the in-memory store keeps
+    it cached for paging) and resolved into deals a chunk at a time, like
+    an explicit selection.
+    """
+    deal_service = get_deal_service()
+    excluded = set(request["exclude"])
+    keys = sort_keys(request["sort"], request["direction"])
+    if request["ids"] is not None:
+        ids = request["ids"]
+    elif len(keys) > 1:
+        ordered = deal_service.sorted_ids(**request["criteria"], sort=keys)
+        ids = [i for i in ordered if i not in excluded]
+    else:
+        ids = None
+    if ids is not None:
+        # Read the deals from one snapshot, so edits made while the export
+        # runs do not leave it half old, half new
+        with deal_service.snapshot() as snapshot:
+            ids = iter(ids)
+            while batch := list(islice(ids, chunk_size)):
+                yield snapshot.get_deals_by_ids(batch)
+        return
+
+    sort, direction = keys[0] if keys else (None, request["direction"])
+    after = None
+    while True:
+        page = deal_service.query(
+            **request["criteria"],
+            sort=sort,
+            direction=direction,
+            limit=chunk_size,
+            after=after,
+        )["deals"]
+        if not page:
+            return
+        yield [d for d in page if d.id not in excluded]
+        if len(page) < chunk_size:
+            return
+        after = page_cursor(page[-1], sort)
+
+
+def export_rows(deals: Iterable[Deal]) -> List[list]:
+    """One list of EXPORT_FIELDS values per deal (enums as their values)."""
+    return [
+        [_export_value(getattr(deal, field)) for field in EXPORT_FIELDS]
+        for deal in deals
+    ]
+
+
+async def stream_csv(request: ExportRequest):
+    """Yield the export as CSV text, one chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for chunk in export_chunks(request):
+        writer.writerows(export_rows(chunk))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        # Let other sessions' events run between chunks
+        await asyncio.sleep(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def download_export(http_request: Request):
+    request = take_export(http_request.path_params["token"])
+    if request is None:
+        return PlainTextResponse("Export not found or expired.", status_code=404)
+    return StreamingResponse(
+        stream_csv(request),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="{request["filename"]}"'
+        },
+    )
+
+
+class _CsvFile:
+    def __init__(self, path: Path):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(EXPORT_FIELDS)
+
+    def write(self, deals: List[Deal]):
+        self._writer.writerows(export_rows(deals))
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetFile:
+    """Writes each chunk as a row group, so only one chunk is held at a time."""
+
+    def __init__(self, path: Path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export needs pyarrow: pip install pyarrow"
+            ) from e
+        self._pa = pa
+        self._schema = pa.schema(
+            [(field, _arrow_type(pa, field)) for field in EXPORT_FIELDS]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, deals: List[Deal]):
+        columns = list(zip(*export_rows(deals))) or [()] * len(EXPORT_FIELDS)
+        self._writer.write_table(
+            self._pa.Table.from_arrays(
+                [
+                    self._pa.array(c, type=t)
+                    for c, t in zip(columns, self._schema.types)
+                ],
+                schema=self._schema,
+            )
+        )
+
+    def close(self):
+        self._writer.close()
+
+
+class _XlsxFile:
+    """A write-only workbook: rows are streamed into the sheet's XML on disk."""
+
+    def __init__(self, path: Path):
+        try:
+            from openpyxl import Workbook
+        except ImportError as e:
+            raise ImportError("XLSX export needs openpyxl: pip install openpyxl") from e
+        self._path = path
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet("Deals")
+        self._sheet.append(EXPORT_FIELDS)
+        self._rows = 0
+
+    def write(self, deals: List[Deal]):
+        self._rows += len(deals)
+        if self._rows > XLSX_MAX_ROWS:
+            raise ValueError(
+                f"XLSX export is limited to {XLSX_MAX_ROWS:,} rows; use CSV or Parquet"
+            )
+        for row in export_rows(deals):
+            self._sheet.append(row)
+
+    def close(self):
+        self._workbook.save(self._path)
+
+
+_EXPORT_WRITERS = {"csv": _CsvFile, "parquet": _ParquetFile, "xlsx": _XlsxFile}
+
+# Encoding runs off the event loop; two workers keep a burst of jobs from
+# starving the rest of the process
+_export_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="deal-export")
+
+_EXPORT_DIR = Path(tempfile.gettempdir()) / "deal-exports"
+
+# token -> (expiry, path, download filename)
+_export_files: Dict[str, Tuple[float, Path, str]] = {}
+
+
+async def build_export(
+    request: ExportRequest,
+    export_format: str,
+    on_progress: Callable[[int], Awaitable[None]],
+) -> str:
+    """Write `request` to a file in `export_format` and return its token.
+
+    `on_progress` is awaited with the number of rows written after each
+    chunk. The file is downloadable from `export_file_url(token)` for
+    EXPORT_FILE_TTL_SECONDS.
+    """
+    if export_format not in _EXPORT_WRITERS:
+        raise ValueError(f"Unsupported export format: {export_format!r}")
+    _prune_export_files()
+    _EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    token = secrets.token_urlsafe(16)
+    path = _EXPORT_DIR / f"{token}.{export_format}"
+    loop = asyncio.get_running_loop()
+    try:
+        writer = await loop.run_in_executor(
+            _export_pool, _EXPORT_WRITERS[export_format], path
+        )
+        try:
+            rows = 0
+            for chunk in export_chunks(request, EXPORT_JOB_CHUNK_SIZE):
+                await loop.run_in_executor(_export_pool, writer.write, chunk)
+                rows += len(chunk)
+                await on_progress(rows)
+        finally:
+            await loop.run_in_executor(_export_pool, writer.close)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    filename = f"{os.path.splitext(request['filename'])[0]}.{export_format}"
+    with _exports_lock:
+        _export_files[token] = (
+            time.monotonic() + EXPORT_FILE_TTL_SECONDS,
+            path,
+            filename,
+        )
+    return token
+
+
+def export_file_url(token: str) -> str:
+    """Backend URL of the file built by `build_export`."""
+    return f"{rx.config.get_config().api_url}{EXPORT_ROUTE}/files/{token}"
+
+
+async def download_export_file(http_request: Request):
+    _prune_export_files()
+    with _exports_lock:
+        expires, path, filename = _export_files.get(
+            http_request.path_params["token"], (0.0, None, "")
+        )
+    if path is None or expires < time.monotonic() or not path.exists():
+        return PlainTextResponse("Export not found or expired.", status_code=404)
+    extension = path.suffix.lstrip(".")
+    return FileResponse(path, media_type=EXPORT_FORMATS[extension], filename=filename)
+
+
+def _prune_export_files(until: Optional[float] = None):
+    """Delete the files of jobs expiring before `until` (default: now)."""
+    until = time.monotonic() if until is None else until
+    with _exports_lock:
+        stale = [t for t, (expires, _, _) in _export_files.items() if expires < until]
+        paths = [_export_files.pop(t)[1] for t in stale]
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+@contextlib.asynccontextmanager
+async def export_files_lifespan():
+    """App lifespan task: delete every job file on shutdown, as the tokens
+    that serve them do not outlive the process."""
+    try:
+        yield
+    finally:
+        _prune_export_files(until=math.inf)
+
+
+# Mounted in front of the Reflex backend (see app.app)
+export_api = Starlette(
+    routes=[
+        Route(EXPORT_ROUTE + "/files/{token}", download_export_file),
+        Route(EXPORT_ROUTE + "/{token}", download_export),
+    ]
+)
+
+
+def _export_value(value):
+    return getattr(value, "value", value)
+
+
+def _arrow_type(pa, field: str):
+    """Arrow column type for a Deal field, from its (Optional) annotation."""
+    annotation = Deal.model_fields[field].annotation
+    base = next(
+        (t for t in typing.get_args(annotation) if t is not type(None)), annotation
+    )
+    return {
+        bool: pa.bool_(),
+        int: pa.int64(),
+        float: pa.float64(),
+        DealStatus: pa.string(),
+    }.get(base, pa.string())
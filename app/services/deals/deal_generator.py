@@ -0,0 +1,287 @@
+"""Seeded synthetic deal generator for load testing.
+
+`generate_deals(count, seed)` streams schema-valid deals a chunk at a time,
+drawing each column for the whole chunk in one call. With NumPy installed
+the numeric, date and categorical columns are vectorized draws; without it
+a seeded `random.Random` fills the same columns with the same
+distributions. Either way a given seed always yields the same book, though
+the two paths produce different books for the same seed.
+
+Company names and descriptions come from small seeded Faker pools, tickers
+are a seeded permutation of the five-letter space (so they are unique), and
+deals are assembled without validation: every column is drawn inside the
+schema's constraints, and `validate=True` re-checks each row.
+"""
+
+import csv
+import json
+import random
+import uuid
+from datetime import date, timedelta
+from itertools import batched
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Sequence
+
+from faker import Faker
+
+from app.states.shared.schema import Deal, DealStatus
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install .[loadtest] for vectorized draws
+    np = None
+
+_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_LETTER_PAIRS = [a + b for a in _LETTERS for b in _LETTERS]
+# Five-letter tickers; the stride is coprime with 26, so i -> i * stride
+# (mod the space) is a permutation and tickers never repeat
+_TICKER_SPACE = 26**5
+_TICKER_STRIDE = 7_919_879
+MAX_DEALS = _TICKER_SPACE
+
+_COMPANY_POOL_SIZE = 2_000
+_DESCRIPTION_POOL_SIZE = 200
+_DATE_SPAN_DAYS = 365
+_PRICING_LAG_DAYS = 30
+
+
+class _PythonColumns:
+    """Column draws from a seeded `random.Random`."""
+
+    def __init__(self, seed: int):
+        self._rng = random.Random(seed)
+
+    def uniform(self, low: float, high: float, n: int) -> List[float]:
+        u = self._rng.uniform
+        return [round(u(low, high), 2) for _ in range(n)]
+
+    def integers(self, low: int, high: int, n: int) -> List[int]:
+        """Inclusive of both bounds."""
+        # low + int(random() * span) is several times faster than randint
+        r, span = self._rng.random, high - low + 1
+        return [low + int(r() * span) for _ in range(n)]
+
+    def choice(self, options: Sequence[Any], n: int) -> List[Any]:
+        return self._rng.choices(options, k=n)
+
+    def booleans(self, n: int) -> List[bool]:
+        bits = self._rng.getrandbits(n) if n else 0
+        return [bool(bits >> i & 1) for i in range(n)]
+
+
+class _NumpyColumns:
+    """Column draws from a seeded NumPy Generator, one call per column."""
+
+    def __init__(self, seed: int):
+        self._rng = np.random.default_rng(seed)
+
+    def uniform(self, low: float, high: float, n: int) -> List[float]:
+        return self._rng.uniform(low, high, n).round(2).tolist()
+
+    def integers(self, low: int, high: int, n: int) -> List[int]:
+        return self._rng.integers(low, high, n, endpoint=True).tolist()
+
+    def choice(self, options: Sequence[Any], n: int) -> List[Any]:
+        picks = self._rng.integers(0, len(options), n)
+        return [options[i] for i in picks.tolist()]
+
+    def booleans(self, n: int) -> List[bool]:
+        return (self._rng.random(n) < 0.5).tolist()
+
+
+def generate_deals(
+    count: int,
+    seed: int = 0,
+    start_date: date = date(2025, 1, 1),
+    chunk_size: int = 10_000,
+    validate: bool = False,
+) -> Iterator[Deal]:
+    """Yield `count` synthetic deals, deterministic for a given `seed`.
+
+    Announce dates fall within a year of `start_date` and pricing dates up to
+    30 days after them. Memory use is bounded by `chunk_size`, so the
+    stream can be written to a file or a store without holding the book.
+    """
+    if not 0 <= count <= MAX_DEALS:
+        raise ValueError(f"count must be between 0 and {MAX_DEALS:,}")
+    columns = (_NumpyColumns if np is not None else _PythonColumns)(seed)
+    id_rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    companies = [fake.company() for _ in range(_COMPANY_POOL_SIZE)]
+    descriptions = [
+        fake.paragraph(nb_sentences=3) for _ in range(_DESCRIPTION_POOL_SIZE)
+    ]
+    days = [
+        (start_date + timedelta(days=d)).isoformat()
+        for d in range(_DATE_SPAN_DAYS + _PRICING_LAG_DAYS + 1)
+    ]
+    ticker_offset = id_rng.randrange(_TICKER_SPACE)
+    build = Deal.model_validate if validate else _construct
+
+    for start in range(0, count, chunk_size):
+        n = min(chunk_size, count - start)
+        announce = columns.integers(0, _DATE_SPAN_DAYS, n)
+        lag = columns.integers(0, _PRICING_LAG_DAYS, n)
+        pmi = columns.integers(0, _DATE_SPAN_DAYS, n)
+        warrants_min = columns.integers(0, 5, n)
+        warrants_strike = columns.uniform(10.0, 100.0, n)
+        warrants_exp = columns.integers(0, _DATE_SPAN_DAYS, n)
+        cols = zip(
+            range(start, start + n),
+            announce,
+            lag,
+            pmi,
+            warrants_min,
+            warrants_strike,
+            warrants_exp,
+            columns.choice(Deal.STRUCTURES, n),
+            columns.choice(Deal.SECTORS, n),
+            columns.choice(Deal.COUNTRIES, n),
+            columns.choice(list(DealStatus), n),
+            columns.choice(companies, n),
+            columns.choice(descriptions, n),
+            columns.uniform(1.0, 50.0, n),
+            columns.uniform(10.0, 500.0, n),
+            columns.uniform(100.0, 10000.0, n),
+            columns.uniform(100000, 5000000, n),
+            columns.uniform(1.0, 7.0, n),
+            columns.uniform(90.0, 480.0, n),
+            columns.integers(30, 99, n),
+            columns.integers(100000, 999999, n),
+            columns.booleans(n),
+            columns.booleans(n),
+            columns.booleans(n),
+        )
+        for (
+            i,
+            announce_day,
+            lag_days,
+            pmi_day,
+            w_min,
+            w_strike,
+            w_exp,
+            structure,
+            sector,
+            country,
+            status,
+            company,
+            description,
+            shares,
+            price,
+            market_cap,
+            avg_volume,
+            spread,
+            net_price,
+            confidence,
+            reg_no,
+            bought,
+            clean_up,
+            top_up,
+        ) in cols:
+            created = days[announce_day] + "T00:00:00"
+            yield build(
+                dict(
+                    _DEFAULTS,
+                    id=str(uuid.UUID(int=id_rng.getrandbits(128), version=4)),
+                    ticker=_ticker(i, ticker_offset),
+                    structure=structure,
+                    company_name=company,
+                    pricing_date=days[announce_day + lag_days],
+                    announce_date=days[announce_day],
+                    pmi_date=days[pmi_day],
+                    shares_amount=shares,
+                    offering_price=price,
+                    market_cap=market_cap,
+                    avg_volume=avg_volume,
+                    gross_spread=spread,
+                    net_purchase_price=net_price,
+                    status=status,
+                    ai_confidence_score=confidence,
+                    flag_bought=bought,
+                    flag_clean_up=clean_up,
+                    flag_top_up=top_up,
+                    sector=sector,
+                    country=country,
+                    deal_description=description,
+                    reg_id=f"333-{reg_no}",
+                    warrants_min=w_min,
+                    warrants_strike=w_strike if w_min else None,
+                    warrants_exp=days[w_exp] if w_min else None,
+                    created_at=created,
+                    updated_at=created,
+                )
+            )
+
+
+# Every field at its schema default, so rows can skip default resolution
+_DEFAULTS = {
+    name: None if field.is_required() or field.default_factory else field.default
+    for name, field in Deal.model_fields.items()
+}
+# Shared by every constructed deal: it already names every field, so the
+# add() pydantic performs on attribute assignment never changes it
+_FIELDS_SET = set(Deal.model_fields)
+
+
+def _construct(row: dict) -> Deal:
+    """`Deal.model_construct` for a row that already holds every field.
+
+    model_construct resolves defaults field by field, which dominates the
+    cost of a synthetic row; the row is complete, so set the instance state
+    directly.
+    """
+    deal = Deal.__new__(Deal)
+    object.__setattr__(deal, "__dict__", row)
+    object.__setattr__(deal, "__pydantic_fields_set__", _FIELDS_SET)
+    object.__setattr__(deal, "__pydantic_extra__", None)
+    object.__setattr__(deal, "__pydantic_private__", None)
+    return deal
+
+
+def _ticker(i: int, offset: int) -> str:
+    code = (i * _TICKER_STRIDE + offset) % _TICKER_SPACE
+    return (
+        _LETTERS[code // 676**2]
+        + _LETTER_PAIRS[code // 676 % 676]
+        + _LETTER_PAIRS[code % 676]
+    )
+
+
+def write_deals(deals: Iterable[Deal], path: str | Path) -> int:
+    """Stream deals to a .jsonl or .csv file; returns how many were written."""
+    path = Path(path)
+    if path.suffix not in (".jsonl", ".csv"):
+        raise ValueError(f"Unsupported deal file type: {path.suffix!r}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with path.open("w", newline="", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for deal in deals:
+                f.write(deal.model_dump_json())
+                f.write("\n")
+                written += 1
+        else:
+            writer = csv.DictWriter(f, fieldnames=list(Deal.model_fields))
+            writer.writeheader()
+            for deal in deals:
+                writer.writerow(deal.model_dump(mode="json"))
+                written += 1
+    return written
+
+
+def read_deals(path: str | Path) -> Iterator[Deal]:
+    """Stream deals back from a .jsonl file written by `write_deals`."""
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield Deal.model_validate(json.loads(line))
+
+
+def save_in_batches(service, deals: Iterable[Deal], batch_size: int = 10_000) -> int:
+    """Upsert a deal stream into a store through `save_deals`, one batch at a
+    time; returns how many deals were saved."""
+    saved = 0
+    for batch in batched(deals, batch_size):
+        saved += len(service.save_deals(batch))
+    return saved
@@ -1,119 +1,971 @@
-from typing import List, Optional
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+)
 from datetime import datetime
+from enum import Enum
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import islice
+from operator import neg
 import random
 from faker import Faker
 from app.states.shared.schema import Deal, DealStatus
+from app.services.deals.indexes import (
+    HashIndex,
+    SortedIndex,
+    TrigramIndex,
+    sort_key,
+)
+from app.services.deals.change_feed import ChangeLog, DealChange, changed_fields
+from app.services.deals.persistent import PersistentMap
+from app.services.deals.query_cache import QueryCache, cached_query
 
 fake = Faker()
 
 
+# (sort column value, deal id) of the last row already shown
+PageCursor = Tuple[Any, str]
+
+
+class DealPage(TypedDict):
+    """One page of a deal query plus the total number of matches."""
+
+    deals: List[Deal]
+    total: int
+
+
+# A sort column, or (column, "asc" | "desc") pairs from primary key down
+SortSpec = Union[str, Sequence[Tuple[str, str]]]
+
+# {facet field: {value: number of matching deals}}
+FacetCounts = Dict[str, Dict[str, int]]
+
+# A `query(ranges=...)` filter: (low, high), None = unbounded, optionally
+# followed by which bounds are inclusive, as in pandas' `between`: "both"
+# (the default), "left", "right" or "neither". (5, None, "neither") is > 5.
+RangeFilter = Union[
+    Tuple[Optional[float], Optional[float]],
+    Tuple[Optional[float], Optional[float], str],
+]
+
+# inclusive -> (low bound inclusive, high bound inclusive)
+RANGE_INCLUSIVE: Dict[str, Tuple[bool, bool]] = {
+    "both": (True, True),
+    "left": (True, False),
+    "right": (False, True),
+    "neither": (False, False),
+}
+
+
+class DealSnapshot:
+    """The book as of one store version.
+
+    Immutable and shared: the store publishes a new snapshot on every write,
+    sharing all unchanged structure with the previous one, so holding one is
+    free, it never changes underneath the holder and it can be read from any
+    thread. Use as a context manager (or `close()` it) for parity with
+    `SqliteDealService.snapshot`, which pins a database transaction.
+    """
+
+    __slots__ = ("version", "_deals")
+
+    def __init__(self, version: int, deals: PersistentMap):
+        self.version = version
+        self._deals = deals
+
+    def get_deal_by_id(self, deal_id: str) -> Optional[Deal]:
+        return self._deals.get(deal_id)
+
+    def get_deals_by_ids(self, deal_ids: Iterable[str]) -> List[Deal]:
+        """The deals for `deal_ids` that exist, in the given order."""
+        get = self._deals.get
+        return [deal for deal in map(get, deal_ids) if deal is not None]
+
+    def __len__(self) -> int:
+        return len(self._deals)
+
+    def __iter__(self) -> Iterator[Deal]:
+        return self._deals.values()
+
+    def close(self):
+        """Nothing to release; a snapshot lives as long as it is referenced."""
+
+    def __enter__(self) -> "DealSnapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DealSuggestion(TypedDict):
+    """An autocomplete hit for the deal search box."""
+
+    id: str
+    ticker: str
+    company_name: str
+
+
+def generate_fake_deals(count: int = 50) -> List[Deal]:
+    """Build a batch of random Faker deals used to seed an empty store."""
+    structures = ["IPO", "M&A", "Spin-off", "Follow-on", "Convertible"]
+    sectors = ["Technology", "Healthcare", "Finance", "Energy", "Consumer"]
+    countries = ["USA", "UK", "Germany", "Canada", "Singapore"]
+    statuses = [s.value for s in DealStatus]
+    deals: List[Deal] = []
+
+    for _ in range(count):
+        status = random.choice(statuses)
+        ticker = fake.unique.lexify(text="????").upper()
+        now = datetime.now().isoformat()
+        warrants_min = random.randint(0, 5)
+        if warrants_min > 0:
+            warrants_strike = round(random.uniform(10.0, 100.0), 2)
+            warrants_exp = fake.date_this_year().isoformat()
+        else:
+            warrants_strike = None
+            warrants_exp = None
+
+        announce_dt = fake.date_this_year()
+        pricing_dt = fake.date_between(start_date=announce_dt, end_date="+30d")
+
+        deal = Deal(
+            ticker=ticker,
+            structure=random.choice(structures),
+            company_name=fake.company(),
+            pricing_date=pricing_dt.isoformat(),
+            announce_date=announce_dt.isoformat(),
+            pmi_date=fake.date_this_year().isoformat(),
+            shares_amount=round(random.uniform(1.0, 50.0), 2),
+            offering_price=round(random.uniform(10.0, 500.0), 2),
+            market_cap=round(random.uniform(100.0, 10000.0), 2),
+            avg_volume=round(random.uniform(100000, 5000000), 2),
+            gross_spread=round(random.uniform(1.0, 7.0), 2),
+            net_purchase_price=round(random.uniform(90.0, 480.0), 2),
+            status=status,
+            ai_confidence_score=random.randint(30, 99),
+            flag_bought=random.choice([True, False]),
+            flag_clean_up=random.choice([True, False]),
+            flag_top_up=random.choice([True, False]),
+            sector=random.choice(sectors),
+            country=random.choice(countries),
+            # Use actual local path for testing - change to network path in production
+            source_file=r"C:\Users\orkap\Desktop\Programming\Fintech-Deal-Management-UI\assets\sample_deal.pdf",
+            deal_description=fake.paragraph(nb_sentences=3),
+            reg_id=f"333-{random.randint(100000, 999999)}",
+            warrants_min=warrants_min,
+            warrants_strike=warrants_strike,
+            warrants_exp=warrants_exp,
+            created_at=now,
+            updated_at=now,
+            concurrent=None,
+            id_bb_global=None,
+            id_sedol1=None,
+            action_id=None,
+            first_trade_date=None,
+            inst_own_date=None,
+            price_on_pricing_date=None,
+            vol_on_pricing_date=None,
+            offer_price_usd=None,
+            fx_rate=None,
+            fee_percent=None,
+            reported_shares=None,
+            bbg_shares=None,
+            primary_shares=None,
+            secondary_shares=None,
+            eqy_sh_out=None,
+            eqy_float=None,
+            inst_own_pct=None,
+            bics_level=None,
+            avg_daily_val=None,
+            vix=None,
+            vol_90_day=None,
+            short_int=None,
+            cdr_exch_code=None,
+        )
+        deals.append(deal)
+    return deals
+
+
 class DealService:
-    def __init__(self):
-        self._deals: List[Deal] = []
+    """In-memory deal store.
+
+    Deals are kept in an insertion-ordered dict keyed by id. Hash indexes on
+    ticker, status, sector, country and structure, sorted indexes on the
+    date and sortable columns, a trigram index over SEARCH_FIELDS and
+    lowercase prefix indexes over PREFIX_FIELDS are maintained alongside it,
+    so lookups, upserts and deletes are O(1) (O(log n) for the sorted
+    indexes) and filters, sorts and search resolve through bucket lookups,
+    bisect, pre-sorted walks and posting-list intersection instead of full
+    scans.
+
+    Every write also publishes an immutable `DealSnapshot` (a persistent
+    map, updated in O(log n)) for readers that need a stable view across
+    several reads or threads. `get_deal_by_id` / `get_deal_by_ticker` return
+    copies, so edits stay private until `save_deal` publishes them.
+    """
+
+    HASH_INDEX_FIELDS: ClassVar[list[str]] = [
+        "ticker",
+        "status",
+        "sector",
+        "country",
+        "structure",
+    ]
+    # Date and numeric range filters, every sortable column of the deals
+    # table and the review queue's created_at, so a sort or direction
+    # change walks a pre-sorted order
+    SORTED_INDEX_FIELDS: ClassVar[list[str]] = [
+        "pricing_date",
+        "announce_date",
+        "ticker",
+        "structure",
+        "shares_amount",
+        "offering_price",
+        "sector",
+        "country",
+        "market_cap",
+        "ai_confidence_score",
+        "gross_spread",
+        "created_at",
+    ]
+    # Numeric columns accepted by `query(ranges=...)`
+    RANGE_FIELDS: ClassVar[list[str]] = [
+        "market_cap",
+        "offering_price",
+        "shares_amount",
+        "gross_spread",
+        "ai_confidence_score",
+    ]
+    SEARCH_FIELDS: ClassVar[list[str]] = [
+        "ticker",
+        "company_name",
+        "sector",
+        "country",
+        "deal_description",
+        "reg_id",
+    ]
+    PREFIX_FIELDS: ClassVar[list[str]] = ["ticker", "company_name"]
+    # Columns `facet_counts` tallies; each has a hash index
+    FACET_FIELDS: ClassVar[list[str]] = ["status", "sector", "country", "structure"]
+    # Recent search results kept for incremental narrowing
+    SEARCH_CACHE_SIZE: ClassVar[int] = 64
+    # Multi-column sort orders kept for paging through them
+    ORDER_CACHE_SIZE: ClassVar[int] = 8
+    # Deals held (across every entry) by the shared query-result cache
+    QUERY_CACHE_ROWS: ClassVar[int] = 20_000
+
+    def __init__(self, seed_deals: Optional[Callable[[], Iterable[Deal]]] = None):
+        """`seed_deals` supplies the initial book (Faker demo deals by default)."""
+        self._seed_deals = seed_deals or generate_fake_deals
+        # Bumped by every write; callers key cached query results on it
+        self.version = 0
+        self._deals: Dict[str, Deal] = {}
+        self._hash_indexes: Dict[str, HashIndex] = {
+            f: HashIndex(f) for f in self.HASH_INDEX_FIELDS
+        }
+        self._sorted_indexes: Dict[str, SortedIndex] = {
+            f: SortedIndex(f) for f in self.SORTED_INDEX_FIELDS
+        }
+        self._search_index = TrigramIndex()
+        # Lowercased SEARCH_FIELDS per deal, for verifying search candidates
+        self._search_texts: Dict[str, str] = {}
+        self._search_cache: OrderedDict[str, Set[str]] = OrderedDict()
+        self._search_cache_version = 0
+        # (sort keys, filters) -> every match in multi-column sort order,
+        # until the next write
+        self._order_cache: OrderedDict[tuple, List[str]] = OrderedDict()
+        # Ranks of the columns without a sorted index, built on first use
+        self._column_ranks: Dict[str, Dict[str, int]] = {}
+        self._order_cache_version = 0
+        # query / facet_counts results shared across sessions, per version
+        self.query_cache = QueryCache(self.QUERY_CACHE_ROWS)
+        self._prefix_indexes: Dict[str, SortedIndex] = {
+            f: SortedIndex(f) for f in self.PREFIX_FIELDS
+        }
+        self._snapshot = DealSnapshot(self.version, PersistentMap())
+        self.change_log = ChangeLog(self.version)
         self._initialized = False
 
-    def get_deals(self) -> List[Deal]:
+    def _ensure_initialized(self):
         if not self._initialized:
-            self._generate_fake_data()
             self._initialized = True
-        return self._deals
+            for deal in self._seed_deals():
+                self._deals[deal.id] = deal
+                for field, index in self._hash_indexes.items():
+                    index.add(deal.id, _index_key(getattr(deal, field, None)))
+                self._search_texts[deal.id] = _search_text(
+                    getattr(deal, f, None) for f in self.SEARCH_FIELDS
+                )
+            # One sort per sorted index and one pass over the search texts
+            # instead of an insert per deal
+            for field, index in self._sorted_indexes.items():
+                index.load((i, getattr(d, field, None)) for i, d in self._deals.items())
+            for field, index in self._prefix_indexes.items():
+                index.load(
+                    (i, getattr(d, field).lower())
+                    for i, d in self._deals.items()
+                    if getattr(d, field, None)
+                )
+            self._search_index.load(self._search_texts.items())
+            self._snapshot = DealSnapshot(
+                self.version, PersistentMap(self._deals.items())
+            )
+
+    def get_deals(self) -> List[Deal]:
+        self._ensure_initialized()
+        return list(self._deals.values())
 
     def get_deal_by_id(self, deal_id: str) -> Optional[Deal]:
-        return next((d for d in self._deals if d.id == deal_id), None)
+        """A private copy of the deal, to edit and pass to `save_deal`."""
+        self._ensure_initialized()
+        deal = self._deals.get(deal_id)
+        return deal.model_copy() if deal is not None else None
 
     def get_deal_by_ticker(self, ticker: str) -> Optional[Deal]:
-        return next((d for d in self._deals if d.ticker == ticker), None)
+        self._ensure_initialized()
+        deal_id = self._hash_indexes["ticker"].first(ticker)
+        return self._deals[deal_id].model_copy() if deal_id else None
+
+    def snapshot(self) -> DealSnapshot:
+        """The current published snapshot of the book (O(1))."""
+        self._ensure_initialized()
+        return self._snapshot
 
     def save_deal(self, deal: Deal) -> Deal:
-        # Check if update or create
-        existing_index = next(
-            (i for i, d in enumerate(self._deals) if d.id == deal.id), None
+        self._ensure_initialized()
+        old = self._deals.get(deal.id)
+        # Upsert: replacing an existing key keeps its position in the dict
+        self._deals[deal.id] = deal
+        self._reindex(deal)
+        self.version += 1
+        self._publish(saved=[deal])
+        self._record_saves([(old, deal)])
+        return deal
+
+    def delete_deal(self, deal_id: str) -> bool:
+        self._ensure_initialized()
+        if self._deals.pop(deal_id, None) is None:
+            return False
+        self._unindex(deal_id)
+        self.version += 1
+        self._publish(deleted=[deal_id])
+        self.change_log.record(self.version, deleted=[deal_id])
+        return True
+
+    def changes_since(self, version: int) -> Optional[List[DealChange]]:
+        """What the writes after `version` did, oldest first; None once the
+        change log no longer reaches back that far (reload everything)."""
+        return self.change_log.since(version)
+
+    def sync_version(self):
+        """Catch `version` up with writes made elsewhere; the in-memory
+        store is only ever written through itself, so there are none."""
+
+    def save_deals(self, deals: Iterable[Deal]) -> List[Deal]:
+        """Upsert a batch of deals in one pass."""
+        self._ensure_initialized()
+        saved, changes = [], []
+        for deal in deals:
+            changes.append((self._deals.get(deal.id), deal))
+            self._deals[deal.id] = deal
+            self._reindex(deal)
+            saved.append(deal)
+        if saved:
+            self.version += 1
+            self._publish(saved=saved)
+            self._record_saves(changes)
+        return saved
+
+    def delete_deals(self, deal_ids: Iterable[str]) -> int:
+        """Delete a batch of deals in one pass; returns how many were removed."""
+        self._ensure_initialized()
+        deleted = []
+        for deal_id in deal_ids:
+            if self._deals.pop(deal_id, None) is not None:
+                self._unindex(deal_id)
+                deleted.append(deal_id)
+        if deleted:
+            self.version += 1
+            self._publish(deleted=deleted)
+            self.change_log.record(self.version, deleted=deleted)
+        return len(deleted)
+
+    def filter_deals(
+        self,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_field: str = "pricing_date",
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Deal]:
+        """Return deals matching every given criterion (None = any).
+
+        Equality criteria resolve through the hash indexes and the inclusive
+        [date_from, date_to] range through the sorted index on `date_field`.
+        """
+        self._ensure_initialized()
+        buckets = self._hash_buckets(status, sector, country, structure)
+        ranges = self._ranges({date_field: range_bounds((date_from, date_to))})
+        return [self._deals[i] for i in self._matching_ids(buckets, ranges)]
+
+    def count_deals(
+        self,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_field: str = "pricing_date",
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> int:
+        """Count deals matching the `filter_deals` criteria."""
+        self._ensure_initialized()
+        buckets = self._hash_buckets(status, sector, country, structure)
+        ranges = self._ranges({date_field: range_bounds((date_from, date_to))})
+        return self._count_matching(buckets, ranges)
+
+    @cached_query
+    def query(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        sort: Optional[SortSpec] = "pricing_date",
+        direction: str = "desc",
+        offset: int = 0,
+        limit: Optional[int] = None,
+        after: Optional[PageCursor] = None,
+        ranges: Optional[Dict[str, RangeFilter]] = None,
+    ) -> DealPage:
+        """Filter, sort and page the book in one call.
+
+        `search` is a case-insensitive substring match on the SEARCH_FIELDS,
+        resolved through the trigram index; the equality criteria, the inclusive
+        pricing-date range and the `ranges` ({field: RangeFilter} over
+        RANGE_FIELDS) resolve through the secondary indexes, the most
+        selective one driving the intersection. Rows are
+        ordered by (sort value, id), with missing values first ascending and
+        last descending. `after` is a keyset cursor from `page_cursor()`: the
+        page starts right after that row, so deep pages cost O(page size) and
+        do not shift when other deals are inserted. Returns the requested
+        page plus the total number of matches (`limit=0` only counts).
+
+        `sort` may also be a list of (column, direction) pairs, e.g.
+        [("pricing_date", "desc"), ("market_cap", "desc")], over the
+        SORTED_INDEX_FIELDS; ties on every key fall back to id ascending and
+        missing values order as above per key. Such sorts page by `offset`
+        only, as a cursor holds a single sort value; the full order is
+        computed once and kept until the next write, so each further page
+        is a slice of it.
+        """
+        self._ensure_initialized()
+        keys = sort_keys(sort, direction)
+        if len(keys) == 1:
+            sort, direction = keys[0]
+        elif not keys:
+            sort = None
+        reverse = direction == "desc"
+        stop = None if limit is None else offset + limit
+        buckets, ranges = self._query_filters(
+            search, status, sector, country, structure, date_from, date_to, ranges
         )
 
-        if existing_index is not None:
-            self._deals[existing_index] = deal
+        total = self._count_matching(buckets, ranges)
+        if limit == 0:
+            return DealPage(deals=[], total=total)
+
+        if len(keys) > 1:
+            if after is not None:
+                raise ValueError("Cursor paging needs a single sort column")
+            criteria = (search, status, sector, country, structure)
+            ordered = self._ordered_ids(keys, criteria, buckets, ranges)
+            page_ids = ordered[offset:stop]
+            return DealPage(deals=[self._deals[i] for i in page_ids], total=total)
+
+        sort_index = self._sorted_indexes.get(sort) if sort else None
+        if sort_index is not None and total * 4 >= len(self._deals):
+            # Broad filter: walk the pre-sorted index from the cursor and
+            # stop as soon as the page is filled
+            keep = self._predicate(buckets, ranges)
+            if after is None and keep is None:
+                # Unfiltered: jump straight to `offset` by rank, so a deep
+                # window costs the same as the first one
+                page_ids = list(sort_index.slice(offset, stop, reverse))
+            else:
+                if after is None:
+                    walk = sort_index.ordered(reverse)
+                else:
+                    walk = sort_index.seek(*after, reverse=reverse)
+                if keep is not None:
+                    walk = (i for i in walk if keep(i))
+                page_ids = list(islice(walk, offset, stop))
         else:
-            self._deals.append(deal)
-        return deal
+            # Narrow filter (or no index on the sort column): collect the
+            # candidates through the filter indexes and sort just those
+            entries = self._sort_entries(
+                self._matching_ids(buckets, ranges), sort, reverse
+            )
+            if after is not None:
+                cursor = (sort_key(after[0]), after[1])
+                if reverse:
+                    start = len(entries) - bisect_left(entries[::-1], cursor)
+                else:
+                    start = bisect_right(entries, cursor)
+                entries = entries[start:]
+            page_ids = [deal_id for _, deal_id in entries[offset:stop]]
 
-    def delete_deal(self, deal_id: str) -> bool:
-        initial_len = len(self._deals)
-        self._deals = [d for d in self._deals if d.id != deal_id]
-        return len(self._deals) < initial_len
-
-    def _generate_fake_data(self):
-        structures = ["IPO", "M&A", "Spin-off", "Follow-on", "Convertible"]
-        sectors = ["Technology", "Healthcare", "Finance", "Energy", "Consumer"]
-        countries = ["USA", "UK", "Germany", "Canada", "Singapore"]
-        statuses = [s.value for s in DealStatus]
-
-        for _ in range(50):
-            status = random.choice(statuses)
-            ticker = fake.unique.lexify(text="????").upper()
-            now = datetime.now().isoformat()
-            warrants_min = random.randint(0, 5)
-            if warrants_min > 0:
-                warrants_strike = round(random.uniform(10.0, 100.0), 2)
-                warrants_exp = fake.date_this_year().isoformat()
+        return DealPage(deals=[self._deals[i] for i in page_ids], total=total)
+
+    def sorted_ids(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        sort: Optional[SortSpec] = "pricing_date",
+        direction: str = "desc",
+        ranges: Optional[Dict[str, RangeFilter]] = None,
+    ) -> List[str]:
+        """Ids of every `query` match, in query order, without the deals.
+
+        Multi-column orders come from the same cache `query` pages from, so
+        reading one the list view has shown costs nothing. The result must
+        not be mutated.
+        """
+        self._ensure_initialized()
+        keys = sort_keys(sort, direction)
+        if len(keys) > 1:
+            buckets, bounds = self._query_filters(
+                search, status, sector, country, structure, date_from, date_to, ranges
+            )
+            criteria = (search, status, sector, country, structure)
+            return self._ordered_ids(keys, criteria, buckets, bounds)
+        deals = self.query(
+            search=search,
+            status=status,
+            sector=sector,
+            country=country,
+            structure=structure,
+            date_from=date_from,
+            date_to=date_to,
+            sort=sort,
+            direction=direction,
+            ranges=ranges,
+        )["deals"]
+        return [deal.id for deal in deals]
+
+    @cached_query
+    def facet_counts(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        ranges: Optional[Dict[str, RangeFilter]] = None,
+    ) -> FacetCounts:
+        """Deal counts per value of each FACET_FIELDS column under the
+        `query` filters.
+
+        Each facet ignores its own criterion (the status counts are taken
+        with every filter but `status`), so the counts show what picking
+        another value would return. The matching ids are collected once per
+        distinct filter set and tallied in one C-level pass per facet
+        (Counter over the hash index's id -> key map); with no filters at
+        all the counts are just the bucket sizes.
+        """
+        self._ensure_initialized()
+        criteria = {
+            "status": status,
+            "sector": sector,
+            "country": country,
+            "structure": structure,
+        }
+        matches: Dict[tuple, Optional[List[str]]] = {}
+        counts: FacetCounts = {}
+        for field in self.FACET_FIELDS:
+            others = {**criteria, field: None}
+            key = tuple(others.values())
+            if key not in matches:
+                buckets, bounds = self._query_filters(
+                    search, *key, date_from, date_to, ranges
+                )
+                matches[key] = (
+                    list(self._matching_ids(buckets, bounds))
+                    if buckets or bounds
+                    else None
+                )
+            counts[field] = self._hash_indexes[field].counts(matches[key])
+        return counts
+
+    def search_ids(self, search: str) -> Set[str]:
+        """Ids of deals whose SEARCH_FIELDS contain `search` (any case).
+
+        The result must not be mutated: recent results are cached until the
+        next write. A query extending a cached one (typing "APP" -> "APPL")
+        can only match a subset of its result, so only those ids are
+        re-checked. Otherwise queries of three or more characters intersect
+        trigram posting sets and verify the survivors; shorter ones scan
+        the book.
+        """
+        self._ensure_initialized()
+        q = search.lower()
+        if self._search_cache_version != self.version:
+            self._search_cache.clear()
+            self._search_cache_version = self.version
+        cache = self._search_cache
+        if q in cache:
+            cache.move_to_end(q)
+            return cache[q]
+        # Result of the longest cached prefix of the query, if any
+        narrowed = next(
+            (cache[q[:n]] for n in range(len(q) - 1, 0, -1) if q[:n] in cache),
+            None,
+        )
+        candidates = self._search_index.candidates(q)
+        if narrowed is not None and (
+            candidates is None or len(narrowed) < len(candidates)
+        ):
+            candidates = narrowed
+        if candidates is None or len(candidates) * 2 > len(self._deals):
+            # Walking the book in insertion order beats hopping through a
+            # hash set that holds most of it anyway
+            candidates = self._deals
+        texts = self._search_texts
+        result = {i for i in candidates if q in texts[i]}
+        cache[q] = result
+        if len(cache) > self.SEARCH_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[DealSuggestion]:
+        """Autocomplete: deals whose ticker or company name starts with
+        `prefix` (any case), ticker matches first, each in key order.
+
+        Each field is a bisect range scan over its prefix index, so the cost
+        is O(log n + limit) whatever the book size.
+        """
+        self._ensure_initialized()
+        prefix = prefix.strip().lower()
+        if not prefix or limit <= 0:
+            return []
+        seen: Dict[str, None] = {}
+        for field in self.PREFIX_FIELDS:
+            for deal_id in self._prefix_indexes[field].prefix(prefix):
+                seen[deal_id] = None
+                if len(seen) >= limit:
+                    break
+            if len(seen) >= limit:
+                break
+        return [_suggestion(self._deals[i]) for i in seen]
+
+    def close(self):
+        """Nothing to release for the in-memory store."""
+
+    def _publish(self, saved: Iterable[Deal] = (), deleted: Iterable[str] = ()):
+        """Publish the snapshot for the current version: the previous one
+        with `saved` upserted and `deleted` removed, sharing the rest."""
+        deals = self._snapshot._deals
+        for deal in saved:
+            deals = deals.set(deal.id, deal)
+        for deal_id in deleted:
+            deals = deals.delete(deal_id)
+        self._snapshot = DealSnapshot(self.version, deals)
+
+    def _record_saves(self, changes: Iterable[Tuple[Optional[Deal], Deal]]):
+        """Log (previous, saved) deal pairs as inserts and updates."""
+        inserted, updated = [], {}
+        for old, new in changes:
+            if old is None:
+                inserted.append(new.id)
             else:
-                warrants_strike = None
-                warrants_exp = None
-
-            announce_dt = fake.date_this_year()
-            pricing_dt = fake.date_between(start_date=announce_dt, end_date="+30d")
-
-            deal = Deal(
-                ticker=ticker,
-                structure=random.choice(structures),
-                company_name=fake.company(),
-                pricing_date=pricing_dt.isoformat(),
-                announce_date=announce_dt.isoformat(),
-                pmi_date=fake.date_this_year().isoformat(),
-                shares_amount=round(random.uniform(1.0, 50.0), 2),
-                offering_price=round(random.uniform(10.0, 500.0), 2),
-                market_cap=round(random.uniform(100.0, 10000.0), 2),
-                avg_volume=round(random.uniform(100000, 5000000), 2),
-                gross_spread=round(random.uniform(1.0, 7.0), 2),
-                net_purchase_price=round(random.uniform(90.0, 480.0), 2),
-                status=status,
-                ai_confidence_score=random.randint(30, 99),
-                flag_bought=random.choice([True, False]),
-                flag_clean_up=random.choice([True, False]),
-                flag_top_up=random.choice([True, False]),
-                sector=random.choice(sectors),
-                country=random.choice(countries),
-                # Use actual local path for testing - change to network path in production
-                source_file=r"C:\Users\orkap\Desktop\Programming\Fintech-Deal-Management-UI\assets\sample_deal.pdf",
-                deal_description=fake.paragraph(nb_sentences=3),
-                reg_id=f"333-{random.randint(100000, 999999)}",
-                warrants_min=warrants_min,
-                warrants_strike=warrants_strike,
-                warrants_exp=warrants_exp,
-                created_at=now,
-                updated_at=now,
-                concurrent=None,
-                id_bb_global=None,
-                id_sedol1=None,
-                action_id=None,
-                first_trade_date=None,
-                inst_own_date=None,
-                price_on_pricing_date=None,
-                vol_on_pricing_date=None,
-                offer_price_usd=None,
-                fx_rate=None,
-                fee_percent=None,
-                reported_shares=None,
-                bbg_shares=None,
-                primary_shares=None,
-                secondary_shares=None,
-                eqy_sh_out=None,
-                eqy_float=None,
-                inst_own_pct=None,
-                bics_level=None,
-                avg_daily_val=None,
-                vix=None,
-                vol_90_day=None,
-                short_int=None,
-                cdr_exch_code=None,
+                updated.setdefault(new.id, set()).update(changed_fields(old, new))
+        self.change_log.record(self.version, inserted=inserted, updated=updated)
+
+    def _sort_entries(
+        self, ids: Iterable[str], column: Optional[str], reverse: bool
+    ) -> List[tuple]:
+        """(sort key, id) pairs in the same order as SortedIndex.ordered."""
+        entries = [
+            (
+                sort_key(_index_key(getattr(self._deals[i], column, None)))
+                if column
+                else (0,),
+                i,
             )
-            self._deals.append(deal)
+            for i in ids
+        ]
+        entries.sort(reverse=reverse)
+        return entries
+
+    def _ordered_ids(
+        self, keys: List[Tuple[str, str]], criteria: tuple, buckets: list, ranges: list
+    ) -> List[str]:
+        """Every match in multi-column sort order, from the order cache.
+
+        `criteria` are the (search, status, sector, country, structure)
+        arguments that `buckets` were built from. The result must not be
+        mutated.
+        """
+        if self._order_cache_version != self.version:
+            self._order_cache.clear()
+            self._column_ranks.clear()
+            self._order_cache_version = self.version
+        cache = self._order_cache
+        search, *equal = criteria
+        cache_key = (
+            tuple(keys),
+            search.lower() if search else None,
+            *map(_index_key, equal),
+            *((index.field, *bounds) for index, *bounds in ranges),
+        )
+        if cache_key in cache:
+            cache.move_to_end(cache_key)
+            return cache[cache_key]
+        ordered = self._multi_sorted(self._matching_ids(buckets, ranges), keys)
+        cache[cache_key] = ordered
+        if len(cache) > self.ORDER_CACHE_SIZE:
+            cache.popitem(last=False)
+        return ordered
+
+    def _multi_sorted(
+        self, ids: Iterable[str], keys: List[Tuple[str, str]]
+    ) -> List[str]:
+        """Ids ordered by several (column, direction) keys, then id.
+
+        Each key is the column's rank, negated when descending, so a row's
+        composite key is a tuple of ints built by C-level map/zip and
+        compared with no per-comparison Python code.
+        """
+        ids = list(ids)
+        columns = []
+        for field, direction in keys:
+            ranks = map(self._ranks(field).__getitem__, ids)
+            columns.append(map(neg, ranks) if direction == "desc" else ranks)
+        return [row[-1] for row in sorted(zip(*columns, ids))]
+
+    def _ranks(self, field: str) -> Dict[str, int]:
+        """id -> rank of its `field` value, as `SortedIndex.ranks`: from the
+        column's sorted index, or for other columns built once per version
+        from their `sort_key` (missing values first)."""
+        index = self._sorted_indexes.get(field)
+        if index is not None:
+            return index.ranks()
+        ranks = self._column_ranks.get(field)
+        if ranks is None:
+            keys = {
+                deal_id: sort_key(_index_key(getattr(deal, field)))
+                for deal_id, deal in self._deals.items()
+            }
+            rank_of = {key: rank for rank, key in enumerate(sorted(set(keys.values())))}
+            ranks = {deal_id: rank_of[key] for deal_id, key in keys.items()}
+            self._column_ranks[field] = ranks
+        return ranks
+
+    def _query_filters(
+        self, search, status, sector, country, structure, date_from, date_to, ranges
+    ) -> Tuple[list, list]:
+        """Hash buckets and sorted-index ranges for the `query` criteria."""
+        buckets = self._hash_buckets(status, sector, country, structure)
+        if search:
+            buckets.append(self.search_ids(search))
+        bounds = self._ranges(
+            {
+                "pricing_date": range_bounds((date_from, date_to)),
+                **validate_ranges(ranges),
+            }
+        )
+        return buckets, bounds
+
+    def _hash_buckets(self, status, sector, country, structure) -> list:
+        """Hash index buckets for the given equality criteria."""
+        criteria = [
+            ("status", _index_key(status)),
+            ("sector", sector),
+            ("country", country),
+            ("structure", structure),
+        ]
+        return [self._hash_indexes[f].get(key) for f, key in criteria if key]
+
+    def _ranges(self, bounds: Dict[str, Tuple[Any, Any, bool, bool]]) -> list:
+        """(sorted index, low, high, low inclusive, high inclusive) for each
+        field with at least one bound, from `range_bounds` tuples."""
+        ranges = []
+        for field, (low, high, low_inclusive, high_inclusive) in bounds.items():
+            low = None if low is None or low == "" else low
+            high = None if high is None or high == "" else high
+            if low is not None or high is not None:
+                index = self._sorted_indexes[field]
+                ranges.append((index, low, high, low_inclusive, high_inclusive))
+        return ranges
+
+    def _predicate(
+        self, buckets: list, ranges: list
+    ) -> Optional[Callable[[str], bool]]:
+        """Membership test for an id against every bucket and range.
+
+        Returns None when there is nothing to test.
+        """
+        if not buckets and not ranges:
+            return None
+
+        def matches(deal_id: str) -> bool:
+            if any(deal_id not in bucket for bucket in buckets):
+                return False
+            for index, low, high, low_inclusive, high_inclusive in ranges:
+                key = index.key_of(deal_id)
+                if key is None or key == "":
+                    return False
+                if low is not None and (key < low if low_inclusive else key <= low):
+                    return False
+                if high is not None and (key > high if high_inclusive else key >= high):
+                    return False
+            return True
+
+        return matches
+
+    def _count_matching(self, buckets: list, ranges: list) -> int:
+        if not buckets and not ranges:
+            return len(self._deals)
+        if len(buckets) == 1 and not ranges:
+            return len(buckets[0])
+        if len(ranges) == 1 and not buckets:
+            index, *bounds = ranges[0]
+            return index.count_range(*bounds)
+        return sum(1 for _ in self._matching_ids(buckets, ranges))
+
+    def _matching_ids(self, buckets: list, ranges: list) -> Iterator[str]:
+        """Yield ids matching every bucket and range.
+
+        The most selective criterion drives the walk and the others are
+        probed per id.
+        """
+        if not buckets and not ranges:
+            return iter(self._deals)
+        sizes = [(len(b), i, "bucket") for i, b in enumerate(buckets)]
+        sizes += [
+            (index.count_range(*bounds), i, "range")
+            for i, (index, *bounds) in enumerate(ranges)
+        ]
+        _, pos, kind = min(sizes)
+        if kind == "bucket":
+            driver = iter(buckets[pos])
+            buckets = buckets[:pos] + buckets[pos + 1 :]
+        else:
+            index, *bounds = ranges[pos]
+            driver = index.range(*bounds)
+            ranges = ranges[:pos] + ranges[pos + 1 :]
+        probe = self._predicate(buckets, ranges)
+        if probe is None:
+            return driver
+        return (deal_id for deal_id in driver if probe(deal_id))
+
+    def _reindex(self, deal: Deal):
+        for field, index in self._hash_indexes.items():
+            index.add(deal.id, _index_key(getattr(deal, field, None)))
+        text = _search_text(getattr(deal, f, None) for f in self.SEARCH_FIELDS)
+        self._search_index.add(deal.id, text, self._search_texts.get(deal.id))
+        self._search_texts[deal.id] = text
+        for field, index in self._sorted_indexes.items():
+            index.add(deal.id, getattr(deal, field, None))
+        for field, index in self._prefix_indexes.items():
+            value = getattr(deal, field, None)
+            if value:
+                index.add(deal.id, value.lower())
+            else:
+                index.remove(deal.id)
+
+    def _unindex(self, deal_id: str):
+        for index in self._hash_indexes.values():
+            index.remove(deal_id)
+        for index in self._sorted_indexes.values():
+            index.remove(deal_id)
+        text = self._search_texts.pop(deal_id, None)
+        if text is not None:
+            self._search_index.remove(deal_id, text)
+        for index in self._prefix_indexes.values():
+            index.remove(deal_id)
+
+
+def page_cursor(deal: Deal, sort: Optional[str]) -> PageCursor:
+    """Keyset cursor for `deal` under `sort`, for `query(after=...)`."""
+    value = _index_key(getattr(deal, sort, None)) if sort else None
+    return (value, deal.id)
+
+
+def sort_keys(
+    sort: Optional[SortSpec], direction: str = "asc"
+) -> List[Tuple[str, str]]:
+    """Normalize a `query` sort (a column or (column, direction) pairs);
+    raises ValueError for a column that is not a Deal field."""
+    if not sort:
+        return []
+    if isinstance(sort, str):
+        sort = [(sort, direction)]
+    keys = [(field, field_direction) for field, field_direction in sort]
+    for field, field_direction in keys:
+        if field not in Deal.model_fields:
+            raise ValueError(f"Unsupported sort column: {field!r}")
+        if field_direction not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort direction: {field_direction!r}")
+    return keys
+
+
+def validate_ranges(
+    ranges: Optional[Dict[str, RangeFilter]],
+) -> Dict[str, Tuple[Any, Any, bool, bool]]:
+    """Check `query(ranges=...)` fields against DealService.RANGE_FIELDS and
+    normalize each filter with `range_bounds`."""
+    for field in ranges or ():
+        if field not in DealService.RANGE_FIELDS:
+            raise ValueError(f"Unsupported range filter: {field!r}")
+    return {field: range_bounds(bound) for field, bound in (ranges or {}).items()}
+
+
+def range_bounds(bound: RangeFilter) -> Tuple[Any, Any, bool, bool]:
+    """(low, high, low inclusive, high inclusive) for a RangeFilter."""
+    low, high, *inclusive = bound
+    inclusive = inclusive[0] if inclusive else "both"
+    if inclusive not in RANGE_INCLUSIVE:
+        raise ValueError(f"Unsupported range inclusivity: {inclusive!r}")
+    return (low, high, *RANGE_INCLUSIVE[inclusive])
+
+
+def _suggestion(deal: Deal) -> DealSuggestion:
+    return DealSuggestion(
+        id=deal.id, ticker=deal.ticker, company_name=deal.company_name or ""
+    )
+
+
+def _search_text(values: Iterable[Optional[str]]) -> str:
+    """Lowercased field values joined by NUL, so a match cannot span two
+    fields; `q in text` is then one substring test per deal."""
+    return "\0".join(v.lower() for v in values if v)
+
+
+def _index_key(value):
+    """Normalize enum members (e.g. DealStatus) to their plain value."""
+    return value.value if isinstance(value, Enum) else value
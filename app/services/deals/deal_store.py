@@ -0,0 +1,71 @@
+"""Construction of the configured deal store backend."""
+
+import contextlib
+import functools
+import threading
+from typing import Optional
+
+from app.config import (
+    DEAL_STORE_BACKEND,
+    DEAL_STORE_PATH,
+    DEAL_STORE_SEED,
+    DEAL_STORE_SEED_COUNT,
+)
+from app.services.deals.deal_generator import generate_deals
+from app.services.deals.deal_service import DealService
+from app.services.deals.sqlite_deal_service import SqliteDealService
+
+
+def create_deal_service(
+    backend: Optional[str] = None,
+) -> DealService | SqliteDealService:
+    """Build a deal store for `backend` (defaults to DEAL_STORE_BACKEND)."""
+    backend = backend or DEAL_STORE_BACKEND
+    seed_deals = None
+    if DEAL_STORE_SEED_COUNT:
+        seed_deals = functools.partial(
+            generate_deals, DEAL_STORE_SEED_COUNT, DEAL_STORE_SEED
+        )
+    if backend == "memory":
+        return DealService(seed_deals)
+    if backend == "sqlite":
+        return SqliteDealService(DEAL_STORE_PATH, seed_deals)
+    raise ValueError(f"Unknown deal store backend: {backend!r}")
+
+
+_deal_service: Optional[DealService | SqliteDealService] = None
+_deal_service_lock = threading.Lock()
+
+
+def get_deal_service() -> DealService | SqliteDealService:
+    """Return the process-wide deal store, building it on first use.
+
+    Every state mixin goes through this accessor, so there is exactly one copy
+    of the book per process and a write from one mixin is immediately visible
+    to all the others.
+    """
+    global _deal_service
+    if _deal_service is None:
+        with _deal_service_lock:
+            if _deal_service is None:
+                _deal_service = create_deal_service()
+    return _deal_service
+
+
+def close_deal_service():
+    """Release the process-wide deal store; the next access rebuilds it."""
+    global _deal_service
+    with _deal_service_lock:
+        if _deal_service is not None:
+            _deal_service.close()
+            _deal_service = None
+
+
+@contextlib.asynccontextmanager
+async def deal_store_lifespan():
+    """App lifespan task: warm the deal store on startup, close it on shutdown."""
+    get_deal_service().count_deals()
+    try:
+        yield
+    finally:
+        close_deal_service()
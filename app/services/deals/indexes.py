@@ -0,0 +1,501 @@
+"""Secondary and search indexes maintained by the in-memory deal store.
+
+Each index remembers the key it filed a deal under, so `remove` and `add` can
+find the old entry even when a caller passes back a stored deal it has
+mutated in place, whose old values can no longer be read from the object.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+_MISSING = object()
+_EMPTY: Dict[str, None] = {}
+# Sorts after any deal id, making (key, _MAX_ID) an inclusive upper bound
+_MAX_ID = "\uffff"
+# Gap between consecutive ranks when they are rebuilt, leaving room to rank
+# new keys in between without renumbering
+_RANK_STEP = 1 << 16
+
+
+class HashIndex:
+    """Equality index: key -> ids of the deals carrying that key.
+
+    Buckets are dicts used as insertion-ordered sets, so membership, insert and
+    removal are all O(1) and bucket iteration follows insertion order.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self._buckets: Dict[Hashable, Dict[str, None]] = {}
+        self._keys: Dict[str, Hashable] = {}
+
+    def add(self, deal_id: str, key: Hashable):
+        old_key = self._keys.get(deal_id, _MISSING)
+        if old_key == key:
+            return
+        if old_key is not _MISSING:
+            self.remove(deal_id)
+        if key is None:
+            return
+        self._buckets.setdefault(key, {})[deal_id] = None
+        self._keys[deal_id] = key
+
+    def remove(self, deal_id: str):
+        key = self._keys.pop(deal_id, _MISSING)
+        if key is _MISSING:
+            return
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.pop(deal_id, None)
+            if not bucket:
+                del self._buckets[key]
+
+    def get(self, key: Hashable) -> Dict[str, None]:
+        """Return the (read-only) ordered id set for `key`."""
+        return self._buckets.get(key, _EMPTY)
+
+    def first(self, key: Hashable) -> Optional[str]:
+        bucket = self._buckets.get(key)
+        return next(iter(bucket)) if bucket else None
+
+    def count(self, key: Hashable) -> int:
+        return len(self._buckets.get(key, _EMPTY))
+
+    def keys(self) -> List[Hashable]:
+        return list(self._buckets)
+
+    def counts(self, ids: Optional[Iterable[str]] = None) -> Dict[Hashable, int]:
+        """Bucket sizes, or the number of `ids` under each key.
+
+        Counting runs through Counter over the id -> key map, so the pass
+        over `ids` stays in C.
+        """
+        if ids is None:
+            return {key: len(bucket) for key, bucket in self._buckets.items()}
+        counts = Counter(map(self._keys.get, ids))
+        counts.pop(None, None)
+        return dict(counts)
+
+
+class SortedIndex:
+    """Ordered index over (key, id) pairs supporting range scans via bisect.
+
+    Entries live in a list of sorted chunks (the layout used by
+    sortedcontainers), so an insert or removal only shifts one chunk of at
+    most 2 * CHUNK_SIZE entries instead of the whole index. Deals whose key
+    is None are indexed too and sort before every key; ties (including
+    missing keys) are broken by id, so (key, id) is a stable seek position.
+    """
+
+    CHUNK_SIZE = 1000
+
+    def __init__(self, field: str):
+        self.field = field
+        self._chunks: List[List[Tuple[Tuple, str]]] = []
+        # Largest entry in each chunk, for locating a chunk by bisect
+        self._maxes: List[Tuple[Tuple, str]] = []
+        # Entries before each chunk; rebuilt lazily after a write
+        self._offsets: Optional[List[int]] = None
+        # Order-preserving int rank of each id's key; kept up to date by
+        # writes, rebuilt lazily when a new key finds no gap to rank it in
+        self._ranks: Optional[Dict[str, int]] = None
+        self._keys: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, deal_id: str, key: Any):
+        old_key = self._keys.get(deal_id, _MISSING)
+        if old_key is not _MISSING:
+            if old_key == key:
+                return
+            self.remove(deal_id)
+        self._insert((sort_key(key), deal_id))
+        self._keys[deal_id] = key
+
+    def load(self, items: Iterable[Tuple[str, Any]]):
+        """Bulk-build an empty index from (id, key) pairs with one sort."""
+        if self._keys:
+            raise ValueError("load() requires an empty index")
+        for deal_id, key in items:
+            self._keys[deal_id] = key
+        entries = sorted(
+            (sort_key(key), deal_id) for deal_id, key in self._keys.items()
+        )
+        self._chunks = [
+            entries[i : i + self.CHUNK_SIZE]
+            for i in range(0, len(entries), self.CHUNK_SIZE)
+        ]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._offsets = None
+        self._ranks = None
+
+    def remove(self, deal_id: str):
+        key = self._keys.pop(deal_id, _MISSING)
+        if key is _MISSING:
+            return
+        entry = (sort_key(key), deal_id)
+        c = bisect_left(self._maxes, entry)
+        if c == len(self._chunks):
+            return
+        chunk = self._chunks[c]
+        pos = bisect_left(chunk, entry)
+        if pos == len(chunk) or chunk[pos] != entry:
+            return
+        del chunk[pos]
+        if not chunk:
+            del self._chunks[c]
+            del self._maxes[c]
+        elif pos == len(chunk):
+            self._maxes[c] = chunk[-1]
+        self._offsets = None
+        if self._ranks is not None:
+            # The remaining ranks keep their order; gaps are harmless
+            del self._ranks[deal_id]
+
+    def _insert(self, entry: Tuple[Tuple, str]):
+        self._offsets = None
+        if not self._chunks:
+            self._chunks.append([entry])
+            self._maxes.append(entry)
+            if self._ranks is not None:
+                self._ranks[entry[1]] = 0
+            return
+        c = bisect_left(self._maxes, entry)
+        if c == len(self._chunks):
+            c -= 1
+            self._chunks[c].append(entry)
+            self._maxes[c] = entry
+        else:
+            insort(self._chunks[c], entry)
+        chunk = self._chunks[c]
+        if self._ranks is not None:
+            self._rank_entry(c, bisect_left(chunk, entry))
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            self._chunks[c : c + 1] = [
+                chunk[: self.CHUNK_SIZE],
+                chunk[self.CHUNK_SIZE :],
+            ]
+            self._maxes[c : c + 1] = [chunk[self.CHUNK_SIZE - 1], chunk[-1]]
+
+    def _position(self, entry: Tuple, right: bool = False) -> int:
+        """Global rank of `entry` (bisect_left, or bisect_right if `right`)."""
+        bisect = bisect_right if right else bisect_left
+        c = bisect(self._maxes, entry)
+        if c == len(self._chunks):
+            return len(self._keys)
+        return self._chunk_offsets()[c] + bisect(self._chunks[c], entry)
+
+    def _chunk_offsets(self) -> List[int]:
+        if self._offsets is None:
+            offsets, total = [], 0
+            for chunk in self._chunks:
+                offsets.append(total)
+                total += len(chunk)
+            self._offsets = offsets
+        return self._offsets
+
+    def _bounds(
+        self,
+        low: Any = None,
+        high: Any = None,
+        low_inclusive: bool = True,
+        high_inclusive: bool = True,
+    ) -> Tuple[int, int]:
+        # A bare (sort_key,) sorts before every (sort_key, id) and
+        # (sort_key, _MAX_ID) after them, so bisecting on one or the other
+        # includes or excludes the entries equal to a bound.
+        # Missing keys never fall inside a range.
+        if low is None:
+            start = self._position(((1,),))
+        elif low_inclusive:
+            start = self._position((sort_key(low),))
+        else:
+            start = self._position((sort_key(low), _MAX_ID), right=True)
+        if high is None:
+            end = len(self._keys)
+        elif high_inclusive:
+            end = self._position((sort_key(high), _MAX_ID), right=True)
+        else:
+            end = self._position((sort_key(high),))
+        return start, max(start, end)
+
+    def _rank_entry(self, c: int, pos: int):
+        """Rank the entry just inserted at `pos` of chunk `c` from its
+        neighbours: an existing key shares their rank, a new one takes the
+        midpoint of the gap between them (or drops the ranks if none is
+        left)."""
+        chunk = self._chunks[c]
+        key, deal_id = chunk[pos]
+        before = after = None
+        if pos:
+            before = chunk[pos - 1]
+        elif c:
+            before = self._chunks[c - 1][-1]
+        if pos + 1 < len(chunk):
+            after = chunk[pos + 1]
+        elif c + 1 < len(self._chunks):
+            after = self._chunks[c + 1][0]
+        for neighbour in (before, after):
+            if neighbour is not None and neighbour[0] == key:
+                self._ranks[deal_id] = self._ranks[neighbour[1]]
+                return
+        low = self._ranks[before[1]] if before else None
+        high = self._ranks[after[1]] if after else None
+        if low is None:
+            low = high - 2 * _RANK_STEP
+        if high is None:
+            high = low + 2 * _RANK_STEP
+        if high - low < 2:
+            self._ranks = None
+        else:
+            self._ranks[deal_id] = (low + high) // 2
+
+    def ranks(self) -> Dict[str, int]:
+        """id -> int rank of its key in (key, id) order: equal keys share a
+        rank, a greater key has a greater rank and missing keys rank lowest.
+        Lets callers build composite sort keys out of plain ints.
+
+        Ranks are spaced rather than dense, so a write can rank its entry
+        between its neighbours instead of renumbering the whole index.
+        """
+        if self._ranks is None:
+            ranks: Dict[str, int] = {}
+            rank, previous = -_RANK_STEP, _MISSING
+            for chunk in self._chunks:
+                for key, deal_id in chunk:
+                    if key != previous:
+                        rank, previous = rank + _RANK_STEP, key
+                    ranks[deal_id] = rank
+            self._ranks = ranks
+        return self._ranks
+
+    def key_of(self, deal_id: str) -> Any:
+        return self._keys.get(deal_id)
+
+    def range(
+        self,
+        low: Any = None,
+        high: Any = None,
+        low_inclusive: bool = True,
+        high_inclusive: bool = True,
+    ) -> Iterator[str]:
+        """Yield ids with low <= key <= high in key order (None = unbounded;
+        either comparison is strict when that bound is not inclusive)."""
+        start, end = self._bounds(low, high, low_inclusive, high_inclusive)
+        return self._slice(start, end)
+
+    def count_range(
+        self,
+        low: Any = None,
+        high: Any = None,
+        low_inclusive: bool = True,
+        high_inclusive: bool = True,
+    ) -> int:
+        start, end = self._bounds(low, high, low_inclusive, high_inclusive)
+        return end - start
+
+    def prefix(self, prefix: str) -> Iterator[str]:
+        """Yield ids whose (string) key starts with `prefix`, in key order."""
+        if not prefix:
+            return self.range()
+        # Every key extending `prefix` sorts below prefix + _MAX_ID
+        return self.range(prefix, prefix + _MAX_ID)
+
+    def ordered(self, reverse: bool = False) -> Iterator[str]:
+        """Yield every indexed id in (key, id) order."""
+        if reverse:
+            return self._slice_reversed(len(self._keys))
+        return self._slice(0, len(self._keys))
+
+    def slice(
+        self, start: int, stop: Optional[int] = None, reverse: bool = False
+    ) -> Iterator[str]:
+        """Yield positions [start, stop) of `ordered(reverse)`, locating
+        `start` through the chunk offsets instead of walking up to it."""
+        size = len(self._keys)
+        stop = size if stop is None else min(stop, size)
+        if reverse:
+            return islice(self._slice_reversed(size - start), max(stop - start, 0))
+        return self._slice(start, stop)
+
+    def seek(self, key: Any, deal_id: str, reverse: bool = False) -> Iterator[str]:
+        """Yield ids strictly after (key, deal_id), or strictly before it
+        walking backwards when `reverse`; the cursor need not be indexed."""
+        entry = (sort_key(key), deal_id)
+        if reverse:
+            return self._slice_reversed(self._position(entry))
+        return self._slice(self._position(entry, right=True), len(self._keys))
+
+    def _slice(self, start: int, end: int) -> Iterator[str]:
+        """Yield the ids at ranks [start, end)."""
+        if start >= end:
+            return
+        offsets = self._chunk_offsets()
+        c = bisect_right(offsets, start) - 1
+        start -= offsets[c]
+        remaining = end - offsets[c] - start
+        for chunk in self._chunks[c:]:
+            part = chunk[start : start + remaining]
+            remaining -= len(part)
+            for _, deal_id in part:
+                yield deal_id
+            if remaining <= 0:
+                return
+            start = 0
+
+    def _slice_reversed(self, end: int) -> Iterator[str]:
+        """Yield the ids at ranks [0, end) from the highest rank down."""
+        if end <= 0:
+            return
+        offsets = self._chunk_offsets()
+        c = bisect_right(offsets, end - 1) - 1
+        for i in range(end - 1 - offsets[c], -1, -1):
+            yield self._chunks[c][i][1]
+        for chunk in reversed(self._chunks[:c]):
+            for _, deal_id in reversed(chunk):
+                yield deal_id
+
+
+def sort_key(value: Any) -> Tuple:
+    """Total-order wrapper placing missing values ("" or None) first."""
+    if value is None or value == "":
+        return (0,)
+    return (1, value)
+
+
+class TrigramIndex:
+    """Inverted index from lowercase character trigrams to deal ids.
+
+    Deals are indexed by their search text: the lowercased field values
+    joined by NUL, with trigrams spanning a NUL skipped so a match never
+    spans two fields. A substring query of three or more characters can
+    only match deals holding every one of its trigrams, so intersecting
+    their posting lists (smallest first) yields a small candidate set;
+    callers confirm the substring on those candidates to drop false
+    positives.
+
+    Each deal gets a dense int row, and a posting list is a sorted
+    array('I') of rows: four bytes per (gram, deal) instead of a set entry
+    holding the id string. The index keeps no per-deal gram sets; callers
+    pass the previous search text on update and removal, and the old grams
+    are recomputed from it.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self._rows: Dict[str, int] = {}
+        # Row -> id; None marks a free row, reused by the next new deal
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+
+    def load(self, items: Iterable[Tuple[str, str]]):
+        """Bulk-build an empty index from (id, search text) pairs.
+
+        Rows are handed out in order, so each posting list is built by
+        appending and is sorted without any inserts.
+        """
+        if self._rows:
+            raise ValueError("load() requires an empty index")
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for row, (deal_id, text) in enumerate(items):
+            self._rows[deal_id] = row
+            self._ids.append(deal_id)
+            for posting in map(postings.__getitem__, trigrams(text)):
+                posting.append(row)
+        self._postings = {
+            gram: array("I", posting) for gram, posting in postings.items()
+        }
+
+    def add(self, deal_id: str, text: str, old_text: Optional[str] = None):
+        """Index `deal_id` under `text`, replacing `old_text` if indexed."""
+        row = self._rows.get(deal_id)
+        if row is None:
+            row = self._free.pop() if self._free else len(self._ids)
+            if row == len(self._ids):
+                self._ids.append(deal_id)
+            else:
+                self._ids[row] = deal_id
+            self._rows[deal_id] = row
+            old_text = None
+        if text == old_text:
+            return
+        grams = trigrams(text)
+        old = trigrams(old_text) if old_text else set()
+        for gram in old - grams:
+            self._discard(gram, row)
+        for gram in grams - old:
+            posting = self._postings.get(gram)
+            if posting is None:
+                self._postings[gram] = array("I", (row,))
+            elif posting[-1] < row:
+                posting.append(row)
+            else:
+                posting.insert(bisect_left(posting, row), row)
+
+    def remove(self, deal_id: str, text: str):
+        """Drop `deal_id`, last indexed under `text`."""
+        row = self._rows.pop(deal_id, None)
+        if row is None:
+            return
+        for gram in trigrams(text):
+            self._discard(gram, row)
+        self._ids[row] = None
+        self._free.append(row)
+
+    def _discard(self, gram: str, row: int):
+        posting = self._postings.get(gram)
+        if posting is None:
+            return
+        pos = bisect_left(posting, row)
+        if pos < len(posting) and posting[pos] == row:
+            del posting[pos]
+            if not posting:
+                del self._postings[gram]
+
+    def candidates(self, query: str) -> Optional[Set[str]]:
+        """Ids that may contain `query`, or None if it is under 3 chars.
+
+        Intersecting a posting list costs a pass over it, so once the next
+        list is many times larger than the candidates left, the remaining
+        grams are left to the caller's substring check.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return None
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        rows = set(postings[0])
+        for posting in postings[1:]:
+            if len(posting) > 8 * len(rows):
+                break
+            rows.intersection_update(posting)
+        ids = self._ids
+        return {ids[row] for row in rows}
+
+
+def trigrams(text: str) -> Set[str]:
+    """Lowercase trigrams of each NUL-separated field of `text`."""
+    return {
+        field[i : i + 3]
+        for field in text.lower().split("\0")
+        for i in range(len(field) - 2)
+    }
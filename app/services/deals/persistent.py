@@ -0,0 +1,232 @@
+"""Immutable hash map with structural sharing, for the deal store snapshots.
+
+`PersistentMap` is a hash array mapped trie (HAMT): a 32-way trie over the
+key's hash where each node stores only its occupied slots. `set` and
+`delete` return a new map that copies just the O(log32 n) nodes on the path
+to the key and shares every other node with the original, so publishing a
+new version of a 100k-entry map allocates a handful of small tuples, and
+old versions stay valid (and unchanged) for as long as someone holds them.
+Nothing is ever mutated after construction, so a map can be read from any
+thread without locking.
+"""
+
+from typing import Any, Hashable, Iterable, Iterator, Optional, Tuple
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+# Hashes are folded to 64 bits; past that, equal hashes share a collision node
+_HASH_MASK = (1 << 64) - 1
+_MISSING = object()
+
+
+class _Leaf:
+    __slots__ = ("hash", "key", "value")
+
+    def __init__(self, key_hash: int, key: Hashable, value: Any):
+        self.hash = key_hash
+        self.key = key
+        self.value = value
+
+
+class _Collision:
+    """Entries whose full hashes are equal, as (key, value) pairs."""
+
+    __slots__ = ("hash", "pairs")
+
+    def __init__(self, key_hash: int, pairs: Tuple[Tuple[Hashable, Any], ...]):
+        self.hash = key_hash
+        self.pairs = pairs
+
+
+class _Node:
+    """Trie node: bit i of `bitmap` is set when slot i is occupied, and
+    `children` holds the occupied slots (leaves, collisions or nodes) in
+    slot order."""
+
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap: int, children: tuple):
+        self.bitmap = bitmap
+        self.children = children
+
+
+_EMPTY_NODE = _Node(0, ())
+
+
+class PersistentMap:
+    """Immutable mapping; `set` and `delete` return updated copies."""
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, items: Iterable[Tuple[Hashable, Any]] = ()):
+        entries = {}
+        for key, value in items:
+            entries[key] = _Leaf(_hash(key), key, value)
+        root = _build(list(entries.values()), 0) if entries else _EMPTY_NODE
+        if not isinstance(root, _Node):
+            root = _Node(1 << _slot(root.hash, 0), (root,))
+        self._root = root
+        self._size = len(entries)
+
+    @classmethod
+    def _make(cls, root: _Node, size: int) -> "PersistentMap":
+        new = cls.__new__(cls)
+        new._root = root
+        new._size = size
+        return new
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        key_hash = _hash(key)
+        node, shift = self._root, 0
+        while True:
+            bit = 1 << ((key_hash >> shift) & _MASK)
+            if not node.bitmap & bit:
+                return default
+            child = node.children[(node.bitmap & (bit - 1)).bit_count()]
+            if isinstance(child, _Node):
+                node, shift = child, shift + _BITS
+            elif isinstance(child, _Leaf):
+                return child.value if child.key == key else default
+            else:
+                if child.hash == key_hash:
+                    for pair_key, value in child.pairs:
+                        if pair_key == key:
+                            return value
+                return default
+
+    def set(self, key: Hashable, value: Any) -> "PersistentMap":
+        added = self.get(key, _MISSING) is _MISSING
+        root = _set(self._root, _Leaf(_hash(key), key, value), 0)
+        return PersistentMap._make(root, self._size + added)
+
+    def delete(self, key: Hashable) -> "PersistentMap":
+        """A copy without `key` (the map itself if `key` is absent)."""
+        if self.get(key, _MISSING) is _MISSING:
+            return self
+        root = _delete(self._root, _hash(key), key, 0)
+        return PersistentMap._make(root, self._size - 1)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (key for key, _ in self.items())
+
+    def values(self) -> Iterator[Any]:
+        return (value for _, value in self.items())
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Entries in trie order (by hash, not insertion)."""
+        stack = [self._root]
+        while stack:
+            for child in reversed(stack.pop().children):
+                if isinstance(child, _Node):
+                    stack.append(child)
+                elif isinstance(child, _Leaf):
+                    yield child.key, child.value
+                else:
+                    yield from child.pairs
+
+
+def _hash(key: Hashable) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _slot(key_hash: int, shift: int) -> int:
+    return (key_hash >> shift) & _MASK
+
+
+def _build(leaves: list, shift: int):
+    """Trie over `leaves` (distinct keys) from depth `shift` down, in one pass
+    per level rather than one path copy per entry."""
+    if len(leaves) == 1:
+        return leaves[0]
+    if shift >= 64:
+        return _Collision(
+            leaves[0].hash, tuple((leaf.key, leaf.value) for leaf in leaves)
+        )
+    slots: dict = {}
+    for leaf in leaves:
+        slots.setdefault(_slot(leaf.hash, shift), []).append(leaf)
+    bitmap = 0
+    for slot in slots:
+        bitmap |= 1 << slot
+    return _Node(
+        bitmap,
+        tuple(_build(slots[slot], shift + _BITS) for slot in sorted(slots)),
+    )
+
+
+def _set(node: _Node, leaf: _Leaf, shift: int) -> _Node:
+    bit = 1 << _slot(leaf.hash, shift)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, children[:index] + (leaf,) + children[index:])
+    child = children[index]
+    if isinstance(child, _Node):
+        new_child = _set(child, leaf, shift + _BITS)
+    elif isinstance(child, _Leaf) and child.key == leaf.key:
+        new_child = leaf
+    elif isinstance(child, _Collision) and child.hash == leaf.hash:
+        pairs = tuple(p for p in child.pairs if p[0] != leaf.key)
+        new_child = _Collision(leaf.hash, pairs + ((leaf.key, leaf.value),))
+    else:
+        new_child = _merge(child, leaf, shift + _BITS)
+    return _Node(node.bitmap, children[:index] + (new_child,) + children[index + 1 :])
+
+
+def _merge(existing, leaf: _Leaf, shift: int):
+    """Subtree holding `existing` (a leaf or collision) and `leaf`."""
+    if existing.hash == leaf.hash:
+        pairs = (
+            ((existing.key, existing.value),)
+            if isinstance(existing, _Leaf)
+            else existing.pairs
+        )
+        return _Collision(leaf.hash, pairs + ((leaf.key, leaf.value),))
+    slot_a, slot_b = _slot(existing.hash, shift), _slot(leaf.hash, shift)
+    if slot_a == slot_b:
+        return _Node(1 << slot_a, (_merge(existing, leaf, shift + _BITS),))
+    children = (existing, leaf) if slot_a < slot_b else (leaf, existing)
+    return _Node((1 << slot_a) | (1 << slot_b), children)
+
+
+def _delete(node: _Node, key_hash: int, key: Hashable, shift: int):
+    """`node` without `key` (known to be present). A node left holding a
+    single leaf or collision is replaced by it, keeping paths short."""
+    bit = 1 << _slot(key_hash, shift)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children
+    child = children[index]
+    if isinstance(child, _Node):
+        new_child = _delete(child, key_hash, key, shift + _BITS)
+    elif isinstance(child, _Collision):
+        pairs = tuple(p for p in child.pairs if p[0] != key)
+        new_child = (
+            _Leaf(key_hash, *pairs[0])
+            if len(pairs) == 1
+            else _Collision(key_hash, pairs)
+        )
+    else:
+        new_child = None
+
+    if new_child is None:
+        if node.bitmap == bit:
+            return _EMPTY_NODE
+        children = children[:index] + children[index + 1 :]
+        if len(children) == 1 and not isinstance(children[0], _Node) and shift:
+            return children[0]
+        return _Node(node.bitmap ^ bit, children)
+    if not isinstance(new_child, _Node) and len(children) == 1 and shift:
+        return new_child
+    return _Node(node.bitmap, children[:index] + (new_child,) + children[index + 1 :])
@@ -0,0 +1,157 @@
+"""Process-wide cache of deal query results, shared by every session.
+
+Most sessions look at the same few views (the default list, the review
+queue), and each one used to run the same query for itself. Both stores
+wrap `query` and `facet_counts` in `cached_query`, which keys each result
+on the normalized arguments plus the store `version`, so an identical view
+is computed once per data change whichever session asks first. A write
+bumps the version, which retires every entry made before it.
+
+Results are shared between callers and must be treated as read-only.
+"""
+
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple, TypedDict
+
+
+class QueryCacheStats(TypedDict):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    rows: int
+
+
+class QueryCache:
+    """LRU map of query results, bounded by the total rows it holds.
+
+    An entry weighs one plus the deals it holds, so the bound tracks memory
+    rather than entry count. Results of more than `max_entry_rows` deals
+    (exports, unpaged selections) are passed through uncached: they are
+    rarely repeated and would push out every page view.
+    """
+
+    def __init__(self, max_rows: int = 20_000, max_entry_rows: int = 500):
+        self.max_rows = max_rows
+        self.max_entry_rows = max_entry_rows
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, Tuple[Any, int]] = OrderedDict()
+        self._rows = 0
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self, key: Hashable, version: int, compute: Callable[[], Any]
+    ) -> Any:
+        """The cached result for `key` at `version`, computing it on a miss."""
+        with self._lock:
+            if version != self._version:
+                self._clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        # Computed outside the lock so a slow query does not hold up hits
+        result = compute()
+        weight = 1 + _rows(result)
+        if weight - 1 > self.max_entry_rows:
+            return result
+        with self._lock:
+            if version == self._version and key not in self._entries:
+                self._entries[key] = (result, weight)
+                self._rows += weight
+                while self._rows > self.max_rows:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._rows -= evicted
+                    self.evictions += 1
+        return result
+
+    def stats(self) -> QueryCacheStats:
+        with self._lock:
+            return QueryCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self._entries),
+                rows=self._rows,
+            )
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._entries.clear()
+        self._rows = 0
+
+
+def cached_query(method: Callable) -> Callable:
+    """Serve a store query method through the store's `query_cache`.
+
+    The store's `sync_version()` runs first, so a write the store has not
+    seen yet (made by another process) retires the cached results.
+
+    The call is keyed on its arguments after normalization, so spellings
+    of the same query share an entry: defaults are filled in, a blank
+    search is no search, the sort and direction become (column, direction)
+    pairs and range filters an ordered tuple.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        del arguments["self"]
+        key = (method.__name__, *_normalize(arguments))
+        self.sync_version()
+        return self.query_cache.get_or_compute(
+            key, self.version, lambda: method(self, *args, **kwargs)
+        )
+
+    return wrapper
+
+
+def _normalize(arguments: dict) -> tuple:
+    if not arguments.get("search"):
+        arguments["search"] = None
+    if "sort" in arguments:
+        sort, direction = arguments["sort"], arguments.pop("direction", "asc")
+        if not sort:
+            arguments["sort"] = ()
+        elif isinstance(sort, str):
+            arguments["sort"] = ((sort, direction),)
+        else:
+            arguments["sort"] = tuple(tuple(key) for key in sort)
+    if arguments.get("ranges"):
+        arguments["ranges"] = tuple(
+            sorted(
+                (field, _range_key(bounds))
+                for field, bounds in arguments["ranges"].items()
+            )
+        )
+    else:
+        arguments["ranges"] = None
+    if arguments.get("after") is not None:
+        arguments["after"] = tuple(arguments["after"])
+    return tuple(sorted(arguments.items()))
+
+
+def _range_key(bounds) -> tuple:
+    """(low, high) and (low, high, "both") are the same filter."""
+    bounds = tuple(bounds)
+    return bounds[:2] if bounds[2:] == ("both",) else bounds
+
+
+def _rows(result: Any) -> int:
+    deals = result.get("deals") if isinstance(result, dict) else None
+    return len(deals) if deals is not None else 0
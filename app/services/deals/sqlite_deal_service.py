@@ -0,0 +1,711 @@
+"""SQLite-backed deal store built on SQLModel."""
+
+import sqlite3
+import threading
+from enum import Enum
+from pathlib import Path
+from itertools import batched
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Index, and_, event, func, insert, literal_column, or_, text
+from sqlalchemy.schema import CreateIndex
+from sqlmodel import (
+    Field,
+    Session,
+    SQLModel,
+    col,
+    create_engine,
+    delete,
+    select,
+)
+
+from app.states.shared.schema import Deal
+from app.services.deals.deal_service import (
+    DealPage,
+    DealService,
+    DealSuggestion,
+    FacetCounts,
+    PageCursor,
+    RangeFilter,
+    SortSpec,
+    generate_fake_deals,
+    sort_keys,
+    validate_ranges,
+)
+from app.services.deals.change_feed import ChangeLog, DealChange, changed_fields
+from app.services.deals.query_cache import QueryCache, cached_query
+
+# Keeps IN (...) lists well under SQLite's bound-parameter limit
+_SQL_BATCH_SIZE = 500
+_SEARCH_FIELDS = DealService.SEARCH_FIELDS
+
+
+class DealRecord(SQLModel, table=True):
+    """Table row mirroring the `Deal` schema field for field."""
+
+    __tablename__ = "deals"
+
+    id: str = Field(primary_key=True)
+    ticker: str = Field(index=True)
+    structure: str = Field(index=True)
+    concurrent: Optional[str] = None
+    id_bb_global: Optional[str] = None
+    id_sedol1: Optional[str] = None
+    action_id: Optional[int] = None
+    flag_bought: bool = False
+    flag_clean_up: bool = False
+    flag_top_up: bool = False
+    pricing_date: Optional[str] = Field(default=None, index=True)
+    announce_date: Optional[str] = Field(default=None, index=True)
+    pmi_date: Optional[str] = None
+    first_trade_date: Optional[str] = None
+    inst_own_date: Optional[str] = None
+    shares_amount: Optional[float] = Field(default=None, index=True)
+    offering_price: Optional[float] = Field(default=None, index=True)
+    price_on_pricing_date: Optional[float] = None
+    vol_on_pricing_date: Optional[int] = None
+    offer_price_usd: Optional[float] = None
+    market_cap: Optional[float] = Field(default=None, index=True)
+    fx_rate: Optional[float] = None
+    gross_spread: Optional[float] = Field(default=None, index=True)
+    net_purchase_price: Optional[float] = None
+    fee_percent: Optional[float] = None
+    reported_shares: Optional[float] = None
+    bbg_shares: Optional[float] = None
+    primary_shares: Optional[float] = None
+    secondary_shares: Optional[float] = None
+    eqy_sh_out: Optional[float] = None
+    eqy_float: Optional[float] = None
+    inst_own_pct: Optional[float] = None
+    country: Optional[str] = Field(default=None, index=True)
+    sector: Optional[str] = Field(default=None, index=True)
+    bics_level: Optional[str] = None
+    company_name: Optional[str] = None
+    deal_description: Optional[str] = None
+    avg_volume: Optional[float] = None
+    avg_daily_val: Optional[float] = None
+    vix: Optional[float] = None
+    vol_90_day: Optional[str] = None
+    short_int: Optional[float] = None
+    cdr_exch_code: Optional[str] = None
+    reg_id: Optional[str] = None
+    warrants_min: Optional[int] = None
+    warrants_strike: Optional[float] = None
+    warrants_exp: Optional[str] = None
+    status: str = Field(default="draft", index=True)
+    ai_confidence_score: int = Field(default=100, index=True)
+    source_file: Optional[str] = None
+    created_at: str = Field(index=True)
+    updated_at: str
+
+
+# Expression indexes serving case-insensitive prefix lookups for `suggest`
+for _field in DealService.PREFIX_FIELDS:
+    Index(f"ix_deals_{_field}_lower", func.lower(getattr(DealRecord, _field)))
+
+
+def _to_record(deal: Deal) -> DealRecord:
+    return DealRecord(**deal.model_dump(mode="json"))
+
+
+def _to_deal(record: DealRecord) -> Deal:
+    return Deal.model_validate(record.model_dump())
+
+
+def _filter_clauses(
+    status, sector, country, structure, date_field, date_from, date_to
+) -> list:
+    clauses = []
+    for column, value in (
+        (DealRecord.status, status.value if isinstance(status, Enum) else status),
+        (DealRecord.sector, sector),
+        (DealRecord.country, country),
+        (DealRecord.structure, structure),
+    ):
+        if value:
+            clauses.append(column == value)
+    date_column = getattr(DealRecord, date_field)
+    if date_from:
+        clauses.append(date_column >= date_from)
+    if date_to:
+        clauses.append(date_column <= date_to)
+    return clauses
+
+
+def _query_clauses(
+    search, status, sector, country, structure, date_from, date_to, ranges
+) -> list:
+    """WHERE clauses for the `query` / `facet_counts` criteria."""
+    clauses = _filter_clauses(
+        status, sector, country, structure, "pricing_date", date_from, date_to
+    )
+    if search:
+        clauses.append(_search_clause(search))
+    for field, bounds in validate_ranges(ranges).items():
+        low, high, low_inclusive, high_inclusive = bounds
+        column = getattr(DealRecord, field)
+        if low is not None:
+            clauses.append(column >= low if low_inclusive else column > low)
+        if high is not None:
+            clauses.append(column <= high if high_inclusive else column < high)
+    return clauses
+
+
+def _search_clause(search: str):
+    """Case-insensitive substring match on the search fields.
+
+    Queries of three or more characters go through the FTS5 trigram index;
+    shorter ones cannot be expressed as trigrams and fall back to LIKE.
+    """
+    if len(search) >= 3:
+        phrase = '"' + search.replace('"', '""') + '"'
+        return text(
+            "deals.rowid IN (SELECT rowid FROM deals_fts WHERE deals_fts MATCH :q)"
+        ).bindparams(q=phrase)
+    q = search.lower()
+    return or_(
+        *(
+            func.lower(getattr(DealRecord, field)).contains(q, autoescape=True)
+            for field in _SEARCH_FIELDS
+        )
+    )
+
+
+def _sort_order(keys: List[Tuple[str, str]], direction: str) -> list:
+    """ORDER BY terms for `sort_keys` output, ties broken by id as in
+    DealService (by id in `direction` when there are no keys).
+
+    SQLite orders NULL below every value, matching the in-memory store's
+    order with missing values first ascending and last descending.
+    """
+    id_column = col(DealRecord.id)
+    if len(keys) > 1:
+        order = [
+            col(getattr(DealRecord, field)).desc()
+            if field_direction == "desc"
+            else col(getattr(DealRecord, field))
+            for field, field_direction in keys
+        ]
+        return [*order, id_column]
+    sort, direction = keys[0] if keys else (None, direction)
+    if sort in DealRecord.model_fields:
+        order = [col(getattr(DealRecord, sort)), id_column]
+    else:
+        order = [id_column]
+    return [c.desc() for c in order] if direction == "desc" else order
+
+
+def _keyset_clause(column, after: PageCursor, descending: bool):
+    """Rows strictly past `after` in (column, id) order; NULLs sort first."""
+    value, deal_id = after
+    value = None if value == "" else value
+    id_column = col(DealRecord.id)
+    if column is None:
+        return id_column < deal_id if descending else id_column > deal_id
+    if descending:
+        if value is None:
+            return and_(column.is_(None), id_column < deal_id)
+        return or_(
+            column < value,
+            and_(column == value, id_column < deal_id),
+            column.is_(None),
+        )
+    if value is None:
+        return or_(and_(column.is_(None), id_column > deal_id), column.is_not(None))
+    return or_(column > value, and_(column == value, id_column > deal_id))
+
+
+class SqliteDealSnapshot:
+    """The database as of one store version: a read transaction held open.
+
+    WAL mode keeps serving a reader the pages as of its transaction's first
+    read, so the snapshot costs no copy and writers are never blocked; the
+    WAL cannot be checkpointed past it, though, so close it promptly (it is
+    a context manager).
+    """
+
+    def __init__(self, engine, version: int):
+        self.version = version
+        self._connection = engine.connect()
+        # pysqlite defers BEGIN until the first write; begin explicitly so
+        # the reads below share one transaction, pinned by the first of them
+        self._connection.exec_driver_sql("BEGIN")
+        self._session = Session(bind=self._connection)
+        self._size = self._session.exec(
+            select(func.count()).select_from(DealRecord)
+        ).one()
+
+    def get_deal_by_id(self, deal_id: str) -> Optional[Deal]:
+        record = self._session.get(DealRecord, deal_id)
+        return _to_deal(record) if record else None
+
+    def get_deals_by_ids(self, deal_ids: Iterable[str]) -> List[Deal]:
+        """The deals for `deal_ids` that exist, in the given order."""
+        deal_ids = list(deal_ids)
+        found: Dict[str, Deal] = {}
+        for batch in batched(deal_ids, _SQL_BATCH_SIZE):
+            records = self._session.exec(
+                select(DealRecord).where(col(DealRecord.id).in_(batch))
+            )
+            found.update((r.id, _to_deal(r)) for r in records)
+        return [found[i] for i in deal_ids if i in found]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Deal]:
+        records = self._session.exec(
+            select(DealRecord).order_by(literal_column("rowid"))
+        )
+        return (_to_deal(r) for r in records)
+
+    def close(self):
+        """End the read transaction and return the connection to the pool."""
+        self._session.close()
+        self._connection.close()
+
+    def __enter__(self) -> "SqliteDealSnapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SqliteDealService:
+    """Persistent deal store backed by a local SQLite file.
+
+    Exposes the same interface as `DealService`. The database runs in WAL
+    mode so readers never block the writer, and the `deals` table is indexed
+    on id, status, pricing_date, announce_date and every sortable column of
+    the deals table, plus lower(ticker) and lower(company_name). An empty
+    database is seeded once; after that the data survives restarts.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        seed_deals: Optional[Callable[[], Iterable[Deal]]] = None,
+    ):
+        """`seed_deals` supplies the book for an empty database (Faker demo
+        deals by default)."""
+        self._seed_deals = seed_deals or generate_fake_deals
+        # Bumped by every write through this instance, and by `sync_version`
+        # once another process has committed; callers key cached query
+        # results on it
+        self.version = 0
+        # query / facet_counts results shared across sessions, per version
+        self.query_cache = QueryCache(DealService.QUERY_CACHE_ROWS)
+        self.change_log = ChangeLog(self.version)
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        event.listen(self._engine, "connect", self._configure_connection)
+        SQLModel.metadata.create_all(self._engine, tables=[DealRecord.__table__])
+        # create_all only builds indexes with a new table; add any introduced
+        # since an existing database file was created (IF NOT EXISTS, because
+        # reflection cannot see the expression indexes)
+        with self._engine.begin() as conn:
+            for index in DealRecord.__table__.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+        # Seed before creating the search index: on a new database one bulk
+        # FTS rebuild is far cheaper than firing its triggers row by row
+        self._seed_if_empty()
+        self._create_search_index()
+        # PRAGMA data_version on a connection of our own changes whenever
+        # any other connection commits, which is how writes by other
+        # processes (other workers, the generator tool) are noticed
+        self._watch_connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._version_lock = threading.Lock()
+        self._data_version = self._read_data_version()
+
+    @staticmethod
+    def _configure_connection(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    def save_deals(self, deals: Iterable[Deal]) -> List[Deal]:
+        """Upsert a batch of deals in a single transaction."""
+        deals = list(deals)
+        self.sync_version()
+        with self._session() as session:
+            changes = [self._merge(session, deal) for deal in deals]
+            session.commit()
+        if deals:
+            self._bump_version()
+            self._record_saves(changes)
+        return deals
+
+    def delete_deals(self, deal_ids: Iterable[str]) -> int:
+        """Delete a batch of deals in a single transaction."""
+        deal_ids = list(deal_ids)
+        deleted = []
+        self.sync_version()
+        with self._session() as session:
+            for start in range(0, len(deal_ids), _SQL_BATCH_SIZE):
+                chunk = deal_ids[start : start + _SQL_BATCH_SIZE]
+                result = session.exec(
+                    delete(DealRecord)
+                    .where(col(DealRecord.id).in_(chunk))
+                    .returning(col(DealRecord.id))
+                )
+                deleted.extend(result.scalars())
+            session.commit()
+        if deleted:
+            self._bump_version()
+            self.change_log.record(self.version, deleted=deleted)
+        return len(deleted)
+
+    def filter_deals(
+        self,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_field: str = "pricing_date",
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Deal]:
+        """Return deals matching every given criterion (None = any)."""
+        clauses = _filter_clauses(
+            status, sector, country, structure, date_field, date_from, date_to
+        )
+        with self._session() as session:
+            records = session.exec(
+                select(DealRecord).where(*clauses).order_by(literal_column("rowid"))
+            )
+            return [_to_deal(r) for r in records]
+
+    def count_deals(
+        self,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_field: str = "pricing_date",
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> int:
+        """Count deals matching the `filter_deals` criteria."""
+        clauses = _filter_clauses(
+            status, sector, country, structure, date_field, date_from, date_to
+        )
+        with self._session() as session:
+            return session.exec(
+                select(func.count()).select_from(DealRecord).where(*clauses)
+            ).one()
+
+    @cached_query
+    def query(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        sort: Optional[SortSpec] = "pricing_date",
+        direction: str = "desc",
+        offset: int = 0,
+        limit: Optional[int] = None,
+        after: Optional[PageCursor] = None,
+        ranges: Optional[Dict[str, RangeFilter]] = None,
+    ) -> DealPage:
+        """Filter, sort and page the book in SQL; see `DealService.query`."""
+        clauses = _query_clauses(
+            search, status, sector, country, structure, date_from, date_to, ranges
+        )
+        with self._session() as session:
+            total = session.exec(
+                select(func.count()).select_from(DealRecord).where(*clauses)
+            ).one()
+            if limit == 0:
+                return DealPage(deals=[], total=total)
+            statement = select(DealRecord).where(*clauses)
+            keys = sort_keys(sort, direction)
+            if len(keys) > 1:
+                if after is not None:
+                    raise ValueError("Cursor paging needs a single sort column")
+            elif after is not None:
+                sort, direction = keys[0] if keys else (None, direction)
+                if sort not in DealRecord.model_fields:
+                    sort = None
+                column = col(getattr(DealRecord, sort)) if sort else None
+                statement = statement.where(
+                    _keyset_clause(column, after, direction == "desc")
+                )
+            statement = statement.order_by(*_sort_order(keys, direction))
+            statement = statement.offset(offset)
+            if limit is not None:
+                statement = statement.limit(limit)
+            deals = [_to_deal(r) for r in session.exec(statement)]
+        return DealPage(deals=deals, total=total)
+
+    def sorted_ids(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        sort: Optional[SortSpec] = "pricing_date",
+        direction: str = "desc",
+        ranges: Optional[Dict[str, RangeFilter]] = None,
+    ) -> List[str]:
+        """Ids of every `query` match, in query order; see
+        `DealService.sorted_ids`. Reads only the id column."""
+        clauses = _query_clauses(
+            search, status, sector, country, structure, date_from, date_to, ranges
+        )
+        statement = (
+            select(DealRecord.id)
+            .where(*clauses)
+            .order_by(*_sort_order(sort_keys(sort, direction), direction))
+        )
+        with self._session() as session:
+            return list(session.exec(statement))
+
+    @cached_query
+    def facet_counts(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        sector: Optional[str] = None,
+        country: Optional[str] = None,
+        structure: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        ranges: Optional[Dict[str, RangeFilter]] = None,
+    ) -> FacetCounts:
+        """Per-value counts for each facet; see `DealService.facet_counts`.
+
+        One GROUP BY per facet, each read off the facet column's index.
+        """
+        criteria = {
+            "status": status,
+            "sector": sector,
+            "country": country,
+            "structure": structure,
+        }
+        counts: FacetCounts = {}
+        with self._session() as session:
+            for field in DealService.FACET_FIELDS:
+                others = {**criteria, field: None}
+                clauses = _query_clauses(
+                    search, *others.values(), date_from, date_to, ranges
+                )
+                column = getattr(DealRecord, field)
+                rows = session.exec(
+                    select(column, func.count())
+                    .where(*clauses, column.is_not(None))
+                    .group_by(column)
+                )
+                counts[field] = dict(rows.all())
+        return counts
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[DealSuggestion]:
+        """Autocomplete on ticker or company-name prefix; see
+        `DealService.suggest`.
+
+        Each field is a range scan over its lower() expression index.
+        """
+        prefix = prefix.strip().lower()
+        if not prefix or limit <= 0:
+            return []
+        seen = {}
+        with self._session() as session:
+            for field in DealService.PREFIX_FIELDS:
+                key = func.lower(getattr(DealRecord, field))
+                rows = session.exec(
+                    select(DealRecord.id, DealRecord.ticker, DealRecord.company_name)
+                    .where(key >= prefix, key < prefix + "\uffff")
+                    .order_by(key, col(DealRecord.id))
+                    .limit(limit)
+                )
+                for deal_id, ticker, company_name in rows:
+                    seen.setdefault(
+                        deal_id,
+                        DealSuggestion(
+                            id=deal_id, ticker=ticker, company_name=company_name or ""
+                        ),
+                    )
+                if len(seen) >= limit:
+                    break
+        return list(seen.values())[:limit]
+
+    def close(self):
+        """Dispose of the engine's pooled connections."""
+        self._engine.dispose()
+        self._watch_connection.close()
+
+    def _create_search_index(self):
+        """Create the FTS5 trigram index over SEARCH_FIELDS if missing.
+
+        It is an external-content table over `deals`, kept in sync by
+        triggers, so it stores only the trigram postings.
+        """
+        columns = ", ".join(_SEARCH_FIELDS)
+        new_values = ", ".join(f"new.{c}" for c in _SEARCH_FIELDS)
+        old_values = ", ".join(f"old.{c}" for c in _SEARCH_FIELDS)
+        delete_old = (
+            f"INSERT INTO deals_fts(deals_fts, rowid, {columns}) "
+            f"VALUES ('delete', old.rowid, {old_values});"
+        )
+        insert_new = (
+            f"INSERT INTO deals_fts(rowid, {columns}) VALUES (new.rowid, {new_values});"
+        )
+        with self._engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'deals_fts'")
+            ).first()
+            if exists:
+                return
+            conn.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE deals_fts USING fts5({columns}, "
+                    "content='deals', content_rowid='rowid', tokenize='trigram')"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE TRIGGER deals_fts_ai AFTER INSERT ON deals "
+                    f"BEGIN {insert_new} END"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE TRIGGER deals_fts_ad AFTER DELETE ON deals "
+                    f"BEGIN {delete_old} END"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE TRIGGER deals_fts_au AFTER UPDATE ON deals "
+                    f"BEGIN {delete_old} {insert_new} END"
+                )
+            )
+            # Index rows written before the search index existed
+            conn.execute(text("INSERT INTO deals_fts(deals_fts) VALUES ('rebuild')"))
+
+    def _session(self) -> Session:
+        return Session(self._engine, expire_on_commit=False)
+
+    def _seed_if_empty(self):
+        with self._session() as session:
+            if session.exec(select(DealRecord.id).limit(1)).first() is not None:
+                return
+            # Core executemany in batches: the seed may be millions of rows
+            for batch in batched(self._seed_deals(), _SQL_BATCH_SIZE):
+                session.exec(
+                    insert(DealRecord),
+                    params=[d.model_dump(mode="json") for d in batch],
+                )
+            session.commit()
+
+    def get_deals(self) -> List[Deal]:
+        with self._session() as session:
+            # rowid preserves insertion order, matching the in-memory store
+            records = session.exec(select(DealRecord).order_by(literal_column("rowid")))
+            return [_to_deal(r) for r in records]
+
+    def get_deal_by_id(self, deal_id: str) -> Optional[Deal]:
+        with self._session() as session:
+            record = session.get(DealRecord, deal_id)
+            return _to_deal(record) if record else None
+
+    def snapshot(self) -> SqliteDealSnapshot:
+        """A consistent read-only view of the book as of now; close it when
+        done."""
+        return SqliteDealSnapshot(self._engine, self.version)
+
+    def get_deal_by_ticker(self, ticker: str) -> Optional[Deal]:
+        with self._session() as session:
+            record = session.exec(
+                select(DealRecord)
+                .where(DealRecord.ticker == ticker)
+                .order_by(literal_column("rowid"))
+                .limit(1)
+            ).first()
+            return _to_deal(record) if record else None
+
+    def save_deal(self, deal: Deal) -> Deal:
+        self.sync_version()
+        with self._session() as session:
+            change = self._merge(session, deal)
+            session.commit()
+        self._bump_version()
+        self._record_saves([change])
+        return deal
+
+    def delete_deal(self, deal_id: str) -> bool:
+        self.sync_version()
+        with self._session() as session:
+            result = session.exec(delete(DealRecord).where(DealRecord.id == deal_id))
+            session.commit()
+        if result.rowcount > 0:
+            self._bump_version()
+            self.change_log.record(self.version, deleted=[deal_id])
+            return True
+        return False
+
+    def changes_since(self, version: int) -> Optional[List[DealChange]]:
+        """See `DealService.changes_since`. Writes by other processes are
+        not in the log, so once one is seen this returns None (reload)."""
+        self.sync_version()
+        return self.change_log.since(version)
+
+    def sync_version(self):
+        """Bump `version` if another connection has committed since the
+        last check or write through this instance.
+
+        Only the fact of the write is known, not what it changed, so the
+        change log is reset and sessions reload.
+        """
+        with self._version_lock:
+            data_version = self._read_data_version()
+            if data_version != self._data_version:
+                self._data_version = data_version
+                self.version += 1
+                self.change_log.reset(self.version)
+
+    def _bump_version(self):
+        """Count a write just committed through this instance.
+
+        Writes call `sync_version` before they start, so only a commit by
+        another process in the moment between this write's commit and here
+        is taken for this write's own.
+        """
+        with self._version_lock:
+            self.version += 1
+            self._data_version = self._read_data_version()
+
+    def _read_data_version(self) -> int:
+        return self._watch_connection.execute("PRAGMA data_version").fetchone()[0]
+
+    @staticmethod
+    def _merge(session: Session, deal: Deal) -> Tuple[str, Optional[List[str]]]:
+        """Upsert `deal`; returns its id and changed fields (None if new).
+
+        The existing row is loaded first (merge would load it anyway) so it
+        can be compared before merge overwrites it.
+        """
+        record = _to_record(deal)
+        existing = session.get(DealRecord, deal.id)
+        fields = changed_fields(existing, record) if existing is not None else None
+        session.merge(record)
+        return deal.id, fields
+
+    def _record_saves(self, changes: Iterable[Tuple[str, Optional[List[str]]]]):
+        inserted, updated = [], {}
+        for deal_id, fields in changes:
+            if fields is None:
+                inserted.append(deal_id)
+            else:
+                updated.setdefault(deal_id, set()).update(fields)
+        self.change_log.record(self.version, inserted=inserted, updated=updated)
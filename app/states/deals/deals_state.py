@@ -2,12 +2,14 @@ import reflex as rx
 from app.states.deals.mixins.list_mixin import DealListMixin
 from app.states.deals.mixins.add_mixin import DealAddMixin
 from app.states.deals.mixins.review_mixin import DealReviewMixin
+from app.states.deals.mixins.export_mixin import DealExportMixin
 
 
 class DealState(
     DealListMixin,
     DealAddMixin,
     DealReviewMixin,
+    DealExportMixin,
     rx.State,
 ):
     """Main state for Deals section, composing all mixins."""
@@ -2,11 +2,9 @@ import reflex as rx
 from datetime import datetime
 from app.states.shared.schema import Deal, DealStatus
 from app.states.deals.deal_form_state import DealFormState
-from app.services.deals.deal_service import DealService
+from app.services.deals.deal_store import get_deal_service
 from app.services.deals.file_upload_service import FileUploadService
 
-deal_service = DealService()
-
 
 class DealAddMixin(rx.State, mixin=True):
     """Mixin for Add Deal logic."""
@@ -110,12 +108,11 @@ class DealAddMixin(rx.State, mixin=True):
     async def edit_selected_deal(self):
         """Edit a selected deal by redirecting to the review page."""
         # Check if exactly one deal is selected
-        selected_count = len(self.selected_deal_ids)
-        if selected_count != 1:
+        if self.selected_count != 1:
             return rx.toast("Select exactly one deal to edit.", position="bottom-right")
 
-        deal_id = self.selected_deal_ids[0]
-        deal = next((d for d in self.deals if d.id == deal_id), None)
+        deal_id = self._selected_deal_ids()[0]
+        deal = get_deal_service().get_deal_by_id(deal_id)
 
         if not deal:
             return rx.toast(
@@ -155,6 +152,7 @@ class DealAddMixin(rx.State, mixin=True):
 
         now = datetime.now().isoformat()
 
+        deal_service = get_deal_service()
         deal_id = processed_data.get("id")
         current_deal = None
 
@@ -182,8 +180,8 @@ class DealAddMixin(rx.State, mixin=True):
             new_deal = Deal(**processed_data)
             deal_service.save_deal(new_deal)
 
-        # Update the deals list if we are in the main state context
-        if hasattr(self, "deals"):
-            self.deals = deal_service.get_deals()
+        # Reload the deals list if we are in the main state context
+        if hasattr(self, "load_data"):
+            self.load_data()
 
         return rx.noop()
@@ -1,128 +1,453 @@
+import math
 import reflex as rx
+from typing import ClassVar
 from app.states.shared.schema import Deal
-from app.services.deals.deal_service import DealService
-
-deal_service = DealService()
+from app.services.deals.change_feed import DealChange
+from app.services.deals.deal_service import (
+    RANGE_INCLUSIVE,
+    DealPage,
+    DealService,
+    DealSuggestion,
+    FacetCounts,
+    PageCursor,
+    SortSpec,
+    page_cursor,
+)
+from app.services.deals.deal_export import ExportRequest
+from app.services.deals.deal_store import get_deal_service
+from app.states.deals.rows import (
+    ROW_FIELDS,
+    STATUS_LABELS,
+    DealRow,
+    FacetOption,
+    deal_row,
+    facet_options,
+)
 
 
 class DealListMixin(rx.State, mixin=True):
     """Mixin for Deal List View (Filtering, Sorting, Pagination)."""
 
-    deals: list[Deal] = []
     search_query: str = ""
+    search_suggestions: list[DealSuggestion] = []
     sort_column: str = "pricing_date"
     sort_direction: str = "desc"
+    # Tie-breaking [column, direction] keys after the primary sort, added
+    # by shift-clicking a header
+    secondary_sorts: list[list[str]] = []
     filter_status: str = "all"
+    filter_sector: str = "all"
+    filter_country: str = "all"
+    filter_structure: str = "all"
     filter_start_date: str = ""
     filter_end_date: str = ""
+    # Numeric bounds keyed by DealService.RANGE_FIELDS, as typed; a bound
+    # is inclusive unless its field is flagged in the matching *_exclusive
+    filter_min: dict[str, str] = {}
+    filter_max: dict[str, str] = {}
+    filter_min_exclusive: dict[str, bool] = {}
+    filter_max_exclusive: dict[str, bool] = {}
+    show_range_filters: bool = False
     current_page: int = 1
     items_per_page: int = 10
-    selected_deal_ids: list[str] = []
+    # "pages" (prev/next) or "scroll": one virtualized scroll area in which
+    # only a window of rows around the viewport is fetched and rendered
+    view_mode: str = "pages"
+    # Offset of the first row of the scroll window within the query result
+    window_start: int = 0
+    # Selection: explicit ids, or every deal matching the current filters
+    # minus exclusions. Only the current page's share reaches the browser.
+    select_all_matching: bool = False
     show_delete_dialog: bool = False
 
+    # Keyset cursors: the last row of each page before the current one
+    _page_cursors: list[tuple] = []
+    # Keyset cursors at scroll-window boundaries: result offset -> cursor
+    # of the row just before it, so a window can resume from the nearest
+    # one instead of walking the result from the top
+    _window_anchors: dict[int, tuple] = {}
+    # The book itself stays in the process-wide deal store; a session only
+    # keeps the store version it last loaded (None = not loaded yet), which
+    # keys every query-backed var
+    _store_version: int | None = None
+    # Store version the session has caught up with through the change
+    # feed; ahead of `_store_version` when the writes since could not
+    # change anything the views show
+    _feed_version: int | None = None
+    # Dicts used as insertion-ordered sets for O(1) membership
+    _selected_ids: dict[str, None] = {}
+    _excluded_ids: dict[str, None] = {}
+
+    # Scroll-mode rows have a fixed height (px) so a scroll position maps
+    # straight to a row offset
+    ROW_HEIGHT: ClassVar[int] = 56
+    # Rows fetched per window: a few screens, bounding the rendered DOM
+    WINDOW_SIZE: ClassVar[int] = 120
+    # Fetch the next window once fewer than this many rows are left
+    # between the viewport and the edge of the current one
+    PREFETCH_ROWS: ClassVar[int] = 30
+    # Window anchors kept per query (oldest dropped first)
+    MAX_WINDOW_ANCHORS: ClassVar[int] = 256
+    # Deal fields the list and review views filter, sort, search, count or
+    # render; an update touching none of them cannot change either view
+    VIEW_FIELDS: ClassVar[frozenset[str]] = ROW_FIELDS.union(
+        DealService.HASH_INDEX_FIELDS,
+        DealService.SORTED_INDEX_FIELDS,
+        DealService.RANGE_FIELDS,
+        DealService.SEARCH_FIELDS,
+    )
+
+    def _query_deals(
+        self,
+        limit: int | None = None,
+        after: PageCursor | None = None,
+        offset: int = 0,
+    ) -> DealPage:
+        """Run the current filters, sort and paging against the deal store."""
+        if self._store_version is None:
+            return DealPage(deals=[], total=0)
+        return get_deal_service().query(
+            **self._filter_criteria(),
+            sort=self._sort_spec(),
+            direction=self.sort_direction,
+            offset=offset,
+            limit=limit,
+            after=after,
+        )
+
+    def _sort_spec(self) -> SortSpec | None:
+        """The primary sort column, or every key once secondaries are set."""
+        if not self.sort_column:
+            return None
+        if not self.secondary_sorts:
+            return self.sort_column
+        return [
+            (self.sort_column, self.sort_direction),
+            *((column, direction) for column, direction in self.secondary_sorts),
+        ]
+
+    def _filter_criteria(self) -> dict:
+        """The filter inputs as store criteria, shared by the page query and
+        the facet counts (so both vars are keyed on the same state)."""
+
+        def chosen(value: str) -> str | None:
+            return value if value != "all" else None
+
+        return dict(
+            search=self.search_query or None,
+            status=chosen(self.filter_status),
+            sector=chosen(self.filter_sector),
+            country=chosen(self.filter_country),
+            structure=chosen(self.filter_structure),
+            date_from=self.filter_start_date or None,
+            date_to=self.filter_end_date or None,
+            ranges=self._range_filters(),
+        )
+
+    def _range_filters(self) -> dict[str, tuple[float | None, float | None, str]]:
+        """The range inputs as {field: (low, high, inclusive)}; blank or
+        unparsable bounds are left open."""
+        ranges = {}
+        for field in self.filter_min.keys() | self.filter_max.keys():
+            low = _parse_bound(self.filter_min.get(field, ""))
+            high = _parse_bound(self.filter_max.get(field, ""))
+            if low is not None or high is not None:
+                bounds = (
+                    not self.filter_min_exclusive.get(field, False),
+                    not self.filter_max_exclusive.get(field, False),
+                )
+                ranges[field] = (low, high, _INCLUSIVITY[bounds])
+        return ranges
+
+    @rx.var
+    def _facet_counts(self) -> FacetCounts:
+        """Per-value counts for the facet filters under the other filters."""
+        if self._store_version is None:
+            return {}
+        return get_deal_service().facet_counts(**self._filter_criteria())
+
     @rx.var
-    def filtered_deals(self) -> list[Deal]:
-        deals = self.deals
-        if self.search_query:
-            q = self.search_query.lower()
-            deals = [
-                d
-                for d in deals
-                if d.ticker
-                and q in d.ticker.lower()
-                or (d.company_name and q in d.company_name.lower())
-                or (d.sector and q in d.sector.lower())
-                or (d.country and q in d.country.lower())
-            ]
-        if self.filter_status and self.filter_status != "all":
-            deals = [d for d in deals if d.status == self.filter_status]
-        if self.filter_start_date:
-            deals = [
-                d
-                for d in deals
-                if d.pricing_date and d.pricing_date >= self.filter_start_date
-            ]
-        if self.filter_end_date:
-            deals = [
-                d
-                for d in deals
-                if d.pricing_date and d.pricing_date <= self.filter_end_date
-            ]
-        if self.sort_column:
-
-            @rx.event
-            def sort_key(d):
-                val = getattr(d, self.sort_column, None)
-                if val is None:
-                    if self.sort_column in [
-                        "shares_amount",
-                        "offering_price",
-                        "market_cap",
-                        "ai_confidence_score",
-                    ]:
-                        return -1.0
-                    return ""
-                return val
-
-            reverse = self.sort_direction == "desc"
-            deals = sorted(deals, key=sort_key, reverse=reverse)
-        return deals
+    def facet_options(self) -> dict[str, list[FacetOption]]:
+        """Options for each facet filter, labelled with their counts."""
+        counts = self._facet_counts
+        return {
+            "status": facet_options(
+                counts.get("status", {}), self.filter_status, STATUS_LABELS
+            ),
+            "sector": facet_options(counts.get("sector", {}), self.filter_sector),
+            "country": facet_options(counts.get("country", {}), self.filter_country),
+            "structure": facet_options(
+                counts.get("structure", {}), self.filter_structure
+            ),
+        }
+
+    @rx.var
+    def secondary_sort_directions(self) -> dict[str, str]:
+        """column -> direction for the secondary sort keys (header arrows)."""
+        return {column: direction for column, direction in self.secondary_sorts}
+
+    @rx.var
+    def active_range_count(self) -> int:
+        return len(self._range_filters())
+
+    @rx.var
+    def _deal_page(self) -> DealPage:
+        """The current page and match count from one store query.
+
+        A cached backend var, so it is keyed on exactly what it reads: the
+        store version, the search and filter inputs, the sort and the page
+        cursor. Events touching none of those reuse the cached page, and the
+        vars below share it instead of querying again.
+        """
+        if self.secondary_sorts:
+            # A keyset cursor holds a single sort value; page by offset
+            offset = (self.current_page - 1) * self.items_per_page
+            return self._query_deals(limit=self.items_per_page, offset=offset)
+        after = self._page_cursors[-1] if self._page_cursors else None
+        return self._query_deals(limit=self.items_per_page, after=after)
+
+    @rx.var
+    def filtered_count(self) -> int:
+        return self._deal_page["total"]
 
     @rx.var
     def total_pages(self) -> int:
-        if not self.filtered_deals:
+        if not self.filtered_count:
             return 1
-        return -(-len(self.filtered_deals) // self.items_per_page)
+        return -(-self.filtered_count // self.items_per_page)
+
+    @rx.var
+    def paginated_deals(self) -> list[DealRow]:
+        """The current page projected to the columns the table draws."""
+        return [deal_row(deal) for deal in self._deal_page["deals"]]
 
     @rx.var
-    def paginated_deals(self) -> list[Deal]:
-        start = (self.current_page - 1) * self.items_per_page
-        end = start + self.items_per_page
-        return self.filtered_deals[start:end]
+    def _deal_window(self) -> DealPage:
+        """The scroll window: WINDOW_SIZE rows from `window_start`.
+
+        The window resumes from the nearest keyset anchor at or before its
+        start, which `table_scrolled` records as the window moves, so
+        scrolling through a filtered result costs about one window per
+        fetch however deep it goes. Only a scrollbar jump away from every
+        anchor walks the gap by offset. Multi-column sorts page by offset
+        throughout (a cursor holds a single sort value).
+        """
+        if self.view_mode != "scroll":
+            return DealPage(deals=[], total=0)
+        if self.secondary_sorts:
+            return self._query_deals(limit=self.WINDOW_SIZE, offset=self.window_start)
+        anchor = max(
+            (offset for offset in self._window_anchors if offset <= self.window_start),
+            default=0,
+        )
+        return self._query_deals(
+            limit=self.WINDOW_SIZE,
+            after=self._window_anchors.get(anchor),
+            offset=self.window_start - anchor,
+        )
+
+    @rx.var
+    def window_deals(self) -> list[DealRow]:
+        return [deal_row(deal) for deal in self._deal_window["deals"]]
+
+    @rx.var
+    def window_padding_top(self) -> int:
+        """Height (px) standing in for the rows above the window."""
+        return self.window_start * self.ROW_HEIGHT
+
+    @rx.var
+    def window_padding_bottom(self) -> int:
+        """Height (px) standing in for the rows below the window."""
+        window = self._deal_window
+        below = window["total"] - self.window_start - len(window["deals"])
+        return max(below, 0) * self.ROW_HEIGHT
+
+    @rx.var
+    def scroll_view_key(self) -> str:
+        """Changes with the query, remounting the scroll area at the top."""
+        criteria = sorted(self._filter_criteria().items())
+        return f"{criteria!r}|{self._sort_spec()!r}|{self.sort_direction}"
+
+    @rx.var
+    def _visible_deals(self) -> list[Deal]:
+        """The rendered rows: the scroll window or the current page."""
+        if self.view_mode == "scroll":
+            return self._deal_window["deals"]
+        return self._deal_page["deals"]
+
+    @rx.var
+    def selected_page_ids(self) -> list[str]:
+        """Ids of the rendered rows that are selected (drives the checkboxes)."""
+        return [d.id for d in self._visible_deals if self._is_selected(d.id)]
 
     @rx.var
     def all_selected(self) -> bool:
-        if not self.paginated_deals:
+        if not self._visible_deals:
             return False
-        return all((deal.id in self.selected_deal_ids for deal in self.paginated_deals))
+        return len(self.selected_page_ids) == len(self._visible_deals)
+
+    @rx.var
+    def selected_count(self) -> int:
+        if self.select_all_matching:
+            return max(self.filtered_count - len(self._excluded_ids), 0)
+        return len(self._selected_ids)
+
+    def _is_selected(self, deal_id: str) -> bool:
+        if self.select_all_matching:
+            return deal_id not in self._excluded_ids
+        return deal_id in self._selected_ids
+
+    def _set_selected(self, deal_id: str, selected: bool):
+        if self.select_all_matching:
+            if selected:
+                self._excluded_ids.pop(deal_id, None)
+            else:
+                self._excluded_ids[deal_id] = None
+        elif selected:
+            self._selected_ids[deal_id] = None
+        else:
+            self._selected_ids.pop(deal_id, None)
+
+    def _selected_deal_ids(self) -> list[str]:
+        """Resolve the selection to ids; in all-matching mode this re-runs
+        the current query on the server rather than shipping ids around."""
+        if not self.select_all_matching:
+            return list(self._selected_ids)
+        if self._store_version is None:
+            return []
+        # Ids only: no deals are built for what may be the whole book
+        matching = get_deal_service().sorted_ids(
+            **self._filter_criteria(),
+            sort=self._sort_spec(),
+            direction=self.sort_direction,
+        )
+        excluded = self._excluded_ids
+        return [deal_id for deal_id in matching if deal_id not in excluded]
+
+    def _clear_selection(self):
+        self.select_all_matching = False
+        self._selected_ids = {}
+        self._excluded_ids = {}
 
     @rx.event
     def next_page(self):
-        if self.current_page < self.total_pages:
+        page = self._deal_page["deals"]
+        if self.current_page < self.total_pages and page:
+            cursor = page_cursor(page[-1], self.sort_column or None)
+            self._page_cursors = [*self._page_cursors, cursor]
             self.current_page += 1
 
     @rx.event
     def prev_page(self):
         if self.current_page > 1:
+            self._page_cursors = self._page_cursors[:-1]
             self.current_page -= 1
 
+    def _reset_paging(self):
+        """Return to the first page; cursors are only valid for one query."""
+        self.current_page = 1
+        self._page_cursors = []
+        self.window_start = 0
+        self._window_anchors = {}
+
     @rx.event
-    def toggle_select_all(self):
-        current_page_ids = [d.id for d in self.paginated_deals]
-        if self.all_selected:
-            self.selected_deal_ids = [
-                pid for pid in self.selected_deal_ids if pid not in current_page_ids
-            ]
+    def set_view_mode(self, mode: str):
+        self.view_mode = mode
+        self._reset_paging()
+
+    @rx.event
+    def table_scrolled(self, scroll_top: int, viewport_height: int):
+        """Move the scroll window once the viewport nears either edge.
+
+        The window is moved ahead of the scroll: it keeps PREFETCH_ROWS
+        behind the viewport and fills the rest with the rows coming next,
+        so it arrives while rows of the old one are still on hand and
+        scrolling within it sends nothing. A jump clear of the window (a
+        scrollbar drag) centres the new one on the viewport.
+        """
+        first = scroll_top // self.ROW_HEIGHT
+        last = first + viewport_height // self.ROW_HEIGHT + 1
+        start, end = self.window_start, self.window_start + self.WINDOW_SIZE
+        if last <= start or first >= end:
+            start = first - (self.WINDOW_SIZE - (last - first)) // 2
+        elif start > 0 and first - start < self.PREFETCH_ROWS:
+            start = last + self.PREFETCH_ROWS - self.WINDOW_SIZE
+        elif end < self._deal_window["total"] and end - last < self.PREFETCH_ROWS:
+            start = first - self.PREFETCH_ROWS
         else:
-            # Must reassign to trigger reactivity (not in-place append)
-            new_ids = list(self.selected_deal_ids)
-            for pid in current_page_ids:
-                if pid not in new_ids:
-                    new_ids.append(pid)
-            self.selected_deal_ids = new_ids
+            return
+        start = max(start, 0)
+        self._anchor_window(start)
+        self.window_start = start
+
+    def _anchor_window(self, start: int):
+        """Record keyset anchors for moving the window to `start`.
+
+        Every row of the current window is a cursor for the offset after
+        it, so a move down (or up into the window) anchors the new start
+        exactly, and the window's end is kept for later. A move up past
+        the window reads the rows before it backwards from its first row,
+        unless an earlier anchor already lies within a window of `start`.
+        """
+        if self.secondary_sorts or not start:
+            return
+        deals = self._deal_window["deals"]
+        if not deals:
+            return
+        sort = self.sort_column or None
+        old = self.window_start
+        anchors = dict(self._window_anchors)
+        anchors[old + len(deals)] = page_cursor(deals[-1], sort)
+        if old < start <= old + len(deals):
+            anchors[start] = page_cursor(deals[start - old - 1], sort)
+        elif old > start > self.WINDOW_SIZE and not any(
+            start - self.WINDOW_SIZE <= o <= start for o in anchors
+        ):
+            reverse = {"asc": "desc", "desc": "asc"}[self.sort_direction]
+            before = get_deal_service().query(
+                **self._filter_criteria(),
+                sort=sort,
+                direction=reverse,
+                after=page_cursor(deals[0], sort),
+                limit=old - start + 1,
+            )["deals"]
+            if len(before) == old - start + 1:
+                anchors[start] = page_cursor(before[-1], sort)
+        while len(anchors) > self.MAX_WINDOW_ANCHORS:
+            del anchors[next(iter(anchors))]
+        self._window_anchors = anchors
+
+    def _filters_changed(self):
+        """Reset paging; an all-matching selection referred to the old filters."""
+        self._reset_paging()
+        if self.select_all_matching:
+            self._clear_selection()
+
+    @rx.event
+    def toggle_select_all(self):
+        """Select or deselect every row on the current page."""
+        selected = not self.all_selected
+        for deal in self._visible_deals:
+            # In-place updates are tracked on backend containers
+            self._set_selected(deal.id, selected)
 
     @rx.event
     def toggle_select_deal(self, deal_id: str):
-        if deal_id in self.selected_deal_ids:
-            # Must reassign to trigger reactivity
-            self.selected_deal_ids = [d for d in self.selected_deal_ids if d != deal_id]
-        else:
-            # Must reassign to trigger reactivity
-            self.selected_deal_ids = self.selected_deal_ids + [deal_id]
+        self._set_selected(deal_id, not self._is_selected(deal_id))
+
+    @rx.event
+    def select_all_matching_deals(self):
+        """Select every deal matching the current filters, on any page."""
+        self._clear_selection()
+        self.select_all_matching = True
+
+    @rx.event
+    def clear_selection(self):
+        self._clear_selection()
 
     @rx.event
     def request_delete(self):
-        if not self.selected_deal_ids:
+        if not self.selected_count:
             return rx.toast("No deals selected.", position="bottom-right")
         self.show_delete_dialog = True
 
@@ -137,102 +462,192 @@ class DealListMixin(rx.State, mixin=True):
 
     @rx.event
     def delete_selected_deals(self):
-        for deal_id in self.selected_deal_ids:
-            deal_service.delete_deal(deal_id)
-
-        self.deals = deal_service.get_deals()
-        self.selected_deal_ids = []
+        get_deal_service().delete_deals(self._selected_deal_ids())
+        self.load_data()
+        self._clear_selection()
         return [rx.toast("Selected deals deleted.", position="bottom-right")]
 
-    @rx.event
-    def export_deals(self):
-        import csv
-        import io
-
-        yield rx.toast(
-            "Export started",
-            description="Generating CSV and starting download...",
-            position="bottom-right",
-            duration=3000,
+    def _export_request(self) -> ExportRequest:
+        """What an export covers: the selection if any, else the current
+        query; either way in the table's sort order."""
+        selected = self.selected_count and not self.select_all_matching
+        return ExportRequest(
+            criteria=self._filter_criteria(),
+            sort=self._sort_spec(),
+            direction=self.sort_direction,
+            exclude=list(self._excluded_ids) if self.select_all_matching else [],
+            ids=list(self._selected_ids) if selected else None,
+            filename="deals_export.csv",
         )
-        deals_to_export = []
-        if self.selected_deal_ids:
-            deals_to_export = [d for d in self.deals if d.id in self.selected_deal_ids]
-        else:
-            deals_to_export = self.filtered_deals
-        if not deals_to_export:
-            return rx.toast("No deals to export.", position="bottom-right")
-        output = io.StringIO()
-        writer = csv.writer(output)
-        headers = [
-            "Ticker",
-            "Structure",
-            "Company",
-            "Status",
-            "Pricing Date",
-            "Amount (M)",
-            "Price",
-            "Sector",
-            "Country",
-        ]
-        writer.writerow(headers)
-        for d in deals_to_export:
-            writer.writerow(
-                [
-                    d.ticker,
-                    d.structure,
-                    d.company_name,
-                    d.status.value,
-                    d.pricing_date,
-                    d.shares_amount,
-                    d.offering_price,
-                    d.sector,
-                    d.country,
-                ]
-            )
-        return rx.download(data=output.getvalue(), filename="deals_export.csv")
 
     @rx.event
     def load_data(self):
-        self.deals = deal_service.get_deals()
+        self._store_version = get_deal_service().version
+        self._feed_version = self._store_version
+        # Writes may have shifted the rows under the anchors' offsets
+        self._window_anchors = {}
+
+    @rx.event
+    def sync_changes(self):
+        """Catch up with writes made since the last sync (by any session).
+
+        Polled by the deals pages. Rather than reloading on every write,
+        replays the store's change feed: deleted deals leave the selection,
+        and the views (all keyed on `_store_version`) are only refreshed
+        when a change can show in them, i.e. an insert or delete, or an
+        update of one of the VIEW_FIELDS.
+        """
+        if self._feed_version is None:
+            return
+        deal_service = get_deal_service()
+        changes = deal_service.changes_since(self._feed_version)
+        if changes is None:
+            # The feed no longer reaches back that far
+            self.load_data()
+            return
+        if not changes:
+            return
+        self._feed_version = deal_service.version
+        deleted = {i for c in changes if c["kind"] == "delete" for i in c["ids"]}
+        for deal_id in deleted:
+            self._selected_ids.pop(deal_id, None)
+            self._excluded_ids.pop(deal_id, None)
+        if any(self._shows_change(change) for change in changes):
+            self._store_version = deal_service.version
+            self._window_anchors = {}
+        if hasattr(self, "_review_deal_changed"):
+            return self._review_deal_changed(changes)
+
+    def _shows_change(self, change: DealChange) -> bool:
+        return change["kind"] != "update" or not self.VIEW_FIELDS.isdisjoint(
+            change["fields"]
+        )
 
     @rx.event
     def set_search_query(self, query: str):
         self.search_query = query
-        self.current_page = 1
+        self._filters_changed()
 
     @rx.event
-    def sort_by_column(self, column: str):
+    def update_search_suggestions(self, query: str):
+        """Autocomplete for the text being typed.
+
+        Bound with a short debounce, apart from `set_search_query`: it only
+        reads the prefix indexes and touches no query input, so suggestions
+        keep up with typing while the table waits for a pause.
+        """
+        self.search_suggestions = get_deal_service().suggest(query) if query else []
+
+    @rx.event
+    def apply_search_suggestion(self, ticker: str):
+        """Narrow the list to the picked ticker and sync both search boxes."""
+        self.search_query = ticker
+        self.search_suggestions = []
+        self._filters_changed()
+        return [
+            rx.set_value("navbar-search", ticker),
+            rx.set_value("deals-search", ticker),
+        ]
+
+    @rx.event
+    def clear_search_suggestions(self):
+        self.search_suggestions = []
+
+    @rx.event
+    def sort_by_column(self, column: str, add: bool = False):
+        """Sort by `column`, or with `add` (shift-click) append it as a
+        tie-breaker; clicking a column already in the sort flips it."""
+        flip = {"asc": "desc", "desc": "asc"}
+        secondary = dict(self.secondary_sorts)
         if self.sort_column == column:
-            self.sort_direction = "desc" if self.sort_direction == "asc" else "asc"
+            self.sort_direction = flip[self.sort_direction]
+        elif add and column in secondary:
+            secondary[column] = flip[secondary[column]]
+            self.secondary_sorts = [[c, d] for c, d in secondary.items()]
+        elif add:
+            self.secondary_sorts = [*self.secondary_sorts, [column, "desc"]]
         else:
             self.sort_column = column
             self.sort_direction = "asc"
+            self.secondary_sorts = []
+        self._reset_paging()
 
     @rx.event
     def set_filter_status(self, status: str):
         self.filter_status = status
-        self.current_page = 1
+        self._filters_changed()
+
+    @rx.event
+    def set_filter_sector(self, sector: str):
+        self.filter_sector = sector
+        self._filters_changed()
+
+    @rx.event
+    def set_filter_country(self, country: str):
+        self.filter_country = country
+        self._filters_changed()
+
+    @rx.event
+    def set_filter_structure(self, structure: str):
+        self.filter_structure = structure
+        self._filters_changed()
 
     @rx.event
     def set_filter_start_date(self, date: str):
         self.filter_start_date = date
-        self.current_page = 1
+        self._filters_changed()
 
     @rx.event
     def set_filter_end_date(self, date: str):
         self.filter_end_date = date
-        self.current_page = 1
+        self._filters_changed()
+
+    @rx.event
+    def set_filter_min(self, field: str, value: str):
+        self.filter_min = {**self.filter_min, field: value.strip()}
+        self._filters_changed()
+
+    @rx.event
+    def set_filter_max(self, field: str, value: str):
+        self.filter_max = {**self.filter_max, field: value.strip()}
+        self._filters_changed()
+
+    @rx.event
+    def toggle_filter_min_exclusive(self, field: str):
+        """Switch the lower bound of `field` between >= and >."""
+        exclusive = not self.filter_min_exclusive.get(field, False)
+        self.filter_min_exclusive = {**self.filter_min_exclusive, field: exclusive}
+        self._filters_changed()
+
+    @rx.event
+    def toggle_filter_max_exclusive(self, field: str):
+        """Switch the upper bound of `field` between <= and <."""
+        exclusive = not self.filter_max_exclusive.get(field, False)
+        self.filter_max_exclusive = {**self.filter_max_exclusive, field: exclusive}
+        self._filters_changed()
+
+    @rx.event
+    def toggle_range_filters(self):
+        self.show_range_filters = not self.show_range_filters
 
     @rx.event
     def clear_filters(self):
         self.search_query = ""
+        self.search_suggestions = []
         self.filter_status = "all"
+        self.filter_sector = "all"
+        self.filter_country = "all"
+        self.filter_structure = "all"
         self.filter_start_date = ""
         self.filter_end_date = ""
+        self.filter_min = {}
+        self.filter_max = {}
+        self.filter_min_exclusive = {}
+        self.filter_max_exclusive = {}
         self.sort_column = "pricing_date"
         self.sort_direction = "desc"
-        self.current_page = 1
+        self.secondary_sorts = []
+        self._filters_changed()
 
     @rx.event
     def refresh_data(self):
@@ -243,3 +658,15 @@ class DealListMixin(rx.State, mixin=True):
             position="bottom-right",
             duration=2000,
         )
+
+
+# (low inclusive, high inclusive) -> its DealService inclusivity name
+_INCLUSIVITY = {bounds: name for name, bounds in RANGE_INCLUSIVE.items()}
+
+
+def _parse_bound(value: str) -> float | None:
+    try:
+        bound = float(value)
+    except ValueError:
+        return None
+    return bound if math.isfinite(bound) else None
@@ -1,11 +1,12 @@
 import reflex as rx
-from typing import Optional
+from typing import ClassVar, Optional
 from datetime import datetime
 from app.states.shared.schema import Deal, DealStatus
+from app.services.deals.change_feed import DealChange
+from app.services.deals.deal_service import DealPage
 from app.states.deals.deal_form_state import DealFormState
-from app.services.deals.deal_service import DealService
-
-deal_service = DealService()
+from app.services.deals.deal_store import get_deal_service
+from app.states.deals.rows import ReviewQueueRow, review_queue_row
 
 
 class DealReviewMixin(rx.State, mixin=True):
@@ -160,22 +161,35 @@ class DealReviewMixin(rx.State, mixin=True):
         """Update container width from client side."""
         self.pdf_container_width = width
 
+    # Oldest pending deals shown in the review queue
+    REVIEW_QUEUE_SIZE: ClassVar[int] = 100
+
+    # These read the store's indexes; `_store_version` (from ListMixin) is
+    # declared as a dependency so they refresh whenever the book is reloaded.
+    @rx.var(deps=["_store_version"], auto_deps=False)
+    def _review_queue(self) -> DealPage:
+        return get_deal_service().query(
+            status=DealStatus.PENDING_REVIEW,
+            sort="created_at",
+            direction="asc",
+            limit=self.REVIEW_QUEUE_SIZE,
+        )
+
     @rx.var
-    def pending_deals(self) -> list[Deal]:
-        # Requires self.deals from ListMixin or Main State
-        if not hasattr(self, "deals"):
-            return []
-        return [d for d in self.deals if d.status == DealStatus.PENDING_REVIEW]
+    def pending_deals(self) -> list[ReviewQueueRow]:
+        return [review_queue_row(deal) for deal in self._review_queue["deals"]]
 
     @rx.var
+    def pending_count(self) -> int:
+        return self._review_queue["total"]
+
+    @rx.var(deps=["_store_version"], auto_deps=False)
     def active_deals_count(self) -> int:
-        if not hasattr(self, "deals"):
-            return 0
-        return len([d for d in self.deals if d.status == DealStatus.ACTIVE])
+        return get_deal_service().count_deals(status=DealStatus.ACTIVE)
 
     @rx.event
     async def select_deal_for_review(self, deal_id: str):
-        deal = next((d for d in self.deals if d.id == deal_id), None)
+        deal = get_deal_service().get_deal_by_id(deal_id)
         if deal:
             self.active_review_deal = deal
             form_state = await self.get_state(DealFormState)
@@ -187,12 +201,34 @@ class DealReviewMixin(rx.State, mixin=True):
             # But the plan says Review Page deals with query params.
             return rx.redirect(f"/deals/review?id={deal.id}")
 
+    def _review_deal_changed(self, changes: list[DealChange]):
+        """Warn the reviewer when another session changes the open deal
+        (called by `sync_changes` with the change feed since the last sync).
+        The form keeps the reviewer's edits either way."""
+        if self.active_review_deal is None:
+            return None
+        deal_id = self.active_review_deal.id
+        kinds = {c["kind"] for c in changes if deal_id in c["ids"]}
+        if "delete" in kinds:
+            self.active_review_deal = None
+            return rx.toast.warning(
+                "This deal was deleted in another session.",
+                position="bottom-right",
+            )
+        if "update" in kinds:
+            return rx.toast.warning(
+                "This deal was edited in another session; approving will "
+                "overwrite those changes.",
+                position="bottom-right",
+            )
+        return None
+
     @rx.event
     async def on_review_page_load(self):
         """Handle review page load - check query params to load deal from URL."""
         deal_id = self.router.page.params.get("id")
         if deal_id:
-            deal = next((d for d in self.deals if d.id == deal_id), None)
+            deal = get_deal_service().get_deal_by_id(deal_id)
             if deal:
                 self.active_review_deal = deal
                 form_state = await self.get_state(DealFormState)
@@ -207,7 +243,7 @@ class DealReviewMixin(rx.State, mixin=True):
             form_state = await self.get_state(DealFormState)
             updated_values = form_state.form_values
 
-            deal = deal_service.get_deal_by_id(deal_id)
+            deal = get_deal_service().get_deal_by_id(deal_id)
             if deal:
                 for k, v in updated_values.items():
                     if v == "":
@@ -216,11 +252,11 @@ class DealReviewMixin(rx.State, mixin=True):
                         setattr(deal, k, v)
                 deal.status = DealStatus.ACTIVE
                 deal.updated_at = datetime.now().isoformat()
-                deal_service.save_deal(deal)
+                get_deal_service().save_deal(deal)
 
                 # Refresh local state
-                if hasattr(self, "deals"):
-                    self.deals = deal_service.get_deals()
+                if hasattr(self, "load_data"):
+                    self.load_data()
 
             self.active_review_deal = None
             form_state.reset_form()
@@ -236,9 +272,9 @@ class DealReviewMixin(rx.State, mixin=True):
     def reject_current_deal(self):
         if self.active_review_deal:
             deal_id = self.active_review_deal.id
-            deal_service.delete_deal(deal_id)
-            if hasattr(self, "deals"):
-                self.deals = deal_service.get_deals()
+            get_deal_service().delete_deal(deal_id)
+            if hasattr(self, "load_data"):
+                self.load_data()
             self.active_review_deal = None
             # self.form_data = {} # form_data is in AddMixin, maybe should be shared or just ignored here
             return [
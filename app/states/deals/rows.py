@@ -0,0 +1,183 @@
+"""Projected rows for the deal tables and options for the filter bar.
+
+The list and review pages render a handful of columns, so rather than ship
+whole `Deal` models (50+ fields each) to the browser, the states project
+each visible deal into a small row holding only what is drawn, with the
+display strings and per-deal colour classes already worked out (the pages
+add the shared layout classes). Those colour classes only appear in this
+module, so rxconfig.py adds it to Tailwind's content paths; keep them as
+whole literal class names for Tailwind's scanner to find.
+"""
+
+from typing import Dict, List, Optional, TypedDict
+
+from app.states.shared.schema import Deal, DealStatus
+
+
+class DealBadge(TypedDict):
+    label: str
+    class_name: str
+
+
+class DealRow(TypedDict):
+    """A deals-table row: the displayed columns as ready-to-render strings."""
+
+    id: str
+    ticker: str
+    structure: str
+    badges: List[DealBadge]
+    shares_amount: str
+    offering_price: str
+    price_class: str
+    pricing_date: str
+    announce_date: str
+    sector: str
+    country: str
+    market_cap: str
+    confidence: str
+    confidence_class: str
+
+
+class ReviewQueueRow(TypedDict):
+    """A review-queue row."""
+
+    id: str
+    ticker: str
+    ingested_at: str
+    confidence: str
+    confidence_class: str
+    source_file: str
+
+
+class FacetOption(TypedDict):
+    """A facet filter option, e.g. value 'Technology', label 'Technology (4,210)'."""
+
+    value: str
+    label: str
+
+
+# Deal fields the rows below are built from; an edit to any other field
+# leaves every rendered row as it was
+ROW_FIELDS = frozenset(
+    {
+        "ticker",
+        "structure",
+        "status",
+        "flag_clean_up",
+        "flag_bought",
+        "flag_top_up",
+        "shares_amount",
+        "offering_price",
+        "pricing_date",
+        "announce_date",
+        "sector",
+        "country",
+        "market_cap",
+        "ai_confidence_score",
+        "created_at",
+        "source_file",
+    }
+)
+
+STATUS_LABELS: Dict[str, str] = {
+    DealStatus.ACTIVE.value: "Active",
+    DealStatus.PENDING_REVIEW.value: "Pending Review",
+    DealStatus.DRAFT.value: "Draft",
+}
+
+
+def deal_row(deal: Deal) -> DealRow:
+    price = deal.offering_price
+    score = deal.ai_confidence_score
+    return DealRow(
+        id=deal.id,
+        ticker=deal.ticker,
+        structure=deal.structure,
+        badges=_badges(deal),
+        shares_amount=_number(deal.shares_amount),
+        offering_price="$" + _number(price),
+        price_class=(
+            "text-green-700" if price is not None and price > 50 else "text-red-600"
+        ),
+        pricing_date=deal.pricing_date or "",
+        announce_date=deal.announce_date or "",
+        sector=deal.sector or "",
+        country=deal.country or "",
+        market_cap="$" + _number(deal.market_cap),
+        confidence=f"{score}%",
+        confidence_class=_confidence_class(
+            score, high=80, low=50, mid="bg-yellow-100 text-yellow-800"
+        ),
+    )
+
+
+def review_queue_row(deal: Deal) -> ReviewQueueRow:
+    score = deal.ai_confidence_score
+    return ReviewQueueRow(
+        id=deal.id,
+        ticker=deal.ticker,
+        # 'YYYY-MM-DDTHH:MM:SS...' -> 'MM-DD HH:MM'
+        ingested_at=deal.created_at[5:16].replace("T", " "),
+        confidence=f"{score}%",
+        confidence_class=_confidence_class(
+            score, high=60, low=40, mid="bg-amber-100 text-amber-800"
+        ),
+        source_file=deal.source_file or "",
+    )
+
+
+def facet_options(
+    counts: Dict[str, int],
+    selected: str,
+    labels: Optional[Dict[str, str]] = None,
+) -> List[FacetOption]:
+    """Options for one facet filter with their match counts.
+
+    With `labels` the options are exactly its keys, in order; otherwise
+    every value with matches, alphabetically. The selected value is kept
+    even at zero matches so the select can still show it.
+    """
+    values = list(labels) if labels else sorted(counts)
+    if selected != "all" and selected not in values:
+        values.append(selected)
+    return [
+        FacetOption(
+            value=value,
+            label=f"{(labels or {}).get(value, value)} ({counts.get(value, 0):,})",
+        )
+        for value in values
+    ]
+
+
+def _badges(deal: Deal) -> List[DealBadge]:
+    badges = []
+    if deal.flag_clean_up:
+        badges.append(_badge("CLEAN", "bg-green-100 text-green-800"))
+    if deal.flag_bought:
+        badges.append(_badge("BOUGHT", "bg-blue-100 text-blue-800"))
+    if deal.status == DealStatus.PENDING_REVIEW:
+        badges.append(_badge("PENDING", "bg-yellow-100 text-yellow-800"))
+    if deal.flag_top_up:
+        badges.append(_badge("TOP", "bg-purple-100 text-purple-800"))
+    return badges
+
+
+def _badge(label: str, colors: str) -> DealBadge:
+    return DealBadge(label=label, class_name=colors)
+
+
+def _confidence_class(score: int, high: int, low: int, mid: str) -> str:
+    if score >= high:
+        return "bg-green-100 text-green-800"
+    if score >= low:
+        return mid
+    return "bg-red-100 text-red-800"
+
+
+def _number(value: Optional[float]) -> str:
+    """Match the table's previous JavaScript rendering: 12.0 -> '12'."""
+    if value is None:
+        return ""
+    if float(value).is_integer():
+        return str(int(value))
+    return str(value)
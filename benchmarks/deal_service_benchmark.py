@@ -0,0 +1,68 @@
+"""Latency benchmark for DealService lookups, autocomplete, upserts and deletes.
+
+Run from the project root:
+
+    python -m benchmarks.deal_service_benchmark [--sizes 1000 10000 100000 1000000]
+
+Each operation is timed over a fixed number of random calls against a store
+pre-filled with N deals, so the per-call latency should stay flat as N grows.
+"""
+
+import argparse
+import functools
+import random
+import time
+
+# Import the schema first: importing app.services directly trips the
+# app.states -> mixins -> deal_service import cycle.
+import app.states.shared.schema  # noqa: F401
+from app.services.deals.deal_generator import generate_deals
+from app.services.deals.deal_service import DealService
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+OPS_PER_SIZE = 10_000
+
+
+def build_service(n: int, seed: int = 0) -> DealService:
+    """Return a DealService seeded with n synthetic deals."""
+    service = DealService(functools.partial(generate_deals, n, seed))
+    service.get_deals()  # force seeding outside the timed sections
+    return service
+
+
+def _time_per_call(fn, args: list) -> float:
+    start = time.perf_counter()
+    for a in args:
+        fn(a)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def run(sizes: list[int]):
+    print(
+        f"{'deals':>10} {'by_id':>10} {'by_ticker':>10} {'suggest':>10} {'upsert':>10} {'delete':>10}  (µs/call)"
+    )
+    for n in sizes:
+        service = build_service(n)
+        rng = random.Random(n)
+        deals = rng.choices(service.get_deals(), k=OPS_PER_SIZE)
+        ids = [d.id for d in deals]
+        tickers = [d.ticker for d in deals]
+
+        by_id = _time_per_call(service.get_deal_by_id, ids)
+        by_ticker = _time_per_call(service.get_deal_by_ticker, tickers)
+        suggest = _time_per_call(service.suggest, [t[:2] for t in tickers])
+        upsert = _time_per_call(service.save_deal, deals)
+        delete = _time_per_call(service.delete_deal, list(dict.fromkeys(ids)))
+        print(
+            f"{n:>10,} {by_id:>10.2f} {by_ticker:>10.2f} {suggest:>10.2f} {upsert:>10.2f} {delete:>10.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run(parser.parse_args().sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Write a deterministic synthetic deal book to a file or a SQLite store.
+
+Run from the project root:
+
+    python -m benchmarks.generate_deals --count 1000000 --seed 42 --out data/deals_1m.jsonl
+    python -m benchmarks.generate_deals --count 1000000 --sqlite data/deals_1m.db
+
+`--out` accepts .jsonl or .csv. `--sqlite` builds a new database that the app
+can serve with DEAL_STORE_BACKEND=sqlite DEAL_STORE_PATH=<path>.
+"""
+
+import argparse
+import functools
+import sys
+import time
+from pathlib import Path
+
+# Import the schema first: importing app.services directly trips the
+# app.states -> mixins -> deal_service import cycle.
+import app.states.shared.schema  # noqa: F401
+from app.services.deals.deal_generator import generate_deals, write_deals
+from app.services.deals.sqlite_deal_service import SqliteDealService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validate", action="store_true", help="validate every row")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="output .jsonl or .csv file")
+    target.add_argument("--sqlite", help="new SQLite database to create")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.out:
+        written = write_deals(
+            generate_deals(args.count, args.seed, validate=args.validate), args.out
+        )
+    else:
+        if Path(args.sqlite).exists():
+            sys.exit(f"{args.sqlite} already exists; refusing to mix books")
+        service = SqliteDealService(
+            args.sqlite,
+            functools.partial(
+                generate_deals, args.count, args.seed, validate=args.validate
+            ),
+        )
+        written = service.count_deals()
+        service.close()
+    elapsed = time.perf_counter() - start
+    print(f"{written:,} deals in {elapsed:.1f}s ({written / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,19 @@ import reflex as rx
 
 config = rx.Config(
     app_name="app",
-    plugins=[rx.plugins.TailwindV3Plugin()],
+    plugins=[
+        rx.plugins.TailwindV3Plugin(
+            config={
+                "content": [
+                    # Reflex's defaults, relative to .web
+                    "./app/**/*.{js,ts,jsx,tsx}",
+                    "./utils/**/*.{js,ts,jsx,tsx}",
+                    # Classes precomputed server-side for the table rows
+                    "../app/states/deals/rows.py",
+                ]
+            }
+        )
+    ],
     frontend_packages=[
         "react-pdf@9.1.1",  # Required for PDF viewer component
     ],
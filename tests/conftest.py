@@ -0,0 +1,3 @@
+# Import the schema first: importing app.services directly trips the
+# app.states -> mixins -> deal_service import cycle.
+import app.states.shared.schema  # noqa: F401
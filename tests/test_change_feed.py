@@ -0,0 +1,58 @@
+"""ChangeLog: what `changes_since` replays, and when it gives up."""
+
+from app.services.deals.change_feed import ChangeLog
+
+
+def kinds(events):
+    return [(e["version"], e["kind"], e["ids"]) for e in events]
+
+
+def test_since_replays_events_after_a_version():
+    log = ChangeLog()
+    log.record(1, inserted=["a"])
+    log.record(2, updated={"a": ["ticker"]}, deleted=["b"])
+    assert kinds(log.since(0)) == [
+        (1, "insert", ["a"]),
+        (2, "update", ["a"]),
+        (2, "delete", ["b"]),
+    ]
+    assert kinds(log.since(1)) == [(2, "update", ["a"]), (2, "delete", ["b"])]
+    assert log.since(2) == []
+
+
+def test_since_gives_up_once_an_event_after_it_is_evicted():
+    log = ChangeLog(max_events=3)
+    log.record(1, inserted=["a"])
+    log.record(2, inserted=["b"], deleted=["a"])
+    log.record(3, inserted=["c"])
+    # Version 1 is gone: a session at 0 can no longer catch up
+    assert log.since(0) is None
+    assert kinds(log.since(1)) == [
+        (2, "insert", ["b"]),
+        (2, "delete", ["a"]),
+        (3, "insert", ["c"]),
+    ]
+    # Evicting half of version 2's events must fail `since(1)` too, not
+    # replay the half that is left
+    log.record(4, inserted=["d"])
+    assert log.since(1) is None
+    assert kinds(log.since(2)) == [(3, "insert", ["c"]), (4, "insert", ["d"])]
+
+
+def test_updates_merge_their_fields_and_skip_unchanged_ids():
+    log = ChangeLog()
+    log.record(1, updated={"a": ["ticker"], "b": ["sector", "ticker"], "c": []})
+    (event,) = log.since(0)
+    assert event["kind"] == "update"
+    assert event["ids"] == ["a", "b"]
+    assert event["fields"] == ["sector", "ticker"]
+    log.record(2, updated={"a": []})
+    assert log.since(1) == []
+
+
+def test_reset_forgets_every_event():
+    log = ChangeLog()
+    log.record(1, inserted=["a"])
+    log.reset(2)
+    assert log.since(1) is None
+    assert log.since(2) == []
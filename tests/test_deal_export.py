@@ -0,0 +1,52 @@
+"""Lifetime of the files built by background export jobs."""
+
+import asyncio
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app.services.deals import deal_export
+
+
+def download(token: str):
+    request = Request({"type": "http", "path_params": {"token": token}})
+    return asyncio.run(deal_export.download_export_file(request))
+
+
+@pytest.fixture
+def export_files(tmp_path, monkeypatch):
+    """Register a live and an expired job file; returns their paths."""
+    monkeypatch.setattr(deal_export, "_export_files", {})
+    now = time.monotonic()
+    paths = {}
+    for token, expires in (("live", now + 60), ("expired", now - 1)):
+        path = tmp_path / f"{token}.csv"
+        path.write_text("id\n")
+        deal_export._export_files[token] = (expires, path, f"{token}.csv")
+        paths[token] = path
+    return paths
+
+
+def test_download_prunes_expired_files(export_files):
+    response = download("live")
+    assert response.status_code == 200
+    assert response.path == export_files["live"]
+    assert not export_files["expired"].exists()
+    assert export_files["live"].exists()
+    assert list(deal_export._export_files) == ["live"]
+
+
+def test_expired_file_is_not_served(export_files):
+    response = download("expired")
+    assert response.status_code == 404
+
+
+def test_shutdown_deletes_every_file(export_files):
+    async def run_app():
+        async with deal_export.export_files_lifespan():
+            assert all(path.exists() for path in export_files.values())
+
+    asyncio.run(run_app())
+    assert not any(path.exists() for path in export_files.values())
+    assert deal_export._export_files == {}
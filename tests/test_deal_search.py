@@ -0,0 +1,52 @@
+"""DealService.search_ids against a brute-force scan, including the
+narrowing of cached results while a query is typed."""
+
+import random
+
+from app.services.deals.deal_generator import generate_deals
+from app.services.deals.deal_service import DealService
+
+
+def search_fields(store: DealService) -> dict:
+    """id -> the lowercased SEARCH_FIELDS of each deal, one per entry."""
+    return {
+        deal.id: [(getattr(deal, f) or "").lower() for f in store.SEARCH_FIELDS]
+        for deal in store.snapshot()
+    }
+
+
+def brute_force(fields: dict, query: str) -> set:
+    q = query.lower()
+    return {i for i, values in fields.items() if any(q in v for v in values)}
+
+
+def typed(word: str):
+    """Each prefix of `word`, as the search box sends them."""
+    return [word[:n] for n in range(1, len(word) + 1)]
+
+
+def test_search_ids_match_brute_force_across_writes():
+    rng = random.Random(12)
+    store = DealService(lambda: generate_deals(300, seed=12))
+    words = [deal.ticker for deal in rng.sample(list(store.snapshot()), 5)]
+    words += [deal.company_name.split()[0] for deal in store.snapshot()][:5]
+    words += ["tech", "Corp", "united", "zzzz", "a"]
+    for round_ in range(4):
+        fields = search_fields(store)
+        for word in words:
+            for query in typed(word):
+                assert store.search_ids(query) == brute_force(fields, query), query
+            # Backspacing re-reads the shorter cached prefixes
+            for query in reversed(typed(word)):
+                assert store.search_ids(query) == brute_force(fields, query), query
+        # Writes retire the cached results: rename, delete and add deals
+        deals = rng.sample(list(store.snapshot()), 10)
+        for deal in deals[:5]:
+            deal = store.get_deal_by_id(deal.id)
+            deal.company_name = f"{rng.choice(words)} Holdings {round_}"
+            store.save_deal(deal)
+        store.delete_deals([deal.id for deal in deals[5:]])
+        store.save_deals(
+            deal.model_copy(update={"id": f"new{round_}-{i}", "ticker": f"NW{i}"})
+            for i, deal in enumerate(deals[5:])
+        )
@@ -0,0 +1,204 @@
+"""Behaviour both deal stores must share, run against each of them."""
+
+import pytest
+
+from app.services.deals import deal_export
+from app.services.deals.deal_service import DealService
+from app.services.deals.sqlite_deal_service import SqliteDealService
+from app.states.shared.schema import Deal
+
+SPREADS = [None, 1.0, 2.5, 5.0, 5.0, 7.5, 10.0]
+# avg_volume has no sorted index in the in-memory store
+VOLUMES = [None, 3.0, 1.0, 3.0, None, 2.0, 1.0]
+
+
+def seed_deals():
+    return [
+        Deal(
+            id=f"d{i}",
+            ticker=f"T{i}",
+            structure="Follow-on",
+            pricing_date=f"2024-01-{i + 1:02}",
+            gross_spread=spread,
+            avg_volume=volume,
+            created_at="2024-01-01T00:00:00",
+            updated_at="2024-01-01T00:00:00",
+        )
+        for i, (spread, volume) in enumerate(zip(SPREADS, VOLUMES))
+    ]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        service = DealService(seed_deals)
+    else:
+        service = SqliteDealService(str(tmp_path / "deals.db"), seed_deals)
+    yield service
+    service.close()
+
+
+def spreads(store, **criteria):
+    deals = store.query(**criteria, sort="gross_spread", direction="asc")["deals"]
+    return [deal.gross_spread for deal in deals]
+
+
+@pytest.mark.parametrize(
+    "bounds, expected",
+    [
+        ((5.0, None), [5.0, 5.0, 7.5, 10.0]),
+        ((5.0, None, "neither"), [7.5, 10.0]),
+        ((5.0, None, "right"), [7.5, 10.0]),
+        ((None, 5.0, "left"), [1.0, 2.5]),
+        ((2.5, 7.5, "both"), [2.5, 5.0, 5.0, 7.5]),
+        ((2.5, 7.5, "neither"), [5.0, 5.0]),
+        ((5.0, 5.0, "left"), []),
+    ],
+)
+def test_range_bounds(store, bounds, expected):
+    ranges = {"gross_spread": bounds}
+    assert spreads(store, ranges=ranges) == expected
+    assert store.query(ranges=ranges, limit=0)["total"] == len(expected)
+
+
+def test_unknown_inclusivity_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.query(ranges={"gross_spread": (1.0, 2.0, "open")})
+
+
+MULTI_SORT = [("gross_spread", "desc"), ("pricing_date", "asc")]
+
+
+def multi_sorted_ids(store, **paging):
+    deals = store.query(sort=MULTI_SORT, **paging)["deals"]
+    return [deal.id for deal in deals]
+
+
+def test_multi_sort_pages_slice_one_order(store):
+    ordered = multi_sorted_ids(store)
+    assert ordered == ["d6", "d5", "d3", "d4", "d2", "d1", "d0"]
+    pages = [multi_sorted_ids(store, offset=i, limit=3) for i in (0, 3, 6)]
+    assert sum(pages, []) == ordered
+
+
+def test_multi_sort_follows_writes(store):
+    assert multi_sorted_ids(store, limit=2) == ["d6", "d5"]
+    deal = store.get_deal_by_id("d0")
+    deal.gross_spread = 8.0
+    store.save_deal(deal)
+    assert multi_sorted_ids(store, limit=2) == ["d6", "d0"]
+    store.delete_deals(["d6"])
+    assert multi_sorted_ids(store, limit=2) == ["d0", "d5"]
+
+
+def test_multi_sort_on_a_column_without_an_index(store):
+    sort = [("avg_volume", "desc"), ("gross_spread", "asc")]
+    deals = store.query(sort=sort)["deals"]
+    assert [d.id for d in deals] == ["d1", "d3", "d5", "d2", "d6", "d0", "d4"]
+    deal = store.get_deal_by_id("d0")
+    deal.avg_volume = 2.5
+    store.save_deal(deal)
+    assert [d.id for d in store.query(sort=sort, limit=4)["deals"]] == [
+        "d1",
+        "d3",
+        "d0",
+        "d5",
+    ]
+
+
+@pytest.mark.parametrize(
+    "sort", [[("bogus", "asc"), ("ticker", "asc")], "bogus", [("ticker", "up")]]
+)
+def test_unknown_sort_keys_are_rejected(store, sort):
+    with pytest.raises(ValueError, match="Unsupported sort"):
+        store.query(sort=sort)
+    with pytest.raises(ValueError, match="Unsupported sort"):
+        store.sorted_ids(sort=sort)
+
+
+@pytest.mark.parametrize("sort", ["gross_spread", MULTI_SORT])
+def test_sorted_ids_match_query_order(store, sort):
+    ranges = {"gross_spread": (1.0, None)}
+    deals = store.query(sort=sort, direction="desc", ranges=ranges)["deals"]
+    ids = store.sorted_ids(sort=sort, direction="desc", ranges=ranges)
+    assert ids == [deal.id for deal in deals]
+
+
+def test_multi_sort_export_streams_in_chunks(store, monkeypatch):
+    monkeypatch.setattr(deal_export, "get_deal_service", lambda: store)
+    request = deal_export.ExportRequest(
+        criteria={},
+        sort=MULTI_SORT,
+        direction="asc",
+        exclude=["d5"],
+        ids=None,
+        filename="deals.csv",
+    )
+    chunks = list(deal_export.export_chunks(request, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2]
+    exported = [deal.id for chunk in chunks for deal in chunk]
+    assert exported == [i for i in multi_sorted_ids(store) if i != "d5"]
+
+
+def test_snapshot_is_isolated_from_writes(store):
+    snapshot = store.snapshot()
+    deal = store.get_deal_by_id("d1")
+    deal.ticker = "CHANGED"
+    store.save_deal(deal)
+    store.delete_deals(["d2", "d3"])
+    assert snapshot.get_deal_by_id("d1").ticker == "T1"
+    assert snapshot.get_deal_by_id("d2") is not None
+    assert [d.id for d in snapshot.get_deals_by_ids(["d3", "nope", "d2"])] == [
+        "d3",
+        "d2",
+    ]
+    assert len(snapshot) == sum(1 for _ in snapshot) == len(SPREADS)
+    snapshot.close()
+    with store.snapshot() as current:
+        assert current.get_deal_by_id("d1").ticker == "CHANGED"
+        assert current.get_deal_by_id("d2") is None
+        assert len(current) == len(SPREADS) - 2
+        assert current.version == store.version
+
+
+def test_sqlite_snapshot_pins_its_transaction(tmp_path):
+    store = SqliteDealService(str(tmp_path / "deals.db"), seed_deals)
+    pool = store._engine.pool
+    snapshot = store.snapshot()
+    assert pool.checkedout() == 1
+    # The write commits while the snapshot's read transaction is open; WAL
+    # keeps serving the snapshot the pages as of its BEGIN
+    store.delete_deals(["d0"])
+    store.save_deals(
+        [seed_deals()[0].model_copy(update={"id": "new", "ticker": "NEW"})]
+    )
+    assert store.get_deal_by_id("d0") is None
+    assert snapshot.get_deal_by_id("d0") is not None
+    assert snapshot.get_deal_by_id("new") is None
+    assert {d.id for d in snapshot} == {f"d{i}" for i in range(len(SPREADS))}
+    snapshot.close()
+    assert pool.checkedout() == 0
+    store.close()
+
+
+def test_batch_save_logs_inserts_and_updates_apart(store):
+    version = store.version
+    changed = store.get_deal_by_id("d1")
+    changed.ticker = "NEW1"
+    changed.gross_spread = 9.0
+    unchanged = store.get_deal_by_id("d2")
+    added = seed_deals()[0].model_copy(update={"id": "n1", "ticker": "N1"})
+    store.save_deals([changed, unchanged, added])
+    changes = store.changes_since(version)
+    assert [(c["kind"], c["ids"]) for c in changes] == [
+        ("insert", ["n1"]),
+        ("update", ["d1"]),
+    ]
+    assert changes[0]["fields"] == []
+    assert changes[1]["fields"] == ["gross_spread", "ticker"]
+
+
+def test_saving_an_unchanged_deal_logs_no_update(store):
+    version = store.version
+    store.save_deal(store.get_deal_by_id("d3"))
+    assert store.changes_since(version) == []
@@ -0,0 +1,116 @@
+"""PersistentMap against a plain dict, including hash collisions."""
+
+import random
+
+import pytest
+
+from app.services.deals.persistent import PersistentMap
+
+
+class Colliding:
+    """A key with a chosen hash, so distinct keys can share one."""
+
+    def __init__(self, name: str, key_hash: int):
+        self.name = name
+        self.key_hash = key_hash
+
+    def __hash__(self) -> int:
+        return self.key_hash
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Colliding) and other.name == self.name
+
+    def __repr__(self) -> str:
+        return f"Colliding({self.name!r}, {self.key_hash})"
+
+
+def assert_matches(mapping: PersistentMap, expected: dict):
+    assert len(mapping) == len(expected)
+    assert sum(1 for _ in mapping.items()) == len(expected)
+    assert dict(mapping.items()) == expected
+    for key, value in expected.items():
+        assert key in mapping
+        assert mapping[key] == value
+
+
+def test_set_get_and_overwrite():
+    mapping = PersistentMap().set("a", 1).set("b", 2)
+    assert_matches(mapping, {"a": 1, "b": 2})
+    overwritten = mapping.set("a", 3)
+    assert_matches(overwritten, {"a": 3, "b": 2})
+    assert mapping["a"] == 1
+    assert mapping.get("missing") is None
+    with pytest.raises(KeyError):
+        mapping["missing"]
+
+
+def test_delete():
+    mapping = PersistentMap((str(i), i) for i in range(100))
+    smaller = mapping.delete("7")
+    assert "7" not in smaller and "7" in mapping
+    assert_matches(smaller, {str(i): i for i in range(100) if i != 7})
+    assert smaller.delete("7") is smaller
+    empty = PersistentMap([("x", 1)]).delete("x")
+    assert_matches(empty, {})
+    assert_matches(empty.set("y", 2), {"y": 2})
+
+
+def test_construction_matches_incremental_sets():
+    items = [(f"k{i}", i) for i in range(2_000)] + [("k5", "last wins")]
+    built = PersistentMap(items)
+    incremental = PersistentMap()
+    for key, value in items:
+        incremental = incremental.set(key, value)
+    assert_matches(built, dict(items))
+    assert_matches(incremental, dict(items))
+
+
+def test_random_writes_keep_the_size_and_old_versions():
+    rng = random.Random(24)
+    mapping, expected = PersistentMap(), {}
+    versions = []
+    for step in range(3_000):
+        key = rng.randrange(500)
+        if rng.random() < 0.35:
+            mapping = mapping.delete(key)
+            expected.pop(key, None)
+        else:
+            mapping = mapping.set(key, step)
+            expected[key] = step
+        if step % 300 == 0:
+            versions.append((mapping, dict(expected)))
+            assert_matches(mapping, expected)
+    assert_matches(mapping, expected)
+    # Every earlier version still reads as it was when published
+    for old, old_expected in versions:
+        assert_matches(old, old_expected)
+
+
+@pytest.mark.parametrize(
+    "hashes",
+    [
+        [42, 42, 42],
+        # Equal in the low slots, apart only past the first trie levels
+        [1, 1 + (1 << 40), 1 + (1 << 60)],
+        # Negative hashes, folded to 64 bits
+        [-5, -5, -6],
+    ],
+)
+def test_colliding_hashes(hashes):
+    keys = [Colliding(f"c{i}", key_hash) for i, key_hash in enumerate(hashes)]
+    neighbour = Colliding("other", 43)
+    mapping = PersistentMap([(neighbour, "n")])
+    expected = {neighbour: "n"}
+    for i, key in enumerate(keys):
+        mapping = mapping.set(key, i)
+        expected[key] = i
+        assert_matches(mapping, expected)
+    assert_matches(PersistentMap(expected.items()), expected)
+    mapping = mapping.set(keys[0], "updated")
+    expected[keys[0]] = "updated"
+    assert_matches(mapping, expected)
+    assert Colliding("absent", hashes[0]) not in mapping
+    for key in keys:
+        mapping = mapping.delete(key)
+        del expected[key]
+        assert_matches(mapping, expected)
@@ -0,0 +1,112 @@
+"""QueryCache and the `cached_query` wrapper both stores put on `query`."""
+
+from app.services.deals.deal_service import DealService
+from app.services.deals.query_cache import QueryCache, cached_query
+from app.services.deals.sqlite_deal_service import SqliteDealService
+from tests.test_deal_stores import seed_deals
+
+
+class CountingStore:
+    """Just enough of a store for `cached_query`: counts real calls."""
+
+    def __init__(self, cache: QueryCache):
+        self.query_cache = cache
+        self.version = 0
+        self.calls = 0
+
+    def sync_version(self):
+        pass
+
+    @cached_query
+    def query(
+        self,
+        search=None,
+        sort="pricing_date",
+        direction="desc",
+        limit=None,
+        ranges=None,
+    ):
+        self.calls += 1
+        return {"deals": [object()] * (limit or 0), "total": limit or 0}
+
+
+def test_spellings_of_one_query_share_an_entry():
+    store = CountingStore(QueryCache())
+    store.query(ranges={"market_cap": (1, 5), "gross_spread": (None, 2)})
+    store.query(ranges={"gross_spread": (None, 2, "both"), "market_cap": (1, 5)})
+    store.query(search="", sort=[("pricing_date", "desc")])
+    store.query(sort="pricing_date", direction="desc")
+    assert store.calls == 2
+    store.query(ranges={"market_cap": (1, 5, "neither")})
+    store.query(sort="pricing_date", direction="asc")
+    assert store.calls == 4
+
+
+def test_eviction_is_bounded_by_rows():
+    cache = QueryCache(max_rows=25, max_entry_rows=20)
+    store = CountingStore(cache)
+    # Entries weigh their rows plus one: 6, 11, then 16, which pushes the
+    # total to 33 and evicts the two older ones
+    for limit in (5, 10, 15):
+        store.query(limit=limit)
+    stats = cache.stats()
+    assert stats["rows"] == 16
+    assert stats["entries"] == 1 and stats["evictions"] == 2
+    store.query(limit=15)
+    assert store.calls == 3
+    store.query(limit=5)
+    assert store.calls == 4
+
+
+def test_oversized_results_pass_through():
+    cache = QueryCache(max_rows=1_000, max_entry_rows=10)
+    store = CountingStore(cache)
+    store.query(limit=11)
+    store.query(limit=11)
+    assert store.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_a_new_version_retires_every_entry():
+    store = CountingStore(QueryCache())
+    store.query(limit=1)
+    store.query(limit=2)
+    store.version += 1
+    store.query(limit=1)
+    assert store.calls == 3
+    assert store.query_cache.stats()["entries"] == 1
+
+
+def test_writes_invalidate_cached_pages():
+    store = DealService(seed_deals)
+    before = store.query(sort="ticker", direction="asc")
+    deal = store.get_deal_by_id("d0")
+    deal.ticker = "ZZZ"
+    store.save_deal(deal)
+    after = store.query(sort="ticker", direction="asc")
+    assert after is not before
+    assert after["deals"][-1].ticker == "ZZZ"
+
+
+def test_sqlite_sees_commits_by_other_processes(tmp_path):
+    path = str(tmp_path / "deals.db")
+    worker = SqliteDealService(path, seed_deals)
+    # A second instance stands in for another worker or the generator tool
+    other = SqliteDealService(path, seed_deals)
+    version = worker.version
+    assert worker.query(limit=0)["total"] == 7
+    assert worker.changes_since(version) == []
+
+    other.delete_deals(["d0"])
+    assert worker.query(limit=0)["total"] == 6
+    assert worker.version > version
+    # The other process's changes are not in the log: sessions must reload
+    assert worker.changes_since(version) is None
+
+    # This instance's own writes still go through the change feed
+    version = worker.version
+    worker.delete_deals(["d1"])
+    assert [c["kind"] for c in worker.changes_since(version)] == ["delete"]
+    assert worker.query(limit=0)["total"] == 5
+    other.close()
+    worker.close()
@@ -0,0 +1,220 @@
+"""SortedIndex against a plain sorted list of (sort_key(key), id) entries.
+
+CHUNK_SIZE is shrunk so a few dozen deals already split, drain and merge
+chunks, which is where the bookkeeping (`_maxes`, offsets, ranks) can go
+wrong.
+"""
+
+import random
+
+import pytest
+
+from app.services.deals.indexes import SortedIndex, sort_key
+
+
+class SmallSortedIndex(SortedIndex):
+    CHUNK_SIZE = 4
+
+
+KEYS = [None, "", 0, 1, 2, 3, 5, 8, 13, 21]
+
+
+class Reference:
+    """The expected contents: id -> key, ordered on demand."""
+
+    def __init__(self):
+        self.keys = {}
+
+    def entries(self):
+        return sorted((sort_key(key), deal_id) for deal_id, key in self.keys.items())
+
+    def ordered(self):
+        return [deal_id for _, deal_id in self.entries()]
+
+    def range(self, low, high, low_inclusive=True, high_inclusive=True):
+        return [
+            deal_id
+            for (_, deal_id), key in (
+                (entry, self.keys[entry[1]]) for entry in self.entries()
+            )
+            if key not in (None, "")
+            and (low is None or key > low or (low_inclusive and key == low))
+            and (high is None or key < high or (high_inclusive and key == high))
+        ]
+
+
+def assert_consistent(index: SortedIndex, reference: Reference):
+    chunks = index._chunks
+    assert all(chunks), "no empty chunks"
+    assert all(len(chunk) <= 2 * index.CHUNK_SIZE for chunk in chunks)
+    assert index._maxes == [chunk[-1] for chunk in chunks]
+    assert len(index) == len(reference.keys)
+    assert list(index.ordered()) == reference.ordered()
+    assert list(index.ordered(reverse=True)) == reference.ordered()[::-1]
+
+
+def random_writes(index, reference, rng, count, ids):
+    for _ in range(count):
+        deal_id = rng.choice(ids)
+        if rng.random() < 0.3:
+            index.remove(deal_id)
+            reference.keys.pop(deal_id, None)
+        else:
+            key = rng.choice(KEYS)
+            index.add(deal_id, key)
+            reference.keys[deal_id] = key
+
+
+@pytest.fixture
+def filled():
+    rng = random.Random(13)
+    index, reference = SmallSortedIndex("value"), Reference()
+    ids = [f"d{i:03}" for i in range(60)]
+    random_writes(index, reference, rng, 400, ids)
+    return index, reference, rng, ids
+
+
+def test_insert_and_remove_keep_chunks_sorted(filled):
+    index, reference, rng, ids = filled
+    for _ in range(20):
+        random_writes(index, reference, rng, 25, ids)
+        assert_consistent(index, reference)
+
+
+def test_sequential_inserts_split_the_last_chunk():
+    index, reference = SmallSortedIndex("value"), Reference()
+    for i in range(50):
+        index.add(f"d{i:03}", i)
+        reference.keys[f"d{i:03}"] = i
+    assert len(index._chunks) > 5
+    assert_consistent(index, reference)
+
+
+def test_removing_a_chunk_maximum_updates_maxes():
+    index, reference = SmallSortedIndex("value"), Reference()
+    for i in range(20):
+        index.add(f"d{i:03}", i)
+        reference.keys[f"d{i:03}"] = i
+    # Drain from the top so every removal takes out a chunk's largest entry
+    for i in reversed(range(3, 20)):
+        index.remove(f"d{i:03}")
+        del reference.keys[f"d{i:03}"]
+        assert_consistent(index, reference)
+
+
+def test_removing_missing_ids_is_a_no_op(filled):
+    index, reference, _, _ = filled
+    index.remove("absent")
+    assert_consistent(index, reference)
+
+
+def test_load_matches_incremental_inserts(filled):
+    index, reference, _, _ = filled
+    loaded = SmallSortedIndex("value")
+    loaded.load(reference.keys.items())
+    assert_consistent(loaded, reference)
+    with pytest.raises(ValueError):
+        loaded.load([("d999", 1)])
+
+
+@pytest.mark.parametrize(
+    "low, high", [(None, None), (None, 3), (3, None), (2, 8), (5, 5), (9, 12), (8, 2)]
+)
+def test_range_and_count_range(filled, low, high):
+    index, reference, rng, ids = filled
+    for _ in range(5):
+        random_writes(index, reference, rng, 30, ids)
+        expected = reference.range(low, high)
+        assert list(index.range(low, high)) == expected
+        assert index.count_range(low, high) == len(expected)
+
+
+@pytest.mark.parametrize("low_inclusive", [True, False])
+@pytest.mark.parametrize("high_inclusive", [True, False])
+@pytest.mark.parametrize("low, high", [(None, 3), (3, None), (2, 8), (5, 5), (4, 6)])
+def test_exclusive_range_bounds(filled, low, high, low_inclusive, high_inclusive):
+    index, reference, rng, ids = filled
+    bounds = dict(low_inclusive=low_inclusive, high_inclusive=high_inclusive)
+    for _ in range(5):
+        random_writes(index, reference, rng, 30, ids)
+        expected = reference.range(low, high, low_inclusive, high_inclusive)
+        assert list(index.range(low, high, **bounds)) == expected
+        assert index.count_range(low, high, **bounds) == len(expected)
+
+
+def assert_ranks_follow_keys(index, reference):
+    ranks = index.ranks()
+    assert ranks.keys() == reference.keys.keys()
+    by_key = {}
+    for deal_id, key in reference.keys.items():
+        by_key.setdefault(sort_key(key), set()).add(ranks[deal_id])
+    assert all(len(shared) == 1 for shared in by_key.values())
+    ordered = [by_key[key].pop() for key in sorted(by_key)]
+    assert ordered == sorted(set(ordered))
+
+
+def test_ranks_follow_key_order(filled):
+    index, reference, rng, ids = filled
+    for _ in range(5):
+        random_writes(index, reference, rng, 30, ids)
+        assert_ranks_follow_keys(index, reference)
+
+
+def test_writes_keep_ranks_current(filled):
+    index, reference, rng, ids = filled
+    ranks = index.ranks()
+    for _ in range(200):
+        random_writes(index, reference, rng, 1, ids)
+        assert index.ranks() is ranks
+        assert_ranks_follow_keys(index, reference)
+
+
+def test_ranks_rebuild_when_a_gap_runs_out():
+    index, reference = SmallSortedIndex("value"), Reference()
+    for deal_id, key in (("lo", 0.0), ("hi", 1.0)):
+        index.add(deal_id, key)
+        reference.keys[deal_id] = key
+    index.ranks()
+    # Each key lands between the last one and "hi", halving the gap
+    for i in range(40):
+        key = 1.0 - 2.0 ** -(i + 1)
+        index.add(f"d{i:03}", key)
+        reference.keys[f"d{i:03}"] = key
+        assert_ranks_follow_keys(index, reference)
+
+
+def test_slice_by_position(filled):
+    index, reference, _, _ = filled
+    ordered = reference.ordered()
+    size = len(ordered)
+    for start in range(0, size + 2):
+        for stop in (start, start + 1, start + 5, size, size + 3, None):
+            expected = ordered[start:stop]
+            assert list(index.slice(start, stop)) == expected
+            expected = ordered[::-1][start:stop]
+            assert list(index.slice(start, stop, reverse=True)) == expected
+
+
+def test_seek_resumes_after_a_cursor(filled):
+    index, reference, _, _ = filled
+    entries = reference.entries()
+    ordered = [deal_id for _, deal_id in entries]
+    for pos, (_, deal_id) in enumerate(entries):
+        key = reference.keys[deal_id]
+        assert list(index.seek(key, deal_id)) == ordered[pos + 1 :]
+        assert list(index.seek(key, deal_id, reverse=True)) == ordered[:pos][::-1]
+    # A cursor whose row has since been deleted still resumes in place
+    _, deal_id = entries[len(entries) // 2]
+    key = reference.keys[deal_id]
+    index.remove(deal_id)
+    pos = ordered.index(deal_id)
+    assert list(index.seek(key, deal_id)) == ordered[pos + 1 :]
+
+
+def test_prefix_scan():
+    index = SmallSortedIndex("ticker")
+    words = ["ab", "abc", "abd", "b", "ba", "a", "abzz", "ac"]
+    for i, word in enumerate(words):
+        index.add(f"d{i}", word)
+    found = [index.key_of(deal_id) for deal_id in index.prefix("ab")]
+    assert found == ["ab", "abc", "abd", "abzz"]
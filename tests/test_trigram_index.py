@@ -0,0 +1,120 @@
+"""TrigramIndex against a brute-force substring scan over random writes."""
+
+import random
+
+import pytest
+
+from app.services.deals.indexes import TrigramIndex, trigrams
+
+# A small alphabet, so random texts share many trigrams
+ALPHABET = "abcd"
+
+
+def random_text(rng: random.Random) -> str:
+    fields = [
+        "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 8)))
+        for _ in range(rng.randint(1, 3))
+    ]
+    return "\0".join(fields)
+
+
+def matches(texts: dict, query: str) -> set:
+    return {deal_id for deal_id, text in texts.items() if query in text}
+
+
+def assert_postings_exact(index: TrigramIndex, texts: dict):
+    """Each posting list holds exactly the rows of the deals with its gram."""
+    expected = {}
+    for deal_id, text in texts.items():
+        for gram in trigrams(text):
+            expected.setdefault(gram, set()).add(index._rows[deal_id])
+    postings = index._postings
+    assert {gram: set(rows) for gram, rows in postings.items()} == expected
+    assert all(list(rows) == sorted(rows) for rows in postings.values())
+    assert {index._ids[row] for row in index._rows.values()} == set(texts)
+
+
+@pytest.fixture
+def written():
+    rng = random.Random(8)
+    index, texts = TrigramIndex(), {}
+    ids = [f"d{i:02}" for i in range(40)]
+    for _ in range(600):
+        deal_id = rng.choice(ids)
+        if deal_id in texts and rng.random() < 0.3:
+            index.remove(deal_id, texts.pop(deal_id))
+        else:
+            text = random_text(rng)
+            index.add(deal_id, text, texts.get(deal_id))
+            texts[deal_id] = text
+    return index, texts, rng
+
+
+def test_random_writes_keep_postings_exact(written):
+    index, texts, _ = written
+    assert_postings_exact(index, texts)
+
+
+def test_candidates_cover_every_match(written):
+    index, texts, rng = written
+    for _ in range(300):
+        query = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(3, 6)))
+        candidates = index.candidates(query)
+        assert candidates >= matches(texts, query), query
+        assert {i for i in candidates if query in texts[i]} == matches(texts, query)
+    assert index.candidates("ab") is None
+
+
+def test_load_matches_incremental_adds(written):
+    _, texts, _ = written
+    loaded = TrigramIndex()
+    loaded.load(texts.items())
+    assert_postings_exact(loaded, texts)
+    with pytest.raises(ValueError):
+        loaded.load([("x", "abc")])
+
+
+def test_removed_rows_are_reused():
+    index = TrigramIndex()
+    index.load([("a", "apple"), ("b", "banana"), ("c", "cherry")])
+    row = index._rows["b"]
+    index.remove("b", "banana")
+    assert index._ids[row] is None
+    assert index.candidates("nan") == set()
+    index.add("d", "durian")
+    assert index._rows["d"] == row and len(index._ids) == 3
+    assert index.candidates("ria") == {"d"}
+    assert index.candidates("ana") == set()
+
+
+def test_updating_removes_grams_of_the_old_text():
+    index = TrigramIndex()
+    index.add("a", "kiwi")
+    index.add("a", "lime", old_text="kiwi")
+    assert index.candidates("kiw") == set()
+    assert "kiw" not in index._postings
+    assert index.candidates("lim") == {"a"}
+    # Re-adding the same text is a no-op
+    index.add("a", "lime", old_text="lime")
+    assert index.candidates("ime") == {"a"}
+
+
+def test_grams_never_span_fields():
+    index = TrigramIndex()
+    index.add("a", "ab\0cd")
+    assert trigrams("ab\0cd") == set()
+    assert index.candidates("abc") == set()
+    index.add("b", "xyz\0abc")
+    assert index.candidates("abc") == {"b"}
+    assert index.candidates("zab") == set()
+
+
+def test_intersection_stops_at_much_larger_postings():
+    index = TrigramIndex()
+    index.add("rare", "wxyz")
+    index.add("partial", "wxy")
+    for i in range(20):
+        index.add(f"common{i}", "xyz")
+    # "wxy" narrows to two rows; the "xyz" list is over 8x that, so it is
+    # not intersected and "partial" is left to the caller's substring check
+    assert index.candidates("wxyz") == {"rare", "partial"}